@@ -0,0 +1,57 @@
+# !/usr/bin/python3
+
+# ** info: python imports
+from os.path import join
+from os import path
+import logging
+import asyncio
+import sys
+
+# ---------------------------------------------------------------------------------------------------------------------
+# ** info: appending src path to the system paths for absolute imports from src path
+# ---------------------------------------------------------------------------------------------------------------------
+
+sys.path.append(join(path.dirname(path.realpath(__file__)), "..", "."))
+
+# ---------------------------------------------------------------------------------------------------------------------
+# ** info: continuing with the backfill setup
+# ---------------------------------------------------------------------------------------------------------------------
+
+# ** info: sidecards.artifacts imports
+from src.sidecard.system.artifacts.logging_provider import LoggingProvider  # type: ignore
+from src.sidecard.system.artifacts.env_provider import EnvProvider  # type: ignore
+
+# ** info: providers imports
+from src.modules.centralized_analytics.adapters.database_providers.monthly_counter_provider import MonthlyCounterProvider  # type: ignore
+
+# ** info: sidecard.managers imports
+from src.sidecard.system.database_managers.mysql_manager import MySQLManager  # type: ignore
+
+# ---------------------------------------------------------------------------------------------------------------------
+# ** info: setting up global logging
+# ---------------------------------------------------------------------------------------------------------------------
+
+env_provider: EnvProvider = EnvProvider()  # type: ignore
+
+if env_provider.app_logging_mode == "structured":
+    LoggingProvider.setup_structured_logging()
+else:
+    LoggingProvider.setup_pretty_logging()
+
+# ---------------------------------------------------------------------------------------------------------------------
+# ** info: rebuilding the monthly counters from the collect requests and wastes already stored
+# ! warning: the monthly counter table is created by the create missing tables script, it has to run before the backfill
+# ! warning: the writes done while the backfill runs are counted by the transaction that replaces the counters or not at all, run it before serving traffic
+# ---------------------------------------------------------------------------------------------------------------------
+
+
+async def backfill_monthly_counters() -> None:
+    try:
+        await MonthlyCounterProvider().backfill_monthly_counters()
+    finally:
+        await MySQLManager().dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(backfill_monthly_counters())
+    logging.info("monthly counters backfill ended")
@@ -0,0 +1,58 @@
+# !/usr/bin/python3
+
+# ** info: python imports
+from os.path import join
+from os import path
+import logging
+import asyncio
+import sys
+
+# ---------------------------------------------------------------------------------------------------------------------
+# ** info: appending src path to the system paths for absolute imports from src path
+# ---------------------------------------------------------------------------------------------------------------------
+
+sys.path.append(join(path.dirname(path.realpath(__file__)), "..", "."))
+
+# ---------------------------------------------------------------------------------------------------------------------
+# ** info: continuing with the tables setup
+# ---------------------------------------------------------------------------------------------------------------------
+
+# ** info: sidecards.artifacts imports
+from src.sidecard.system.artifacts.logging_provider import LoggingProvider  # type: ignore
+from src.sidecard.system.artifacts.env_provider import EnvProvider  # type: ignore
+
+# ** info: providers imports
+from src.modules.centralized_analytics.adapters.database_providers.monthly_counter_provider import MonthlyCounterProvider  # type: ignore
+from src.modules.waste.adapters.database_providers.warehouse_reservation_provider import WarehouseReservationProvider  # type: ignore
+
+# ** info: sidecard.managers imports
+from src.sidecard.system.database_managers.mysql_manager import MySQLManager  # type: ignore
+
+# ---------------------------------------------------------------------------------------------------------------------
+# ** info: setting up global logging
+# ---------------------------------------------------------------------------------------------------------------------
+
+env_provider: EnvProvider = EnvProvider()  # type: ignore
+
+if env_provider.app_logging_mode == "structured":
+    LoggingProvider.setup_structured_logging()
+else:
+    LoggingProvider.setup_pretty_logging()
+
+# ---------------------------------------------------------------------------------------------------------------------
+# ** info: creating the tables added by the service that are not in the database yet, the existing ones are left as they are
+# ! warning: the service does not run ddl at startup, this script runs once before deploying a version that adds a table
+# ---------------------------------------------------------------------------------------------------------------------
+
+
+async def create_missing_tables() -> None:
+    try:
+        await MonthlyCounterProvider().create_monthly_counter_table()
+        await WarehouseReservationProvider().create_warehouse_reservation_table()
+    finally:
+        await MySQLManager().dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(create_missing_tables())
+    logging.info("missing tables created")
@@ -0,0 +1,85 @@
+# !/usr/bin/python3
+# type: ignore
+
+# ** info: python imports
+from dataclasses import fields
+from datetime import datetime
+import logging
+
+# ** info: typing imports
+from typing import Self
+from typing import Any
+
+# ** info: sqlmodel imports
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlmodel.ext.asyncio.session import AsyncSession
+from sqlalchemy import TextClause
+from sqlmodel import select
+from sqlmodel import delete
+from sqlmodel import text
+
+# ** info: stamina imports
+from stamina import retry
+
+# ** info: entities imports
+from src.modules.centralized_analytics.adapters.database_providers_entities.monthly_counter_entity import MonthlyCounterRecord
+from src.modules.centralized_analytics.adapters.database_providers_entities.monthly_counter_entity import MonthlyCounter
+
+# ** info: sidecards.database_managers imports
+from src.sidecard.system.database_managers.mysql_manager import MySQLManager
+
+__all__: list[str] = ["MonthlyCounterProvider"]
+
+# ** info: columns selected by the yearly read, in the same order as the monthly counter record fields
+monthly_counter_record_columns: tuple[Any, ...] = tuple(getattr(MonthlyCounter, field.name) for field in fields(MonthlyCounterRecord))
+
+# ** info: rebuilds every counter from the base tables, only used by the backfill
+monthly_counters_backfill_query: str = """
+insert into `monthly_counter` (`year`, `month`, `collect_requests`, `wastes`)
+select `year`, `month`, sum(`collect_requests`), sum(`wastes`) from (
+    select year(`create`) as `year`, month(`create`) as `month`, count(*) as `collect_requests`, 0 as `wastes` from `collect_request` group by year(`create`), month(`create`)
+    union all
+    select year(`create`) as `year`, month(`create`) as `month`, 0 as `collect_requests`, count(*) as `wastes` from `waste` group by year(`create`), month(`create`)
+) as `counts` group by `year`, `month`;
+"""
+
+
+class MonthlyCounterProvider:
+    def __init__(self: Self) -> None:
+        self._session_manager: MySQLManager = MySQLManager()
+
+    async def create_monthly_counter_table(self: Self) -> None:
+        # ** info: only used by the tables script, mysql commits ddl on its own so it is kept out of the backfill transaction
+        async with self._session_manager.obtain_session() as session:
+            connection: Any = await session.connection()
+            await connection.run_sync(lambda sync_connection: MonthlyCounter.__table__.create(bind=sync_connection, checkfirst=True))
+            await session.commit()
+
+    async def increment_monthly_counters(self: Self, session: AsyncSession, create: datetime, collect_requests: int = 0, wastes: int = 0) -> None:
+        # ** info: runs on the session of the create path before its commit, the counters move in the same transaction as the rows they count
+        statement: Any = mysql_insert(MonthlyCounter).values(year=create.year, month=create.month, collect_requests=collect_requests, wastes=wastes)
+        statement = statement.on_duplicate_key_update(
+            collect_requests=MonthlyCounter.collect_requests + statement.inserted.collect_requests, wastes=MonthlyCounter.wastes + statement.inserted.wastes
+        )
+        await session.exec(statement=statement)
+
+    @retry(on=Exception, attempts=4, wait_initial=0.08, wait_exp_base=2)
+    async def list_monthly_counters_by_year(self: Self, year: int) -> tuple[MonthlyCounterRecord, ...]:
+        # ** info: a primary key range of at most twelve rows, its cost does not grow with the history
+        logging.debug(f"searching monthly counters by year {year}")
+        async with self._session_manager.obtain_session() as session:
+            query: Any = select(*monthly_counter_record_columns).where(MonthlyCounter.year == year).order_by(MonthlyCounter.month)
+            monthly_counters: tuple[MonthlyCounterRecord, ...] = tuple(MonthlyCounterRecord(*row) for row in (await session.exec(statement=query)).all())
+            logging.debug("searching monthly counters by year ended")
+            return monthly_counters
+
+    async def backfill_monthly_counters(self: Self) -> int:
+        # ** info: the counters are replaced in a single transaction, readers see either the previous counters or the rebuilt ones
+        logging.warning("backfilling monthly counters")
+        async with self._session_manager.obtain_session() as session:
+            await session.exec(statement=delete(MonthlyCounter))
+            query: TextClause = text(monthly_counters_backfill_query)
+            backfilled: Any = await session.exec(statement=query)
+            await session.commit()
+        logging.warning(f"{backfilled.rowcount} monthly counters backfilled")
+        return backfilled.rowcount
@@ -0,0 +1,30 @@
+# !/usr/bin/python3
+# type: ignore
+
+# ** info: python imports
+from dataclasses import dataclass
+
+# ** info: sqlmodel imports
+from sqlmodel import SQLModel
+from sqlmodel import Field
+
+__all__: list[str] = ["MonthlyCounter", "MonthlyCounterRecord"]
+
+
+class MonthlyCounter(SQLModel, table=True):
+    # ** info: rollup of the collect requests and wastes created per month, kept up to date by the create paths in the same transaction as the rows they count
+    __table_args__ = {"extend_existing": True}
+    __tablename__ = "monthly_counter"
+
+    year: int = Field(primary_key=True, sa_column_kwargs={"autoincrement": False})
+    month: int = Field(primary_key=True, sa_column_kwargs={"autoincrement": False})
+    collect_requests: int = Field(default=0, nullable=False)
+    wastes: int = Field(default=0, nullable=False)
+
+
+# ** info: detached read model of the counters of a month
+@dataclass(frozen=True, slots=True)
+class MonthlyCounterRecord:
+    month: int
+    collect_requests: int
+    wastes: int
@@ -3,18 +3,20 @@
 # ** info: python imports
 import logging
 
-# ** info: asyncio imports
-from asyncio import gather
-
 # ** info: typing imports
+from typing import Union
 from typing import Self
 from typing import List
 from typing import Dict
-from typing import Any
 
-# ** info: cores imports
-from src.modules.collect_request.cores.business.collect_request_core import CollectRequestCore  # type: ignore
-from src.modules.waste.cores.business.waste_core import WasteCore  # type: ignore
+# ** info: fastapi imports
+from fastapi import Response
+
+# ** info: entities imports
+from src.modules.centralized_analytics.adapters.database_providers_entities.monthly_counter_entity import MonthlyCounterRecord  # type: ignore
+
+# ** info: providers imports
+from src.modules.centralized_analytics.adapters.database_providers.monthly_counter_provider import MonthlyCounterProvider  # type: ignore
 
 # ** info: dtos imports
 from src.modules.centralized_analytics.ports.rest_routers_dtos.centralized_analytics_dtos import YearDataResponseDto  # type: ignore
@@ -23,6 +25,7 @@ from src.modules.centralized_analytics.ports.rest_routers_dtos.centralized_analy
 
 # ** info: sidecards.artifacts imports
 from src.sidecard.system.artifacts.datetime_provider import DatetimeProvider  # type: ignore
+from src.sidecard.system.artifacts.etag_provider import EtagProvider  # type: ignore
 
 __all__: list[str] = ["CentralyzedAnalyticsCore"]
 
@@ -32,18 +35,18 @@ class CentralyzedAnalyticsCore:
     # ! info: core slots section start
     # !------------------------------------------------------------------------
 
-    __slots__ = ["_collect_request_core", "_waste_core", "_datetime_provider"]
+    __slots__ = ["_monthly_counter_provider", "_datetime_provider", "_etag_provider"]
 
     # !------------------------------------------------------------------------
     # ! info: core atributtes and constructor section start
     # !------------------------------------------------------------------------
 
     def __init__(self: Self):
-        # ** info: cores building
-        self._collect_request_core: CollectRequestCore = CollectRequestCore()
-        self._waste_core: WasteCore = WasteCore()
+        # ** info: providers building
+        self._monthly_counter_provider: MonthlyCounterProvider = MonthlyCounterProvider()
         # ** info: sidecards building
         self._datetime_provider: DatetimeProvider = DatetimeProvider()
+        self._etag_provider: EtagProvider = EtagProvider()
 
     # !------------------------------------------------------------------------
     # ! info: driver methods section start
@@ -51,10 +54,15 @@ class CentralyzedAnalyticsCore:
     # ! warning: a method only can be declared in this section if it is going to be called from the routers layer
     # !------------------------------------------------------------------------
 
-    async def driver_obtain_wcr_yearly_analytics(self: Self, year_data_request: YearDataRequestDto) -> YearDataResponseDto:
+    async def driver_obtain_wcr_yearly_analytics(
+        self: Self, year_data_request: YearDataRequestDto, if_none_match: Union[str, None] = None, response: Union[Response, None] = None
+    ) -> YearDataResponseDto:
         logging.info("starting driver_obtain_wcr_yearly_analytics")
-        collect_request_year_data, wastes_year_data = await self._get_year_wcr_data(year=year_data_request.year)
-        months_merged_info: List[Dict[str, int]] = await self._merge_wcr_data(collect_request_year_data=collect_request_year_data, wastes_year_data=wastes_year_data)
+        # ** info: the counters are kept by the create paths, the yearly read is a lookup of at most twelve rows instead of two scans of the history
+        monthly_counters: tuple[MonthlyCounterRecord, ...] = await self._monthly_counter_provider.list_monthly_counters_by_year(year=year_data_request.year)
+        etag: str = self._etag_provider.build_etag(scope=f"wcr_yearly_analytics:{year_data_request.year}", data=monthly_counters)
+        self._etag_provider.check_etag(etag=etag, if_none_match=if_none_match, response=response)
+        months_merged_info: List[Dict[str, int]] = await self._merge_wcr_data(monthly_counters=monthly_counters)
         year_data_response: YearDataResponseDto = await self._map_year_wcr_response(months_merged_info=months_merged_info)
         logging.info("starting driver_obtain_wcr_yearly_analytics")
         return year_data_response
@@ -65,18 +73,6 @@ class CentralyzedAnalyticsCore:
     # ! warning: a method only can be declared in this section if it is going to call a port method from another core
     # !------------------------------------------------------------------------
 
-    async def cam_collect_req_quantity_by_year(self: Self, year: int) -> Any:
-        logging.info("starting cam_collect_req_quantity_by_year")
-        collect_req_quantity_by_year = await self._collect_request_core.cpm_collect_req_quantity_by_year(year=year)
-        logging.info("ending cam_collect_req_quantity_by_year")
-        return collect_req_quantity_by_year
-
-    async def cam_waste_quantity_by_year(self: Self, year: int) -> Any:
-        logging.info("starting cam_waste_quantity_by_year")
-        collect_req_quantity_by_year = await self._waste_core.cpm_waste_quantity_by_year(year=year)
-        logging.info("ending cam_waste_quantity_by_year")
-        return collect_req_quantity_by_year
-
     # !------------------------------------------------------------------------
     # ! info: core port methods section start
     # ! warning: all the methods in this section are the ones that are going to be called from another core
@@ -110,16 +106,12 @@ class CentralyzedAnalyticsCore:
             monthNumber=month,
         )
 
-    async def _get_year_wcr_data(self: Self, year: int) -> tuple[Any, Any]:
-        return await gather(self.cam_collect_req_quantity_by_year(year=year), self.cam_waste_quantity_by_year(year=year))
-
-    async def _merge_wcr_data(self: Self, collect_request_year_data: List[Dict[str, int]], wastes_year_data: List[Dict[str, int]]) -> List[Dict[str, int]]:
+    async def _merge_wcr_data(self: Self, monthly_counters: tuple[MonthlyCounterRecord, ...]) -> List[Dict[str, int]]:
         merged_data: Dict[str, Dict[str, int]] = {}
         for month in range(1, 12 + 1):
             merged_data[str(month)] = {r"collect_request_quantity": 0, r"wastes_quantity": 0, r"month": month}
-        for collect_request_data in collect_request_year_data:
-            merged_data[str(collect_request_data[r"month"])][r"collect_request_quantity"] = collect_request_data[r"quantity"]
-        for waste_data in wastes_year_data:
-            merged_data[str(waste_data[r"month"])][r"wastes_quantity"] = waste_data[r"quantity"]
+        for monthly_counter in monthly_counters:
+            merged_data[str(monthly_counter.month)][r"collect_request_quantity"] = monthly_counter.collect_requests
+            merged_data[str(monthly_counter.month)][r"wastes_quantity"] = monthly_counter.wastes
         merged_data_return: List[Dict[str, int]] = list(merged_data.values())
         return merged_data_return
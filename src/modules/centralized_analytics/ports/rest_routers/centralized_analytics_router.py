@@ -1,9 +1,14 @@
 # !/usr/bin/python3
 # type: ignore
 
+# ** info: typing imports
+from typing import Union
+
 # ** info: fastapi imports
 from fastapi import APIRouter
+from fastapi import Response
 from fastapi import status
+from fastapi import Header
 from fastapi import Body
 
 # ** info: port dtos imports
@@ -35,6 +40,8 @@ _centralyzed_analytics_core: CentralyzedAnalyticsCore = CentralyzedAnalyticsCore
     response_model=YearDataResponseDto,
     status_code=status.HTTP_200_OK,
 )
-async def api_obtain_wcr_yearly_analytics(year_data_request: YearDataRequestDto = Body(...)) -> YearDataResponseDto:
-    year_data_response: YearDataRequestDto = await _centralyzed_analytics_core.driver_obtain_wcr_yearly_analytics(year_data_request)
+async def api_obtain_wcr_yearly_analytics(
+    response: Response, year_data_request: YearDataRequestDto = Body(...), if_none_match: Union[str, None] = Header(default=None)
+) -> YearDataResponseDto:
+    year_data_response: YearDataRequestDto = await _centralyzed_analytics_core.driver_obtain_wcr_yearly_analytics(year_data_request, if_none_match=if_none_match, response=response)
     return year_data_response
@@ -2,10 +2,13 @@
 # type: ignore
 
 # ** info: python imports
+from dataclasses import fields
 from datetime import datetime
 import logging
 
 # ** info: typing imports
+from typing import AsyncGenerator
+from typing import Union
 from typing import Self
 from typing import Any
 
@@ -14,116 +17,183 @@ from fastapi import HTTPException
 from fastapi import status
 
 # ** info: sqlmodel imports
-from sqlalchemy import TextClause
-from sqlmodel import Session
+from sqlalchemy import and_
+from sqlalchemy import or_
 from sqlmodel import select
-from sqlmodel import text
-
-# ** info: stamina imports
-from stamina import retry
 
 # ** info: users entity
+from src.modules.collect_request.adapters.database_providers_entities.collect_request_entity import CollectRequestRecord
 from src.modules.collect_request.adapters.database_providers_entities.collect_request_entity import CollectRequest
 
+# ** info: centralized analytics providers imports
+from src.modules.centralized_analytics.adapters.database_providers.monthly_counter_provider import MonthlyCounterProvider
+
 # ** info: sidecards.database_managers imports
+from src.sidecard.system.database_managers.mysql_manager import retry_outside_unit_of_work
 from src.sidecard.system.database_managers.mysql_manager import MySQLManager
 
+# ** info: sidecards.cache_managers imports
+from src.sidecard.system.cache_managers.shared_cache_manager import SharedCacheManager
+from src.sidecard.system.cache_managers.cache_manager import single_flight
+from src.sidecard.system.cache_managers.cache_manager import MeteredCache
+from src.sidecard.system.cache_managers.cache_manager import CacheManager
+
+# ** info: sidecards.helpers imports
+from src.sidecard.system.helpers.cache_key_helper import CacheKey
+
 # ** info: sidecards.artifacts imports
 from src.sidecard.business.constants.collect_request_states_constants import CollectRequestStates
 from src.sidecard.system.artifacts.datetime_provider import DatetimeProvider
 from src.sidecard.system.artifacts.uuid_provider import UuidProvider
-from src.sidecard.system.artifacts.env_provider import EnvProvider
 
-# ** info: cachetools imports
-from cachetools import TTLCache
-from cachetools import cached
+# ** info: asyncache imports
+from asyncache import cached as async_cached
 
 __all__: list[str] = ["CollectRequestProvider"]
 
-# ** info: creating a shared cache for all the collect request provider instances
-collect_request_provider_cache: TTLCache = TTLCache(ttl=240, maxsize=20)
+# ** info: every cached method of the collect request provider gets its own cache, ttl and size come from the cache settings
+_cache_manager: CacheManager = CacheManager()
+search_collect_request_by_id_cache: MeteredCache = _cache_manager.obtain_cache(name="collect_request_provider.search_collect_request_by_id")
+find_collects_requests_by_state_cache: MeteredCache = _cache_manager.obtain_cache(name="collect_request_provider.find_collects_requests_by_state")
+
+# ** info: optional tier shared by every worker behind the in process caches
+_shared_cache_manager: SharedCacheManager = SharedCacheManager()
+
+# ** info: cache keys of every cached method, the writes use them to evict only the entries they make stale
+search_collect_request_by_id_key: CacheKey = CacheKey("search_collect_request_by_id", "uuid")
+find_collects_requests_by_state_key: CacheKey = CacheKey("find_collects_requests_by_state", "process_status", "limit", "after")
+
+# ** info: rows read per session when streaming collect requests, the stream keeps going from the last row of every page
+collect_request_stream_page_size: int = 500
+
+# ** info: columns selected by the list paths and the cached reads, in the same order as the collect request record fields
+collect_request_record_columns: tuple[Any, ...] = tuple(getattr(CollectRequest, field.name) for field in fields(CollectRequestRecord))
 
 
 class CollectRequestProvider:
     def __init__(self: Self) -> None:
-        self._env_provider: EnvProvider = EnvProvider()
         self._uuid_provider: UuidProvider = UuidProvider()
         self._datetime_provider: DatetimeProvider = DatetimeProvider()
-        self._session_manager: MySQLManager = MySQLManager(
-            password=self._env_provider.database_password,
-            database=self._env_provider.database_name,
-            username=self._env_provider.database_user,
-            host=self._env_provider.database_host,
-            port=self._env_provider.database_port,
-            drivername=r"mysql+pymysql",
-            query={"charset": "utf8"},
-        )
+        self._session_manager: MySQLManager = MySQLManager()
+        self._monthly_counter_provider: MonthlyCounterProvider = MonthlyCounterProvider()
+        _shared_cache_manager.subscribe(topic="collect_request_provider", handler=self._evict_cached_collect_request)
 
     def clear_cache(self: Self) -> None:
-        collect_request_provider_cache.clear()
+        _cache_manager.clear(prefix="collect_request_provider.")
 
-    @cached(collect_request_provider_cache)
-    @retry(on=Exception, attempts=4, wait_initial=0.08, wait_exp_base=2)
-    def search_collect_request_by_id(self: Self, uuid: str) -> CollectRequest:
+    @async_cached(search_collect_request_by_id_cache, key=search_collect_request_by_id_key)
+    @single_flight(search_collect_request_by_id_cache, key=search_collect_request_by_id_key)
+    @_shared_cache_manager.cached(search_collect_request_by_id_cache, key=search_collect_request_by_id_key, group="uuid")
+    @retry_outside_unit_of_work(on=Exception, attempts=4, wait_initial=0.08, wait_exp_base=2)
+    async def search_collect_request_by_id(self: Self, uuid: str) -> Union[CollectRequestRecord, None]:
         logging.debug(f"searching collect request by id {uuid}")
-        session: Session = self._session_manager.obtain_session()
-        query: Any = select(CollectRequest).where(CollectRequest.uuid == uuid)
-        search_collect_request_by_id_result: CollectRequest = session.exec(statement=query).first()
-        logging.debug("searching collect request by id ended")
-        return search_collect_request_by_id_result
-
-    @retry(on=Exception, attempts=4, wait_initial=0.08, wait_exp_base=2)
-    def store_collect_request(self: Self, collect_date: str, production_center_id: int) -> CollectRequest:
+        async with self._session_manager.obtain_session() as session:
+            query: Any = select(*collect_request_record_columns).where(CollectRequest.uuid == uuid)
+            row: Any = (await session.exec(statement=query)).first()
+            search_collect_request_by_id_result: Union[CollectRequestRecord, None] = None if row is None else CollectRequestRecord(*row)
+            logging.debug("searching collect request by id ended")
+            return search_collect_request_by_id_result
+
+    @retry_outside_unit_of_work(on=Exception, attempts=4, wait_initial=0.08, wait_exp_base=2)
+    async def store_collect_request(self: Self, collect_date: str, production_center_id: int) -> CollectRequest:
         logging.debug("creating a new collect request")
-        session: Session = self._session_manager.obtain_session()
-        uuid: str = self._uuid_provider.get_str_uuid()
-        date_time: datetime = self._datetime_provider.get_current_time()
-        new_collect_request: CollectRequest = CollectRequest(
-            production_center_id=production_center_id, collect_date=collect_date, process_status=CollectRequestStates.in_review, create=date_time, update=date_time, uuid=uuid
-        )
-        session.add(new_collect_request)
-        session.commit()
-        session.refresh(new_collect_request)
-        self.clear_cache()
-        logging.debug("new collect request created")
-        return new_collect_request
-
-    @cached(collect_request_provider_cache)
-    @retry(on=Exception, attempts=4, wait_initial=0.08, wait_exp_base=2)
-    def find_collects_requests_by_state(self: Self, process_status: int) -> list[CollectRequest]:
+        async with self._session_manager.obtain_session() as session:
+            uuid: str = self._uuid_provider.get_str_uuid()
+            date_time: datetime = self._datetime_provider.get_current_time()
+            new_collect_request: CollectRequest = CollectRequest(
+                production_center_id=production_center_id, collect_date=collect_date, process_status=CollectRequestStates.in_review, create=date_time, update=date_time, uuid=uuid
+            )
+            session.add(new_collect_request)
+            await self._monthly_counter_provider.increment_monthly_counters(session=session, create=date_time, collect_requests=1)
+            await session.commit()
+            await session.refresh(new_collect_request)
+            await self._invalidate_cached_collect_request(collect_request=new_collect_request)
+            logging.debug("new collect request created")
+            return new_collect_request
+
+    @async_cached(find_collects_requests_by_state_cache, key=find_collects_requests_by_state_key)
+    @single_flight(find_collects_requests_by_state_cache, key=find_collects_requests_by_state_key)
+    @_shared_cache_manager.cached(find_collects_requests_by_state_cache, key=find_collects_requests_by_state_key, group="process_status")
+    @retry_outside_unit_of_work(on=Exception, attempts=4, wait_initial=0.08, wait_exp_base=2)
+    async def find_collects_requests_by_state(self: Self, process_status: int, limit: int, after: Union[tuple[datetime, str], None] = None) -> tuple[CollectRequestRecord, ...]:
         logging.debug(f"searching collect requests by state {process_status}")
-        session: Session = self._session_manager.obtain_session()
-        query: Any = select(CollectRequest).where(CollectRequest.process_status == process_status)
-        find_collect_request_by_state_result: list[CollectRequest] = session.exec(statement=query).all()
-        logging.debug("searching collect requests by state ended")
-        return find_collect_request_by_state_result
-
-    @retry(on=Exception, attempts=4, wait_initial=0.08, wait_exp_base=2)
-    def modify_collect_request_by_id(self: Self, uuid: str, process_status: int, collect_request_note: str) -> CollectRequest:
+        async with self._session_manager.obtain_session() as session:
+            query: Any = self._build_state_query(process_status=process_status, after=after).limit(limit)
+            find_collect_request_by_state_result: tuple[CollectRequestRecord, ...] = tuple(CollectRequestRecord(*row) for row in (await session.exec(statement=query)).all())
+            logging.debug("searching collect requests by state ended")
+            return find_collect_request_by_state_result
+
+    async def stream_collects_requests_by_state(self: Self, process_status: int, after: Union[tuple[datetime, str], None] = None) -> AsyncGenerator[CollectRequestRecord, None]:
+        logging.debug(f"streaming collect requests by state {process_status}")
+        # ** info: every page is read on its own short session, no connection or limiter slot is held while a slow client downloads the rows
+        while True:
+            collect_requests_page: tuple[CollectRequestRecord, ...] = await self._read_collects_requests_page_by_state(process_status=process_status, after=after)
+            for collect_request in collect_requests_page:
+                yield collect_request
+            if len(collect_requests_page) < collect_request_stream_page_size:
+                break
+            after = (collect_requests_page[-1].create, collect_requests_page[-1].uuid)
+        logging.debug("streaming collect requests by state ended")
+
+    @retry_outside_unit_of_work(on=Exception, attempts=4, wait_initial=0.08, wait_exp_base=2)
+    async def modify_collect_request_by_id(self: Self, uuid: str, process_status: int, collect_request_note: str) -> CollectRequest:
         logging.debug(f"modifying collect request by id {uuid}")
-        session: Session = self._session_manager.obtain_session()
-        query: Any = select(CollectRequest).where(CollectRequest.uuid == uuid)
-        CollectRequest_data: CollectRequest = session.exec(statement=query).first()
-        if CollectRequest_data is None:
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Collect Request not found")
-        CollectRequest_data.update = self._datetime_provider.get_current_time()
-        CollectRequest_data.process_status = process_status
-        CollectRequest_data.note = collect_request_note
-        session.add(CollectRequest_data)
-        session.commit()
-        session.refresh(CollectRequest_data)
-        self.clear_cache()
-        logging.debug(f"collect request {uuid} modified")
-        return CollectRequest_data
-
-    @cached(collect_request_provider_cache)
-    @retry(on=Exception, attempts=4, wait_initial=0.08, wait_exp_base=2)
-    def collect_req_quantity_by_year(self: Self, year: int) -> Any:
-        logging.debug(f"searching collect request quantity by year {year}")
-        session: Session = self._session_manager.obtain_session()
-        query: TextClause = text("select month(`create`) as month, count(*) as quantity from `collect_request` where year(`create`) = :year group by month(`create`);").bindparams(
-            year=year
+        async with self._session_manager.obtain_session() as session:
+            query: Any = select(CollectRequest).where(CollectRequest.uuid == uuid)
+            CollectRequest_data: CollectRequest = (await session.exec(statement=query)).first()
+            if CollectRequest_data is None:
+                raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Collect Request not found")
+            previous_process_status: int = CollectRequest_data.process_status
+            CollectRequest_data.update = self._datetime_provider.get_current_time()
+            CollectRequest_data.process_status = process_status
+            CollectRequest_data.note = collect_request_note
+            session.add(CollectRequest_data)
+            await session.commit()
+            await session.refresh(CollectRequest_data)
+            await self._invalidate_cached_collect_request(collect_request=CollectRequest_data, previous_process_status=previous_process_status)
+            logging.debug(f"collect request {uuid} modified")
+            return CollectRequest_data
+
+    async def _invalidate_cached_collect_request(self: Self, collect_request: CollectRequest, previous_process_status: Union[int, None] = None) -> None:
+        invalidation: dict[str, Any] = {"uuid": collect_request.uuid, "process_status": collect_request.process_status}
+        # ** info: the shared groups are dropped before the local entries, so this worker can not refill its cache from a stale shared value
+        groups: list[tuple[MeteredCache, Any]] = [
+            (search_collect_request_by_id_cache, collect_request.uuid),
+            *(
+                (find_collects_requests_by_state_cache, process_status)
+                for process_status in {collect_request.process_status, previous_process_status}
+                if process_status is not None
+            ),
+        ]
+
+        # ** info: inside a unit of work the invalidation waits for the commit, before it the rows could still roll back
+        async def invalidate() -> None:
+            await _shared_cache_manager.invalidate(topic="collect_request_provider", payload=invalidation, groups=groups)
+            self._evict_cached_collect_request(invalidation=invalidation)
+
+        await self._session_manager.run_after_commit(callback=invalidate)
+
+    def _evict_cached_collect_request(self: Self, invalidation: dict[str, Any]) -> None:
+        # ** info: runs on the writer and on every other worker receiving the invalidation, it only touches the in process caches
+        search_collect_request_by_id_key.evict(cache=search_collect_request_by_id_cache, uuid=invalidation["uuid"])
+        # ** info: the pages holding the collect request are stale for its previous state, any page of its new state could now include it
+        find_collects_requests_by_state_key.evict_where(
+            cache=find_collects_requests_by_state_cache,
+            predicate=lambda arguments, records: arguments["process_status"] == invalidation["process_status"] or any(record.uuid == invalidation["uuid"] for record in records),
         )
-        collect_req_quantity_by_year: Any = session.exec(statement=query)
-        logging.debug("searching collect request quantity by year ended")
-        return collect_req_quantity_by_year.mappings().all()
+
+    @retry_outside_unit_of_work(on=Exception, attempts=4, wait_initial=0.08, wait_exp_base=2)
+    async def _read_collects_requests_page_by_state(self: Self, process_status: int, after: Union[tuple[datetime, str], None]) -> tuple[CollectRequestRecord, ...]:
+        # ** info: the stream pages are not cached, they would push the regular pages out of the caches
+        async with self._session_manager.obtain_session() as session:
+            query: Any = self._build_state_query(process_status=process_status, after=after).limit(collect_request_stream_page_size)
+            return tuple(CollectRequestRecord(*row) for row in (await session.exec(statement=query)).all())
+
+    def _build_state_query(self: Self, process_status: int, after: Union[tuple[datetime, str], None]) -> Any:
+        # ** info: only the record columns are selected, the rows are plain tuples so no orm instance is built or tracked
+        query: Any = select(*collect_request_record_columns).where(CollectRequest.process_status == process_status)
+        # ** info: keyset pagination over (create, uuid), the results start right after the given row
+        if after is not None:
+            after_create, after_uuid = after
+            query = query.where(or_(CollectRequest.create > after_create, and_(CollectRequest.create == after_create, CollectRequest.uuid > after_uuid)))
+        return query.order_by(CollectRequest.create, CollectRequest.uuid)
@@ -2,20 +2,25 @@
 # type: ignore
 
 # ** info: python imports
+from dataclasses import dataclass
 from datetime import datetime
 
 # ** info: typing imports
 from typing import Optional
 
+# ** info: sqlalchemy imports
+from sqlalchemy import Index
+
 # ** info: sqlmodel imports
 from sqlmodel import SQLModel
 from sqlmodel import Field
 
-__all__: list[str] = ["CollectRequest"]
+__all__: list[str] = ["CollectRequest", "CollectRequestRecord"]
 
 
 class CollectRequest(SQLModel, table=True):
-    __table_args__ = {"extend_existing": True}
+    # ** info: the by status listings are keyset paginated over (create, uuid), this index keeps every page a range scan
+    __table_args__ = (Index("collect_request_process_status_create_uuid_idx", "process_status", "create", "uuid"), {"extend_existing": True})
     __tablename__ = "collect_request"
 
     uuid: str = Field(max_length=36, primary_key=True)
@@ -25,3 +30,15 @@ class CollectRequest(SQLModel, table=True):
     note: Optional[str] = Field(max_length=65535, nullable=True)
     create: datetime = Field(nullable=False)
     update: datetime = Field(nullable=False)
+
+
+# ** info: detached read model of the list paths and of every cached read, filled straight from the selected columns without identity map tracking
+@dataclass(frozen=True, slots=True)
+class CollectRequestRecord:
+    uuid: str
+    collect_date: datetime
+    process_status: int
+    production_center_id: int
+    note: Optional[str]
+    create: datetime
+    update: datetime
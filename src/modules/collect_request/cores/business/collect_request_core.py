@@ -3,17 +3,17 @@
 # ** info: python imports
 import logging
 
-# ** info: asyncio imports
-from asyncio import gather
-
 # ** info: typing imports
+from typing import AsyncGenerator
+from typing import FrozenSet
+from typing import Union
 from typing import Self
 from typing import List
-from typing import Set
 from typing import Any
 
 # ** info: fastapi imports
 from fastapi import HTTPException
+from fastapi import Response
 from fastapi import status
 
 # ** info: cores imports
@@ -32,16 +32,24 @@ from src.modules.collect_request.ports.rest_routers_dtos.collect_request_dtos im
 from src.modules.collect_request.ports.rest_routers_dtos.collect_request_dtos import CollectRequestIdNoteDto  # type: ignore
 
 # ** info: entities imports
+from src.modules.collect_request.adapters.database_providers_entities.collect_request_entity import CollectRequestRecord  # type: ignore
 from src.modules.collect_request.adapters.database_providers_entities.collect_request_entity import CollectRequest  # type: ignore
+from src.modules.waste.adapters.database_providers_entities.waste_entity import WasteRecord  # type: ignore
 from src.modules.waste.adapters.database_providers_entities.waste_entity import Waste  # type: ignore
 
 # ** info: providers imports
 from src.modules.collect_request.adapters.database_providers.collect_request_provider import CollectRequestProvider  # type: ignore
 
+# ** info: sidecards.database_managers imports
+from src.sidecard.system.database_managers.mysql_manager import retry_unit_of_work  # type: ignore
+from src.sidecard.system.database_managers.mysql_manager import MySQLManager  # type: ignore
+
 # ** info: sidecards.artifacts imports
 from src.sidecard.business.artifacts.business_glossary_translate_provider import BusinessGlossaryTranslateProvider  # type: ignore
 from src.sidecard.business.constants.collect_request_states_constants import CollectRequestStates  # type: ignore
 from src.sidecard.system.artifacts.datetime_provider import DatetimeProvider  # type: ignore
+from src.sidecard.system.artifacts.cursor_provider import CursorProvider  # type: ignore
+from src.sidecard.system.artifacts.etag_provider import EtagProvider  # type: ignore
 
 __all__: list[str] = ["CollectRequestCore"]
 
@@ -51,7 +59,16 @@ class CollectRequestCore:
     # ! info: core slots section start
     # !------------------------------------------------------------------------
 
-    __slots__ = ["_parameter_core", "_waste_core", "_collect_request_provider", "_business_glossary_translate_provider", "_datetime_provider"]
+    __slots__ = [
+        "_parameter_core",
+        "_waste_core",
+        "_collect_request_provider",
+        "_business_glossary_translate_provider",
+        "_datetime_provider",
+        "_cursor_provider",
+        "_etag_provider",
+        "_mysql_manager",
+    ]
 
     # !------------------------------------------------------------------------
     # ! info: core atributtes and constructor section start
@@ -66,6 +83,9 @@ class CollectRequestCore:
         # ** info: sidecards building
         self._business_glossary_translate_provider: BusinessGlossaryTranslateProvider = BusinessGlossaryTranslateProvider()
         self._datetime_provider: DatetimeProvider = DatetimeProvider()
+        self._cursor_provider: CursorProvider = CursorProvider()
+        self._etag_provider: EtagProvider = EtagProvider()
+        self._mysql_manager: MySQLManager = MySQLManager()
 
     # !------------------------------------------------------------------------
     # ! info: driver methods section start
@@ -76,20 +96,42 @@ class CollectRequestCore:
     async def driver_create_request(self: Self, request_create_request: CollectRequestCreateRequestDto) -> CollectRequestFullDataResponseDto:
         logging.info("starting driver_create_request")
         await self._validate_wastes_domains(request_create_request=request_create_request)
-        collect_request_info: CollectRequest = await self._store_collect_request(request_create_request=request_create_request)
-        wastes_info: List[Waste] = await self._cam_wc_create_waste_with_basic_info(collect_request_id=collect_request_info.uuid, request_create_request=request_create_request)
+        collect_request_info, wastes_info = await self._store_collect_request_and_child_wastes_at_once(request_create_request=request_create_request)
         request_create_response: CollectRequestFullDataResponseDto = await self._map_collect_response(collect_request_info=collect_request_info, wastes_info=wastes_info)
         logging.info("starting driver_create_request")
         return request_create_response
 
-    async def driver_find_request_by_status(self: Self, request_find_request_by_status: CollectRequestFindByStatusReqDto) -> CollectRequestFindByStatusResDto:
+    async def driver_find_request_by_status(
+        self: Self, request_find_request_by_status: CollectRequestFindByStatusReqDto, if_none_match: Union[str, None] = None, response: Union[Response, None] = None
+    ) -> CollectRequestFindByStatusResDto:
         logging.info("starting driver_find_request_by_status")
         await self._validate_collect_request_process_status(process_status=request_find_request_by_status.processStatus)
-        collect_request_info: List[CollectRequest] = self._collect_request_provider.find_collects_requests_by_state(process_status=request_find_request_by_status.processStatus)
-        find_request_by_status_response: CollectRequestFindByStatusResDto = await self._map_full_collect_response_list(collect_request_info=collect_request_info)
+        page_size: int = request_find_request_by_status.pageSize
+        # ** info: one extra row is requested to know if there is a next page without running a count query
+        collect_request_info: tuple[CollectRequestRecord, ...] = await self._collect_request_provider.find_collects_requests_by_state(
+            process_status=request_find_request_by_status.processStatus,
+            limit=page_size + 1,
+            after=self._cursor_provider.decode_keyset_cursor(cursor=request_find_request_by_status.cursor),
+        )
+        await self._check_find_request_by_status_etag(
+            request_find_request_by_status=request_find_request_by_status, collect_request_info=collect_request_info, if_none_match=if_none_match, response=response
+        )
+        find_request_by_status_response: CollectRequestFindByStatusResDto = await self._map_full_collect_response_list(
+            collect_request_info=collect_request_info, page_size=page_size
+        )
         logging.info("driver_find_request_by_status ended")
         return find_request_by_status_response
 
+    async def driver_stream_request_by_status(self: Self, request_find_request_by_status: CollectRequestFindByStatusReqDto) -> AsyncGenerator[str, None]:
+        logging.info("starting driver_stream_request_by_status")
+        # ** info: the validations run before the first byte is sent so a bad request still gets a regular error response
+        await self._validate_collect_request_process_status(process_status=request_find_request_by_status.processStatus)
+        collect_request_info: AsyncGenerator[CollectRequestRecord, None] = self._collect_request_provider.stream_collects_requests_by_state(
+            process_status=request_find_request_by_status.processStatus, after=self._cursor_provider.decode_keyset_cursor(cursor=request_find_request_by_status.cursor)
+        )
+        # ** info: the rows are read while the response is sent, the driver is logged as ended once the lines generator is exhausted or closed
+        return self._map_full_collect_response_lines(collect_request_info=collect_request_info)
+
     async def driver_modify_request_by_id(self: Self, request_modify_request_by_id: CollectRequestModifyByIdReqDto) -> CollectRequestFullDataResponseDto:
         logging.info("starting driver_modify_request_by_id")
         await self._validate_collect_request_process_status(process_status=request_modify_request_by_id.processStatus)
@@ -104,18 +146,14 @@ class CollectRequestCore:
 
     async def driver_set_collect_request_to_finished(self: Self, collect_request_id_plus_store_id_req: CollectRequestIdNoteStoreIdDto) -> CollectRequestFullDataResponseDto:
         logging.info("starting driver_set_collect_request_to_finished")
-        wastes_ids: list[str] = await self._get_wastes_ids_by_collect_request_id(collect_request_uuid=collect_request_id_plus_store_id_req.collectReqId)
-        await self._check_if_wastes_batch_are_assignable_to_warehouse(warehouse_id=collect_request_id_plus_store_id_req.storeId, wastes_ids=wastes_ids)
-        collect_request_info, wastes_info = await self._update_collect_request_and_child_wastes_with_store_id_at_once(
+        wastes: tuple[WasteRecord, ...] = await self._cam_wc_list_wastes_by_collect_request_id(collect_request_uuid=collect_request_id_plus_store_id_req.collectReqId)
+        collect_request_info, wastes_info = await self._reserve_wastes_weight_and_update_collect_request_at_once(
             collect_request_id=collect_request_id_plus_store_id_req.collectReqId,
             collect_request_new_status=CollectRequestStates.finished,
             collect_request_note=collect_request_id_plus_store_id_req.note,
             store_id=collect_request_id_plus_store_id_req.storeId,
+            wastes=wastes,
         )
-        new_warehouse_capacity: float = await self._compute_new_warehouse_capacity_assigning_new_wastes(
-            warehouse_id=collect_request_id_plus_store_id_req.storeId, new_wastes_ids=wastes_ids
-        )
-        await self._update_warehouse_current_capacity(warehouse_id=collect_request_id_plus_store_id_req.storeId, new_warehouse_capacity=new_warehouse_capacity)
         request_create_response: CollectRequestFullDataResponseDto = await self._map_collect_response(collect_request_info=collect_request_info, wastes_info=wastes_info)
         logging.info("driver_set_collect_request_to_finished ended")
         return request_create_response
@@ -149,29 +187,29 @@ class CollectRequestCore:
     # !------------------------------------------------------------------------
 
     # ** info: cam pc are initials for core adapter methods parameter core
-    async def _cam_pc_get_set_of_parameter_ids_by_domain(self: Self, domain: str) -> Set[int]:
+    async def _cam_pc_get_set_of_parameter_ids_by_domain(self: Self, domain: str) -> FrozenSet[int]:
         logging.info("starting _cam_pc_get_set_of_parameter_ids_by_domain")
-        ids: Set[int] = await self._parameter_core.cpm_pc_get_set_of_parameter_ids_by_domain(domain=domain)
+        ids: FrozenSet[int] = await self._parameter_core.cpm_pc_get_set_of_parameter_ids_by_domain(domain=domain)
         logging.info("ending _cam_pc_get_set_of_parameter_ids_by_domain")
         return ids
 
     # ** info: cam wc are initials for core adapter methods waste core
-    async def _cam_wc_create_waste_with_basic_info(self: Self, collect_request_id: str, request_create_request: CollectRequestCreateRequestDto) -> List[Waste]:
-        logging.info("starting cpm_wc_create_waste_with_basic_info")
-        wastes: List[Waste] = []
-        for waste in request_create_request.waste:
-            waste_info: Waste = await self._waste_core.cpm_wc_create_waste_with_basic_info(
-                request_uuid=collect_request_id,
-                weight_in_kg=waste.weightInKg,
-                description=waste.description,
-                volume_in_l=waste.volumeInL,
-                packaging=waste.packaging,
-                type=waste.type,
-                note=waste.note,
-            )
-            wastes.append(waste_info)
-        logging.info("ending cpm_wc_create_waste_with_basic_info")
-        return wastes
+    async def _cam_wc_create_wastes_with_basic_info(self: Self, collect_request_id: str, request_create_request: CollectRequestCreateRequestDto) -> List[Waste]:
+        logging.info("starting _cam_wc_create_wastes_with_basic_info")
+        wastes: list[dict[str, Any]] = [
+            {
+                "weight_in_kg": waste.weightInKg,
+                "description": waste.description,
+                "volume_in_l": waste.volumeInL,
+                "packaging": waste.packaging,
+                "type": waste.type,
+                "note": waste.note,
+            }
+            for waste in request_create_request.waste
+        ]
+        new_wastes: List[Waste] = await self._waste_core.cpm_wc_create_wastes_with_basic_info(request_uuid=collect_request_id, wastes=wastes)
+        logging.info("ending _cam_wc_create_wastes_with_basic_info")
+        return new_wastes
 
     # ** info: cam wc are initials for core adapter methods waste core
     async def _cam_wc_update_waste_status_by_request_id(self: Self, collect_request_id: str, process_status_waste: int) -> list[Waste]:
@@ -190,40 +228,33 @@ class CollectRequestCore:
         return updated_wastes
 
     # ** info: cam wc are initials for core adapter methods waste core
-    async def _cam_wc_list_wastes_by_collect_request_id(self: Self, collect_request_uuid: str) -> list[Waste]:
+    async def _cam_wc_list_wastes_by_collect_request_id(self: Self, collect_request_uuid: str) -> tuple[WasteRecord, ...]:
         logging.info("starting _cam_wc_list_wastes_by_collect_request_id")
-        list_wastes_by_collect_request_id: list[Waste] = await self._waste_core.cpm_wc_list_wastes_by_collect_request_id(collect_request_uuid=collect_request_uuid)
+        list_wastes_by_collect_request_id: tuple[WasteRecord, ...] = await self._waste_core.cpm_wc_list_wastes_by_collect_request_id(collect_request_uuid=collect_request_uuid)
         logging.info("ending _cam_wc_list_wastes_by_collect_request_id")
         return list_wastes_by_collect_request_id
 
     # ** info: cam wc are initials for core adapter methods waste core
-    async def cam_wc_check_if_wastes_batch_are_assignable_to_warehouse(self: Self, warehouse_id: int, wastes_ids: list[str]) -> None:
-        logging.info("starting cam_wc_get_warehouse_capacity")
-        await self._waste_core.cpm_wc_check_if_wastes_batch_are_assignable_to_warehouse(warehouse_id=warehouse_id, wastes_ids=wastes_ids)
-        logging.info("ending cam_wc_get_warehouse_capacity")
-        return None
-
-    # ** info: cam wc are initials for core adapter methods waste core
-    async def cam_get_wastes_by_collect_request_id(self: Self, collect_request_uuid: str) -> list[Waste]:
+    async def cam_get_wastes_by_collect_request_id(self: Self, collect_request_uuid: str) -> tuple[WasteRecord, ...]:
         logging.info("starting cpm_get_wastes_by_collect_request_id")
-        list_wastes_by_collect_request_id: list[Waste] = await self._waste_core.cpm_get_wastes_by_collect_request_id(collect_request_uuid=collect_request_uuid)
+        list_wastes_by_collect_request_id: tuple[WasteRecord, ...] = await self._waste_core.cpm_get_wastes_by_collect_request_id(collect_request_uuid=collect_request_uuid)
         logging.info("ending cpm_get_wastes_by_collect_request_id")
         return list_wastes_by_collect_request_id
 
     # ** info: cam wc are initials for core adapter methods waste core
-    async def cam_wc_copute_new_warehouse_capacity_assigning_new_wastes(self: Self, warehouse_id: int, new_wastes_ids: list[str]) -> float:
-        logging.info("starting cam_wc_copute_new_warehouse_capacity_assigning_new_wastes")
-        new_warehouse_capacity: float = await self._waste_core.cpm_wc_copute_new_warehouse_capacity_assigning_new_wastes(warehouse_id=warehouse_id, wastes_ids=new_wastes_ids)
-        logging.info("ending cam_wc_copute_new_warehouse_capacity_assigning_new_wastes")
-        return new_warehouse_capacity
-
-    async def cam_wc_update_warehouse_current_capacity(self: Self, warehouse_id: int, new_warehouse_capacity: float) -> float:
-        logging.info("starting cam_update_warehouse_current_capacity")
-        updated_warehouse_capacity: float = await self._waste_core.cpm_wc_update_warehouse_current_capacity(
-            warehouse_id=warehouse_id, new_warehouse_capacity=new_warehouse_capacity
+    async def cam_wc_load_warehouse_capacity(self: Self, warehouse_id: int) -> None:
+        logging.info("starting cam_wc_load_warehouse_capacity")
+        await self._waste_core.cpm_wc_load_warehouse_capacity(warehouse_id=warehouse_id)
+        logging.info("ending cam_wc_load_warehouse_capacity")
+
+    # ** info: cam wc are initials for core adapter methods waste core
+    async def cam_wc_reserve_wastes_weight_in_warehouse(self: Self, warehouse_id: int, collect_request_id: str, wastes: tuple[WasteRecord, ...]) -> float:
+        logging.info("starting cam_wc_reserve_wastes_weight_in_warehouse")
+        available_warehouse_capacity: float = await self._waste_core.cpm_wc_reserve_wastes_weight_in_warehouse(
+            warehouse_id=warehouse_id, collect_request_uuid=collect_request_id, wastes=wastes
         )
-        logging.info("ending cam_update_warehouse_current_capacity")
-        return updated_warehouse_capacity
+        logging.info("ending cam_wc_reserve_wastes_weight_in_warehouse")
+        return available_warehouse_capacity
 
     # !------------------------------------------------------------------------
     # ! info: core port methods section start
@@ -231,12 +262,6 @@ class CollectRequestCore:
     # ! warning: a method only can be declared in this section if it is going to be called from another core
     # !------------------------------------------------------------------------
 
-    async def cpm_collect_req_quantity_by_year(self: Self, year: int) -> Any:
-        logging.info("starting cpm_collect_req_quantity_by_year")
-        collect_req_quantity_by_year = self._collect_request_provider.collect_req_quantity_by_year(year=year)
-        logging.info("ending cpm_collect_req_quantity_by_year")
-        return collect_req_quantity_by_year
-
     # !------------------------------------------------------------------------
     # ! info: private class methods section start
     # ! warning: all the methods in this section are the ones that are going to be called from inside this core
@@ -244,8 +269,8 @@ class CollectRequestCore:
     # !------------------------------------------------------------------------
 
     async def _validate_wastes_domains(self: Self, request_create_request: CollectRequestCreateRequestDto) -> None:
-        waste_packaging_types_ids: Set[int] = await self._cam_pc_get_set_of_parameter_ids_by_domain(domain=r"wastePackagingType")
-        waste_types_ids: Set[int] = await self._cam_pc_get_set_of_parameter_ids_by_domain(domain=r"wasteType")
+        waste_packaging_types_ids: FrozenSet[int] = await self._cam_pc_get_set_of_parameter_ids_by_domain(domain=r"wastePackagingType")
+        waste_types_ids: FrozenSet[int] = await self._cam_pc_get_set_of_parameter_ids_by_domain(domain=r"wasteType")
         for waste in request_create_request.waste:
             if waste.packaging not in waste_packaging_types_ids:
                 valid_waste_types: str = r",".join(str(s) for s in waste_packaging_types_ids)
@@ -257,37 +282,66 @@ class CollectRequestCore:
                 raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"waste type {waste.type} is not valid")
 
     async def _store_collect_request(self: Self, request_create_request: CollectRequestCreateRequestDto) -> CollectRequest:
-        collect_request_info: CollectRequest = self._collect_request_provider.store_collect_request(
+        collect_request_info: CollectRequest = await self._collect_request_provider.store_collect_request(
             collect_date=request_create_request.request.collectDate, production_center_id=request_create_request.request.productionCenterId
         )
         return collect_request_info
 
     async def _modify_collect_request(self: Self, collect_request_id: str, process_status: int, collect_request_note: str) -> CollectRequest:
-        collect_request_info: CollectRequest = self._collect_request_provider.modify_collect_request_by_id(
+        collect_request_info: CollectRequest = await self._collect_request_provider.modify_collect_request_by_id(
             uuid=collect_request_id, process_status=process_status, collect_request_note=collect_request_note
         )
         return collect_request_info
 
     async def _validate_collect_request_process_status(self: Self, process_status: int) -> None:
-        collect_state_ids: Set[int] = await self._cam_pc_get_set_of_parameter_ids_by_domain(domain=r"collectRequestProcessStatus")
+        collect_state_ids: FrozenSet[int] = await self._cam_pc_get_set_of_parameter_ids_by_domain(domain=r"collectRequestProcessStatus")
         if process_status not in collect_state_ids:
             valid_state_collect: str = r",".join(str(s) for s in collect_state_ids)
             logging.error(f"process status {process_status} is not valid valid types are {valid_state_collect}")
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"process status {process_status} is not valid")
 
-    async def _map_collect_response(self: Self, collect_request_info: CollectRequest, wastes_info: List[Waste]) -> CollectRequestFullDataResponseDto:
+    async def _map_collect_response(
+        self: Self, collect_request_info: CollectRequest, wastes_info: Union[List[Waste], tuple[WasteRecord, ...]]
+    ) -> CollectRequestFullDataResponseDto:
         return CollectRequestFullDataResponseDto(
             request=await self._map_collect_response_request_info(collect_request_info=collect_request_info),
             waste=await self._map_collect_response_wastes_info(wastes_info=wastes_info),
         )
 
-    async def _map_full_collect_response_list(self: Self, collect_request_info: List[CollectRequest]) -> CollectRequestFindByStatusResDto:
-        return CollectRequestFindByStatusResDto(values=await self._map_full_collect_responses(collect_request_info=collect_request_info))
-
-    async def _map_full_collect_responses(self: Self, collect_request_info: List[CollectRequest]) -> List[ResponseRequestDataDto]:
+    async def _check_find_request_by_status_etag(
+        self: Self,
+        request_find_request_by_status: CollectRequestFindByStatusReqDto,
+        collect_request_info: tuple[CollectRequestRecord, ...],
+        if_none_match: Union[str, None],
+        response: Union[Response, None],
+    ) -> None:
+        scope: str = (
+            f"collect_request_status_search:{request_find_request_by_status.processStatus}:{request_find_request_by_status.pageSize}:{request_find_request_by_status.cursor}"
+        )
+        etag: str = self._etag_provider.build_etag(scope=scope, data=collect_request_info)
+        self._etag_provider.check_etag(etag=etag, if_none_match=if_none_match, response=response)
+
+    async def _map_full_collect_response_list(self: Self, collect_request_info: tuple[CollectRequestRecord, ...], page_size: int) -> CollectRequestFindByStatusResDto:
+        page: tuple[CollectRequestRecord, ...] = collect_request_info[:page_size]
+        next_cursor: Union[str, None] = None
+        if len(collect_request_info) > page_size:
+            next_cursor = self._cursor_provider.encode_keyset_cursor(create=page[-1].create, uuid=page[-1].uuid)
+        return CollectRequestFindByStatusResDto(values=await self._map_full_collect_responses(collect_request_info=page), pageSize=page_size, nextCursor=next_cursor)
+
+    async def _map_full_collect_response_lines(self: Self, collect_request_info: AsyncGenerator[CollectRequestRecord, None]) -> AsyncGenerator[str, None]:
+        # ** info: every row is mapped and serialized on its own as one ndjson line, nothing but the current page is held in memory
+        try:
+            async for collect_request in collect_request_info:
+                response_request_data: ResponseRequestDataDto = await self._map_collect_response_request_info(collect_request_info=collect_request)
+                yield response_request_data.model_dump_json() + "\n"
+        finally:
+            await collect_request_info.aclose()
+            logging.info("driver_stream_request_by_status ended")
+
+    async def _map_full_collect_responses(self: Self, collect_request_info: tuple[CollectRequestRecord, ...]) -> List[ResponseRequestDataDto]:
         return [await self._map_collect_response_request_info(collect_request_info=collect_request_info) for collect_request_info in collect_request_info]
 
-    async def _map_collect_response_request_info(self: Self, collect_request_info: CollectRequest) -> ResponseRequestDataDto:
+    async def _map_collect_response_request_info(self: Self, collect_request_info: Union[CollectRequest, CollectRequestRecord]) -> ResponseRequestDataDto:
         create: str = self._datetime_provider.prettify_date_time_obj(date_time_obj=collect_request_info.create)
         update: str = self._datetime_provider.prettify_date_time_obj(date_time_obj=collect_request_info.update)
         return ResponseRequestDataDto(
@@ -300,14 +354,14 @@ class CollectRequestCore:
             create=create,
         )
 
-    async def _map_collect_response_wastes_info(self: Self, wastes_info: List[Waste]) -> List[ResponseWasteDataDto]:
+    async def _map_collect_response_wastes_info(self: Self, wastes_info: Union[List[Waste], tuple[WasteRecord, ...]]) -> List[ResponseWasteDataDto]:
         collect_response_wastes_info: List[ResponseWasteDataDto] = list()
         for waste_info in wastes_info:
             collect_response_waste_info: ResponseWasteDataDto = await self._map_collect_response_waste_info(waste_info=waste_info)
             collect_response_wastes_info.append(collect_response_waste_info)
         return collect_response_wastes_info
 
-    async def _map_collect_response_waste_info(self: Self, waste_info: Waste) -> ResponseWasteDataDto:
+    async def _map_collect_response_waste_info(self: Self, waste_info: Union[Waste, WasteRecord]) -> ResponseWasteDataDto:
         created: str = self._datetime_provider.prettify_date_time_obj(date_time_obj=waste_info.create)
         updated: str = self._datetime_provider.prettify_date_time_obj(date_time_obj=waste_info.update)
         return ResponseWasteDataDto(
@@ -330,35 +384,57 @@ class CollectRequestCore:
     async def _select_waste_status_by_collect_request_status(self: Self, process_status: int) -> int:
         return await self._business_glossary_translate_provider.select_waste_status_by_collect_request_status(collect_request_status=process_status)
 
+    @retry_unit_of_work
+    async def _store_collect_request_and_child_wastes_at_once(self: Self, request_create_request: CollectRequestCreateRequestDto) -> tuple[CollectRequest, List[Waste]]:
+        # ** info: the collect request and all its wastes are stored in a single transaction
+        async with self._mysql_manager.unit_of_work():
+            collect_request_info: CollectRequest = await self._store_collect_request(request_create_request=request_create_request)
+            wastes_info: List[Waste] = await self._cam_wc_create_wastes_with_basic_info(collect_request_id=collect_request_info.uuid, request_create_request=request_create_request)
+        return collect_request_info, wastes_info
+
+    @retry_unit_of_work
     async def _update_collect_request_and_child_wastes_at_once(
         self: Self, collect_request_id: str, collect_request_new_status: int, collect_request_note: str
     ) -> tuple[CollectRequest, list[Waste]]:
         updated_waste_status: int = await self._select_waste_status_by_collect_request_status(process_status=collect_request_new_status)
-        return await gather(
-            self._modify_collect_request(collect_request_id=collect_request_id, process_status=collect_request_new_status, collect_request_note=collect_request_note),
-            self._cam_wc_update_waste_status_by_request_id(collect_request_id=collect_request_id, process_status_waste=updated_waste_status),
-        )
+        # ** info: both tables are updated in a single transaction on a single connection, so the statements run one after the other
+        async with self._mysql_manager.unit_of_work():
+            collect_request_info: CollectRequest = await self._modify_collect_request(
+                collect_request_id=collect_request_id, process_status=collect_request_new_status, collect_request_note=collect_request_note
+            )
+            wastes_info: list[Waste] = await self._cam_wc_update_waste_status_by_request_id(collect_request_id=collect_request_id, process_status_waste=updated_waste_status)
+        return collect_request_info, wastes_info
+
+    @retry_unit_of_work
+    async def _reserve_wastes_weight_and_update_collect_request_at_once(
+        self: Self, collect_request_id: str, collect_request_new_status: int, collect_request_note: str, store_id: int, wastes: tuple[WasteRecord, ...]
+    ) -> tuple[CollectRequest, list[Waste]]:
+        # ** info: the capacity is loaded before the unit of work and reserved first inside it, a warehouse without room rejects the request before any write
+        await self._load_warehouse_capacity(warehouse_id=store_id)
+        async with self._mysql_manager.unit_of_work():
+            await self._reserve_wastes_weight_in_warehouse(warehouse_id=store_id, collect_request_id=collect_request_id, wastes=wastes)
+            collect_request_info, wastes_info = await self._update_collect_request_and_child_wastes_with_store_id_at_once(
+                collect_request_id=collect_request_id, collect_request_new_status=collect_request_new_status, collect_request_note=collect_request_note, store_id=store_id
+            )
+        return collect_request_info, wastes_info
 
+    @retry_unit_of_work
     async def _update_collect_request_and_child_wastes_with_store_id_at_once(
         self: Self, collect_request_id: str, collect_request_new_status: int, collect_request_note: str, store_id: int
     ) -> tuple[CollectRequest, list[Waste]]:
         updated_waste_status: int = await self._select_waste_status_by_collect_request_status(process_status=collect_request_new_status)
-        return await gather(
-            self._modify_collect_request(collect_request_id=collect_request_id, process_status=collect_request_new_status, collect_request_note=collect_request_note),
-            self._cam_wc_update_waste_status_and_store_by_request_id(collect_request_id=collect_request_id, process_status_waste=updated_waste_status, store_id=store_id),
-        )
-
-    async def _check_if_wastes_batch_are_assignable_to_warehouse(self: Self, warehouse_id: int, wastes_ids: list[str]) -> None:
-        await self.cam_wc_check_if_wastes_batch_are_assignable_to_warehouse(warehouse_id=warehouse_id, wastes_ids=wastes_ids)
-        return None
-
-    async def _get_wastes_ids_by_collect_request_id(self: Self, collect_request_uuid: str) -> list[str]:
-        wastes: list[Waste] = await self._waste_core.cpm_get_wastes_by_collect_request_id(collect_request_uuid=collect_request_uuid)
-        wastes_ids: list[str] = list(map(lambda waste: waste.uuid, wastes))
-        return wastes_ids
+        # ** info: both tables are updated in a single transaction on a single connection, so the statements run one after the other
+        async with self._mysql_manager.unit_of_work():
+            collect_request_info: CollectRequest = await self._modify_collect_request(
+                collect_request_id=collect_request_id, process_status=collect_request_new_status, collect_request_note=collect_request_note
+            )
+            wastes_info: list[Waste] = await self._cam_wc_update_waste_status_and_store_by_request_id(
+                collect_request_id=collect_request_id, process_status_waste=updated_waste_status, store_id=store_id
+            )
+        return collect_request_info, wastes_info
 
-    async def _compute_new_warehouse_capacity_assigning_new_wastes(self: Self, warehouse_id: int, new_wastes_ids: list[str]) -> float:
-        return await self.cam_wc_copute_new_warehouse_capacity_assigning_new_wastes(warehouse_id=warehouse_id, new_wastes_ids=new_wastes_ids)
+    async def _load_warehouse_capacity(self: Self, warehouse_id: int) -> None:
+        await self.cam_wc_load_warehouse_capacity(warehouse_id=warehouse_id)
 
-    async def _update_warehouse_current_capacity(self: Self, warehouse_id: int, new_warehouse_capacity: float) -> float:
-        return await self.cam_wc_update_warehouse_current_capacity(warehouse_id=warehouse_id, new_warehouse_capacity=new_warehouse_capacity)
+    async def _reserve_wastes_weight_in_warehouse(self: Self, warehouse_id: int, collect_request_id: str, wastes: tuple[WasteRecord, ...]) -> float:
+        return await self.cam_wc_reserve_wastes_weight_in_warehouse(warehouse_id=warehouse_id, collect_request_id=collect_request_id, wastes=wastes)
@@ -1,10 +1,16 @@
 # !/usr/bin/python3
 # type: ignore
 
+# ** info: typing imports
+from typing import Union
+
 # ** info: fastapi imports
+from fastapi.responses import StreamingResponse
 from fastapi import HTTPException
 from fastapi import APIRouter
+from fastapi import Response
 from fastapi import status
+from fastapi import Header
 from fastapi import Body
 
 # ** info: port dtos imports
@@ -19,6 +25,9 @@ from src.modules.collect_request.ports.rest_routers_dtos.collect_request_dtos im
 # ** info: app core imports
 from src.modules.collect_request.cores.business.collect_request_core import CollectRequestCore
 
+# ** info: sidecards.helpers imports
+from src.sidecard.system.helpers.closing_streaming_response_helper import ClosingStreamingResponse
+
 # ** info: sidecards.artifacts imports
 from src.sidecard.system.artifacts.path_provider import PathProvider
 
@@ -53,11 +62,29 @@ async def api_create_request(request_create_request: CollectRequestCreateRequest
     response_model=CollectRequestFindByStatusResDto,
     status_code=status.HTTP_200_OK,
 )
-async def api_find_request_by_status(request_find_request_by_status: CollectRequestFindByStatusReqDto = Body(...)) -> CollectRequestFindByStatusResDto:
-    request_create_response: CollectRequestFindByStatusResDto = await _collect_request_core.driver_find_request_by_status(request_find_request_by_status)
+async def api_find_request_by_status(
+    response: Response, request_find_request_by_status: CollectRequestFindByStatusReqDto = Body(...), if_none_match: Union[str, None] = Header(default=None)
+) -> CollectRequestFindByStatusResDto:
+    request_create_response: CollectRequestFindByStatusResDto = await _collect_request_core.driver_find_request_by_status(
+        request_find_request_by_status, if_none_match=if_none_match, response=response
+    )
     return request_create_response
 
 
+@collect_request_router.post(
+    description="stream all the collect request with the given process status as newline delimited json, the page size is ignored and the cursor sets the starting row",
+    summary="stream all the collect request with the given process status as newline delimited json",
+    path=_path_provider.build_posix_path("status", "search", "stream"),
+    response_class=StreamingResponse,
+    status_code=status.HTTP_200_OK,
+)
+async def api_stream_request_by_status(request_find_request_by_status: CollectRequestFindByStatusReqDto = Body(...)) -> StreamingResponse:
+    stream_request_by_status_response: StreamingResponse = ClosingStreamingResponse(
+        content=await _collect_request_core.driver_stream_request_by_status(request_find_request_by_status), media_type="application/x-ndjson"
+    )
+    return stream_request_by_status_response
+
+
 @collect_request_router.post(
     description="modify the collect request status by its id",
     summary="modify the collect request status by its id",
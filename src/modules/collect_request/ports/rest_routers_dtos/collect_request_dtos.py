@@ -185,8 +185,10 @@ class CollectRequestCreateRequestDto(BaseModel):
 
 class CollectRequestFindByStatusReqDto(BaseModel):
     processStatus: int = Field(...)
+    pageSize: int = Field(default=50, ge=1, le=200)
+    cursor: Optional[str] = None
 
-    @field_validator("processStatus")
+    @field_validator("processStatus", "pageSize")
     @classmethod
     def int_validator(cls, value: int, info: ValidationInfo) -> int:
         if isinstance(value, int):
@@ -272,4 +274,6 @@ class CollectRequestFullDataResponseDto(BaseModel):
 
 class CollectRequestFindByStatusResDto(BaseModel):
     values: List[ResponseRequestDataDto] = Field(...)
+    pageSize: int = Field(...)
+    nextCursor: Optional[str] = None
     model_config = collect_request_find_by_status_res_dto
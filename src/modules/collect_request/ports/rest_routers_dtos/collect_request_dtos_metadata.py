@@ -22,7 +22,7 @@ collect_request_id_note_store_id_dto_req = {"json_schema_extra": {"examples": [{
 
 collect_request_id_note_dto = {"json_schema_extra": {"examples": [{"collectReqId": "09fe7cbc-8acf-4147-9b45-d3d79f19ceda", "note": "this is a note"}]}}
 
-collect_request_find_by_status_req_dto = {"json_schema_extra": {"examples": [{"processStatus": 9}]}}
+collect_request_find_by_status_req_dto = {"json_schema_extra": {"examples": [{"processStatus": 9, "pageSize": 50, "cursor": None}]}}
 
 collect_request_find_by_status_res_dto = {
     "json_schema_extra": {
@@ -47,7 +47,9 @@ collect_request_find_by_status_res_dto = {
                         "create": "2024-03-03 22:54:12.000000",
                         "update": "2024-03-03 22:54:12.000000",
                     },
-                ]
+                ],
+                "pageSize": 2,
+                "nextCursor": "WyIyMDI0LTAzLTAzVDIyOjU0OjEyIiwiMDk3ZDBmZDctODQ3Zi00YTFjLThmMzctMGNkZTMzOGFlYWVmIl0",
             }
         ]
     }
@@ -0,0 +1,191 @@
+# !/usr/bin/python3
+
+# ** info: python imports
+import logging
+
+# ** info: typing imports
+from typing import Union
+from typing import Self
+from typing import List
+from typing import Any
+
+# ** info: fastapi imports
+from fastapi import HTTPException
+from fastapi import status
+
+# ** info: dtos imports
+from src.modules.introspection.ports.rest_routers_dtos.introspection_dtos import CircuitBreakerStatusDto  # type: ignore
+from src.modules.introspection.ports.rest_routers_dtos.introspection_dtos import SystemStatusResponseDto  # type: ignore
+from src.modules.introspection.ports.rest_routers_dtos.introspection_dtos import CacheReloadResponseDto  # type: ignore
+from src.modules.introspection.ports.rest_routers_dtos.introspection_dtos import CacheFlushResponseDto  # type: ignore
+from src.modules.introspection.ports.rest_routers_dtos.introspection_dtos import CacheFlushRequestDto  # type: ignore
+from src.modules.introspection.ports.rest_routers_dtos.introspection_dtos import SharedCacheStatusDto  # type: ignore
+from src.modules.introspection.ports.rest_routers_dtos.introspection_dtos import HttpClientStatusDto  # type: ignore
+from src.modules.introspection.ports.rest_routers_dtos.introspection_dtos import DatabaseStatusDto  # type: ignore
+from src.modules.introspection.ports.rest_routers_dtos.introspection_dtos import CacheStatusDto  # type: ignore
+
+# ** info: sidecards.managers imports
+from src.sidecard.system.http_managers.httpx_client_manager import HttpxClientManager  # type: ignore
+from src.sidecard.system.cache_managers.shared_cache_manager import SharedCacheManager  # type: ignore
+from src.sidecard.system.database_managers.mysql_manager import MySQLManager  # type: ignore
+from src.sidecard.system.cache_managers.cache_manager import CacheManager  # type: ignore
+
+__all__: list[str] = ["IntrospectionCore"]
+
+
+class IntrospectionCore:
+    # !------------------------------------------------------------------------
+    # ! info: core slots section start
+    # !------------------------------------------------------------------------
+
+    __slots__ = ["_cache_manager", "_shared_cache_manager", "_mysql_manager", "_httpx_client_manager"]
+
+    # !------------------------------------------------------------------------
+    # ! info: core atributtes and constructor section start
+    # !------------------------------------------------------------------------
+
+    def __init__(self: Self):
+        # ** info: sidecards building
+        self._cache_manager: CacheManager = CacheManager()
+        self._shared_cache_manager: SharedCacheManager = SharedCacheManager()
+        self._mysql_manager: MySQLManager = MySQLManager()
+        self._httpx_client_manager: HttpxClientManager = HttpxClientManager()
+
+    # !------------------------------------------------------------------------
+    # ! info: driver methods section start
+    # ! warning: all the methods in this section are the ones that are going to be called from the routers layer
+    # ! warning: a method only can be declared in this section if it is going to be called from the routers layer
+    # !------------------------------------------------------------------------
+
+    async def driver_obtain_system_status(self: Self) -> SystemStatusResponseDto:
+        logging.info("starting driver_obtain_system_status")
+        system_status_response: SystemStatusResponseDto = SystemStatusResponseDto(
+            caches=await self._map_caches_status(caches_metrics=self._cache_manager.obtain_metrics()),
+            sharedCache=await self._map_shared_cache_status(shared_cache_metrics=self._shared_cache_manager.obtain_metrics()),
+            database=await self._map_database_status(
+                pool_status=self._mysql_manager.obtain_pool_status(),
+                limiter_metrics=self._mysql_manager.obtain_limiter_metrics(),
+                query_counters=self._mysql_manager.obtain_query_counters(),
+            ),
+            httpClients=await self._map_http_clients_status(http_clients_metrics=self._httpx_client_manager.obtain_metrics()),
+            circuitBreakers=await self._map_circuit_breakers_status(circuit_breakers_metrics=self._httpx_client_manager.obtain_breakers_metrics()),
+        )
+        logging.info("driver_obtain_system_status ended")
+        return system_status_response
+
+    async def driver_flush_cache(self: Self, cache_flush_request: CacheFlushRequestDto) -> CacheFlushResponseDto:
+        # ** info: only the in process cache of the worker answering is flushed, the shared tier entries leave on their own ttl
+        logging.info("starting driver_flush_cache")
+        flushed_entries: Union[int, None] = self._cache_manager.flush(name=cache_flush_request.name)
+        if flushed_entries is None:
+            logging.error(f"cache {cache_flush_request.name} does not exist")
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"cache {cache_flush_request.name} does not exist")
+        cache_flush_response: CacheFlushResponseDto = CacheFlushResponseDto(name=cache_flush_request.name, flushedEntries=flushed_entries)
+        logging.info("driver_flush_cache ended")
+        return cache_flush_response
+
+    async def driver_reload_caches(self: Self) -> CacheReloadResponseDto:
+        # ** info: the cache settings are read again from the env file and the environment, every cache of the worker answering starts empty with them
+        logging.info("starting driver_reload_caches")
+        self._cache_manager.reload()
+        cache_reload_response: CacheReloadResponseDto = CacheReloadResponseDto(caches=await self._map_caches_status(caches_metrics=self._cache_manager.obtain_metrics()))
+        logging.info("driver_reload_caches ended")
+        return cache_reload_response
+
+    # !------------------------------------------------------------------------
+    # ! info: private class methods section start
+    # ! warning: all the methods in this section are the ones that are going to be called from inside this core
+    # ! warning: a method only can be declared in this section if it is going to be called from inside this core
+    # !------------------------------------------------------------------------
+
+    async def _map_caches_status(self: Self, caches_metrics: dict[str, dict[str, Any]]) -> List[CacheStatusDto]:
+        return [await self._map_cache_status(name=name, cache_metrics=cache_metrics) for name, cache_metrics in sorted(caches_metrics.items())]
+
+    async def _map_cache_status(self: Self, name: str, cache_metrics: dict[str, Any]) -> CacheStatusDto:
+        return CacheStatusDto(
+            name=name,
+            entries=cache_metrics["entries"],
+            sizeInBytes=cache_metrics["bytes"],
+            maxBytes=cache_metrics["max_bytes"],
+            ttl=cache_metrics["ttl"],
+            hits=cache_metrics["hits"],
+            misses=cache_metrics["misses"],
+            hitRatio=cache_metrics["hit_ratio"],
+            evictions=cache_metrics["evictions"],
+            expirations=cache_metrics["expirations"],
+            invalidations=cache_metrics["invalidations"],
+            coalesced=cache_metrics["coalesced"],
+            inFlight=cache_metrics["in_flight"],
+            oldestEntryAgeSeconds=cache_metrics["oldest_entry_age"],
+        )
+
+    async def _map_shared_cache_status(self: Self, shared_cache_metrics: dict[str, Any]) -> SharedCacheStatusDto:
+        return SharedCacheStatusDto(
+            enabled=shared_cache_metrics["enabled"],
+            listening=shared_cache_metrics["listening"],
+            hits=shared_cache_metrics["hits"],
+            misses=shared_cache_metrics["misses"],
+            errors=shared_cache_metrics["errors"],
+            versionErrors=shared_cache_metrics["version_errors"],
+            publishErrors=shared_cache_metrics["publish_errors"],
+            published=shared_cache_metrics["published"],
+            received=shared_cache_metrics["received"],
+        )
+
+    async def _map_database_status(self: Self, pool_status: dict[str, int], limiter_metrics: dict[str, float], query_counters: dict[str, int]) -> DatabaseStatusDto:
+        admitted: int = int(limiter_metrics["admitted"])
+        finished: int = int(limiter_metrics["completed"] + limiter_metrics["failed"])
+        return DatabaseStatusDto(
+            poolSize=pool_status["size"],
+            checkedIn=pool_status["checked_in"],
+            checkedOut=pool_status["checked_out"],
+            overflow=pool_status["overflow"],
+            maxOverflow=pool_status["max_overflow"],
+            running=limiter_metrics["running"],
+            queued=limiter_metrics["queued"],
+            admitted=admitted,
+            rejected=limiter_metrics["rejected"],
+            queueWaitAvgSeconds=limiter_metrics["queue_wait_total_seconds"] / admitted if admitted > 0 else 0.0,
+            queueWaitMaxSeconds=limiter_metrics["queue_wait_max_seconds"],
+            runTimeAvgSeconds=limiter_metrics["run_time_total_seconds"] / finished if finished > 0 else 0.0,
+            runTimeMaxSeconds=limiter_metrics["run_time_max_seconds"],
+            statements=query_counters["statements"],
+            pings=query_counters["pings"],
+            disconnects=query_counters["disconnects"],
+            restarts=query_counters["restarts"],
+        )
+
+    async def _map_http_clients_status(self: Self, http_clients_metrics: dict[str, dict[str, Any]]) -> List[HttpClientStatusDto]:
+        return [
+            HttpClientStatusDto(
+                name=name,
+                requests=metrics["requests"],
+                connectionsOpened=metrics["connections_opened"],
+                connections=metrics["connections"],
+                idleConnections=metrics["idle_connections"],
+                activeConnections=metrics["active_connections"],
+                queuedRequests=metrics["queued_requests"],
+                maxConnections=metrics["max_connections"],
+                maxKeepaliveConnections=metrics["max_keepalive_connections"],
+                keepaliveExpirySeconds=metrics["keepalive_expiry"],
+                http2=metrics["http2"],
+            )
+            for name, metrics in sorted(http_clients_metrics.items())
+        ]
+
+    async def _map_circuit_breakers_status(self: Self, circuit_breakers_metrics: dict[str, dict[str, Any]]) -> List[CircuitBreakerStatusDto]:
+        return [
+            CircuitBreakerStatusDto(
+                name=name,
+                state=metrics["state"],
+                consecutiveFailures=metrics["consecutive_failures"],
+                failureThreshold=metrics["failure_threshold"],
+                resetTimeoutSeconds=metrics["reset_timeout"],
+                retryInSeconds=metrics["retry_in"],
+                successes=metrics["successes"],
+                failures=metrics["failures"],
+                rejected=metrics["rejected"],
+                opened=metrics["opened"],
+            )
+            for name, metrics in sorted(circuit_breakers_metrics.items())
+        ]
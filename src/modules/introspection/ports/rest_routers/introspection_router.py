@@ -0,0 +1,65 @@
+# !/usr/bin/python3
+
+# ** info: fastapi imports
+from fastapi import APIRouter
+from fastapi import status
+from fastapi import Body
+
+# ** info: port dtos imports
+from src.modules.introspection.ports.rest_routers_dtos.introspection_dtos import SystemStatusResponseDto  # type: ignore
+from src.modules.introspection.ports.rest_routers_dtos.introspection_dtos import CacheReloadResponseDto  # type: ignore
+from src.modules.introspection.ports.rest_routers_dtos.introspection_dtos import CacheFlushResponseDto  # type: ignore
+from src.modules.introspection.ports.rest_routers_dtos.introspection_dtos import CacheFlushRequestDto  # type: ignore
+
+# ** info: app core imports
+from src.modules.introspection.cores.system.introspection_core import IntrospectionCore  # type: ignore
+
+# ** info: sidecards.artifacts imports
+from src.sidecard.system.artifacts.path_provider import PathProvider  # type: ignore
+
+__all__: list[str] = ["introspection_router"]
+
+# ** info: building sidecards
+_path_provider: PathProvider = PathProvider()
+
+# ** info: building router
+introspection_router: APIRouter = APIRouter(prefix=_path_provider.build_posix_path("private"), tags=["Private Introspection"])
+
+# ** info: building router core
+_introspection_core: IntrospectionCore = IntrospectionCore()
+
+
+@introspection_router.post(
+    description="allows to obtain the state of the caches, the database pool and the http clients pools of the worker answering",
+    summary="allows to obtain the state of the caches, the database pool and the http clients pools",
+    path=_path_provider.build_posix_path("status"),
+    response_model=SystemStatusResponseDto,
+    status_code=status.HTTP_200_OK,
+)
+async def api_obtain_system_status() -> SystemStatusResponseDto:
+    system_status_response: SystemStatusResponseDto = await _introspection_core.driver_obtain_system_status()
+    return system_status_response
+
+
+@introspection_router.post(
+    description="allows to flush a single cache of the worker answering by its name",
+    summary="allows to flush a single cache by its name",
+    path=_path_provider.build_posix_path("cache", "flush"),
+    response_model=CacheFlushResponseDto,
+    status_code=status.HTTP_200_OK,
+)
+async def api_flush_cache(cache_flush_request: CacheFlushRequestDto = Body(...)) -> CacheFlushResponseDto:
+    cache_flush_response: CacheFlushResponseDto = await _introspection_core.driver_flush_cache(cache_flush_request)
+    return cache_flush_response
+
+
+@introspection_router.post(
+    description="allows to read again the cache settings of the worker answering, every cache starts empty with its new ttl and size",
+    summary="allows to read again the cache settings",
+    path=_path_provider.build_posix_path("cache", "reload"),
+    response_model=CacheReloadResponseDto,
+    status_code=status.HTTP_200_OK,
+)
+async def api_reload_caches() -> CacheReloadResponseDto:
+    cache_reload_response: CacheReloadResponseDto = await _introspection_core.driver_reload_caches()
+    return cache_reload_response
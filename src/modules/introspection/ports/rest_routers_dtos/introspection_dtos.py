@@ -0,0 +1,140 @@
+# !/usr/bin/python3
+# type: ignore
+
+# ** info: pydantic imports
+from pydantic import BaseModel
+from pydantic import Field
+
+# ** info: typing imports
+from typing import Optional
+from typing import List
+
+# **info: metadata for the model imports
+from src.modules.introspection.ports.rest_routers_dtos.introspection_dtos_metadata import system_status_res_dto_ex
+from src.modules.introspection.ports.rest_routers_dtos.introspection_dtos_metadata import cache_reload_res_dto_ex
+from src.modules.introspection.ports.rest_routers_dtos.introspection_dtos_metadata import cache_flush_req_dto_ex
+from src.modules.introspection.ports.rest_routers_dtos.introspection_dtos_metadata import cache_flush_res_dto_ex
+
+__all__: list[str] = ["SystemStatusResponseDto", "CacheFlushRequestDto", "CacheFlushResponseDto", "CacheReloadResponseDto"]
+
+
+# !------------------------------------------------------------------------
+# ! info: sub module dtos section start
+# ! warning: all models in this section are the ones that are going to be used as submodels in request or response models
+# ! warning: a model only can be declared in this section if it is going to be used as a submodel in a request or response models
+# !------------------------------------------------------------------------
+
+
+class CacheStatusDto(BaseModel):
+    name: str = Field(...)
+    entries: int = Field(...)
+    sizeInBytes: int = Field(...)
+    maxBytes: int = Field(...)
+    ttl: float = Field(...)
+    hits: int = Field(...)
+    misses: int = Field(...)
+    hitRatio: Optional[float] = None
+    evictions: int = Field(...)
+    expirations: int = Field(...)
+    invalidations: int = Field(...)
+    coalesced: int = Field(...)
+    inFlight: int = Field(...)
+    oldestEntryAgeSeconds: Optional[float] = None
+
+
+class SharedCacheStatusDto(BaseModel):
+    enabled: bool = Field(...)
+    listening: bool = Field(...)
+    hits: int = Field(...)
+    misses: int = Field(...)
+    errors: int = Field(...)
+    versionErrors: int = Field(...)
+    publishErrors: int = Field(...)
+    published: int = Field(...)
+    received: int = Field(...)
+
+
+class DatabaseStatusDto(BaseModel):
+    poolSize: int = Field(...)
+    checkedIn: int = Field(...)
+    checkedOut: int = Field(...)
+    overflow: int = Field(...)
+    maxOverflow: int = Field(...)
+    running: int = Field(...)
+    queued: int = Field(...)
+    admitted: int = Field(...)
+    rejected: int = Field(...)
+    queueWaitAvgSeconds: float = Field(...)
+    queueWaitMaxSeconds: float = Field(...)
+    runTimeAvgSeconds: float = Field(...)
+    runTimeMaxSeconds: float = Field(...)
+    statements: int = Field(...)
+    pings: int = Field(...)
+    disconnects: int = Field(...)
+    restarts: int = Field(...)
+
+
+class HttpClientStatusDto(BaseModel):
+    name: str = Field(...)
+    requests: int = Field(...)
+    connectionsOpened: int = Field(...)
+    connections: int = Field(...)
+    idleConnections: int = Field(...)
+    activeConnections: int = Field(...)
+    queuedRequests: int = Field(...)
+    maxConnections: int = Field(...)
+    maxKeepaliveConnections: int = Field(...)
+    keepaliveExpirySeconds: float = Field(...)
+    http2: bool = Field(...)
+
+
+class CircuitBreakerStatusDto(BaseModel):
+    name: str = Field(...)
+    state: str = Field(...)
+    consecutiveFailures: int = Field(...)
+    failureThreshold: int = Field(...)
+    resetTimeoutSeconds: float = Field(...)
+    retryInSeconds: float = Field(...)
+    successes: int = Field(...)
+    failures: int = Field(...)
+    rejected: int = Field(...)
+    opened: int = Field(...)
+
+
+# !------------------------------------------------------------------------
+# ! info: request model section start
+# ! warning: all models in this section are the ones that are going to be used as request dto models
+# ! warning: a model only can be declared in this section if it is going to be used as a request dto model
+# !------------------------------------------------------------------------
+
+
+class CacheFlushRequestDto(BaseModel):
+    name: str = Field(...)
+    model_config = cache_flush_req_dto_ex
+
+
+# !------------------------------------------------------------------------
+# ! info: response model section start
+# ! warning: all models in this section are the ones that are going to be used as response dto models
+# ! warning: a model only can be declared in this section if it is going to be used as a response dto model
+# !------------------------------------------------------------------------
+
+
+class SystemStatusResponseDto(BaseModel):
+    caches: List[CacheStatusDto] = Field(...)
+    sharedCache: SharedCacheStatusDto = Field(...)
+    database: DatabaseStatusDto = Field(...)
+    httpClients: List[HttpClientStatusDto] = Field(...)
+    circuitBreakers: List[CircuitBreakerStatusDto] = Field(...)
+    model_config = system_status_res_dto_ex
+
+
+class CacheFlushResponseDto(BaseModel):
+    name: str = Field(...)
+    flushedEntries: int = Field(...)
+    model_config = cache_flush_res_dto_ex
+
+
+class CacheReloadResponseDto(BaseModel):
+    caches: List[CacheStatusDto] = Field(...)
+    model_config = cache_reload_res_dto_ex
@@ -0,0 +1,106 @@
+system_status_res_dto_ex = {
+    "json_schema_extra": {
+        "examples": [
+            {
+                "caches": [
+                    {
+                        "name": "waste_provider.search_waste_by_id",
+                        "entries": 120,
+                        "sizeInBytes": 183240,
+                        "maxBytes": 1048576,
+                        "ttl": 240,
+                        "hits": 5320,
+                        "misses": 410,
+                        "hitRatio": 0.93,
+                        "evictions": 0,
+                        "expirations": 290,
+                        "invalidations": 35,
+                        "coalesced": 12,
+                        "inFlight": 0,
+                        "oldestEntryAgeSeconds": 212.4,
+                    }
+                ],
+                "sharedCache": {"enabled": False, "listening": False, "hits": 0, "misses": 0, "errors": 0, "versionErrors": 0, "publishErrors": 0, "published": 0, "received": 0},
+                "database": {
+                    "poolSize": 10,
+                    "checkedIn": 7,
+                    "checkedOut": 3,
+                    "overflow": 0,
+                    "maxOverflow": 5,
+                    "running": 3,
+                    "queued": 0,
+                    "admitted": 9211,
+                    "rejected": 0,
+                    "queueWaitAvgSeconds": 0.0004,
+                    "queueWaitMaxSeconds": 0.12,
+                    "runTimeAvgSeconds": 0.008,
+                    "runTimeMaxSeconds": 0.9,
+                    "statements": 10240,
+                    "pings": 14,
+                    "disconnects": 0,
+                    "restarts": 0,
+                },
+                "httpClients": [
+                    {
+                        "name": "warehouse_ms",
+                        "requests": 1840,
+                        "connectionsOpened": 4,
+                        "connections": 2,
+                        "idleConnections": 2,
+                        "activeConnections": 0,
+                        "queuedRequests": 0,
+                        "maxConnections": 20,
+                        "maxKeepaliveConnections": 10,
+                        "keepaliveExpirySeconds": 30.0,
+                        "http2": False,
+                    }
+                ],
+                "circuitBreakers": [
+                    {
+                        "name": "warehouse_ms",
+                        "state": "closed",
+                        "consecutiveFailures": 0,
+                        "failureThreshold": 5,
+                        "resetTimeoutSeconds": 30.0,
+                        "retryInSeconds": 0.0,
+                        "successes": 1838,
+                        "failures": 2,
+                        "rejected": 0,
+                        "opened": 0,
+                    }
+                ],
+            }
+        ]
+    }
+}
+
+cache_flush_req_dto_ex = {"json_schema_extra": {"examples": [{"name": "waste_provider.search_waste_by_id"}]}}
+
+cache_flush_res_dto_ex = {"json_schema_extra": {"examples": [{"name": "waste_provider.search_waste_by_id", "flushedEntries": 120}]}}
+
+cache_reload_res_dto_ex = {
+    "json_schema_extra": {
+        "examples": [
+            {
+                "caches": [
+                    {
+                        "name": "waste_provider.search_waste_by_id",
+                        "entries": 0,
+                        "sizeInBytes": 0,
+                        "maxBytes": 2097152,
+                        "ttl": 120,
+                        "hits": 5320,
+                        "misses": 410,
+                        "hitRatio": 0.93,
+                        "evictions": 0,
+                        "expirations": 290,
+                        "invalidations": 35,
+                        "coalesced": 12,
+                        "inFlight": 0,
+                        "oldestEntryAgeSeconds": None,
+                    }
+                ]
+            }
+        ]
+    }
+}
@@ -0,0 +1,95 @@
+# !/usr/bin/python3
+# type: ignore
+
+# ** info: python imports
+from types import MappingProxyType
+import logging
+import asyncio
+
+# ** info: typing imports
+from typing import FrozenSet
+from typing import Mapping
+from typing import Union
+from typing import Self
+
+# ** info: fastapi imports
+from fastapi import HTTPException
+from fastapi import status
+
+# ** info: providers imports
+from src.modules.parameter.adapters.database_providers.parameter_provider import ParameterProvider
+
+# ** info: sidecards.helpers imports
+from src.sidecard.system.helpers.singleton_helper import Singleton
+
+# ** info: sidecards.artifacts imports
+from src.sidecard.system.artifacts.env_provider import EnvProvider
+
+__all__: list[str] = ["ParameterCatalogProvider"]
+
+# ** info: seconds between load attempts while the catalog has never been loaded
+parameter_catalog_retry_seconds: float = 5.0
+
+
+class ParameterCatalogProvider(metaclass=Singleton):
+    # ** info: every active parameter is loaded with a single query and kept in memory, the domain validations never reach the database
+    def __init__(self: Self) -> None:
+        self._env_provider: EnvProvider = EnvProvider()
+        self._parameter_provider: ParameterProvider = ParameterProvider()
+        self._refresh_seconds: float = self._env_provider.parameter_catalog_refresh_seconds
+        self._ids_by_domain: Mapping[str, FrozenSet[int]] = MappingProxyType(dict())
+        self._labels_by_domain: Mapping[str, tuple[tuple[int, str], ...]] = MappingProxyType(dict())
+        self._loaded: bool = False
+        self._refresher: Union[asyncio.Task, None] = None
+
+    async def start(self: Self) -> None:
+        # ** info: a failed first load does not stop the app, the background refresher keeps retrying
+        try:
+            await self.refresh()
+        except Exception:
+            logging.exception("parameter catalog could not be loaded at startup")
+        if self._refresher is None or self._refresher.done():
+            self._refresher = asyncio.get_running_loop().create_task(self._refresh_periodically())
+
+    async def stop(self: Self) -> None:
+        if self._refresher is not None:
+            self._refresher.cancel()
+            self._refresher = None
+
+    async def refresh(self: Self) -> None:
+        logging.debug("refreshing parameter catalog")
+        parameters: list[tuple[str, int, str]] = await self._parameter_provider.list_active_parameters()
+        ids_by_domain: dict[str, list[int]] = dict()
+        labels_by_domain: dict[str, list[tuple[int, str]]] = dict()
+        for domain, id, value in parameters:
+            ids_by_domain.setdefault(domain, list()).append(id)
+            labels_by_domain.setdefault(domain, list()).append((id, value))
+        # ** info: both indexes are swapped in one step, readers see either the previous catalog or the new one
+        self._ids_by_domain, self._labels_by_domain = (
+            MappingProxyType({domain: frozenset(ids) for domain, ids in ids_by_domain.items()}),
+            MappingProxyType({domain: tuple(labels) for domain, labels in labels_by_domain.items()}),
+        )
+        self._loaded = True
+        logging.debug(f"parameter catalog refreshed with {len(parameters)} parameters")
+
+    def obtain_ids_by_domain(self: Self, domain: str) -> FrozenSet[int]:
+        self._check_loaded()
+        return self._ids_by_domain.get(domain, frozenset())
+
+    def obtain_labels_by_domain(self: Self, domain: str) -> tuple[tuple[int, str], ...]:
+        self._check_loaded()
+        return self._labels_by_domain.get(domain, tuple())
+
+    def _check_loaded(self: Self) -> None:
+        if self._loaded is False:
+            logging.error("parameter catalog is not loaded yet")
+            raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE)
+
+    async def _refresh_periodically(self: Self) -> None:
+        while True:
+            await asyncio.sleep(self._refresh_seconds if self._loaded is True else parameter_catalog_retry_seconds)
+            try:
+                await self.refresh()
+            except Exception:
+                # ** info: the previous catalog keeps being served until a refresh succeeds
+                logging.exception("parameter catalog refresh failed")
@@ -4,20 +4,24 @@
 import logging
 
 # ** info: typing imports
+from typing import FrozenSet
+from typing import Union
 from typing import Self
 from typing import List
-from typing import Set
+
+# ** info: fastapi imports
+from fastapi import Response
 
 # ** info: dtos imports
 from src.modules.parameter.ports.rest_routers_dtos.parameter_dtos import ParameterSearchResponseDto  # type: ignore
 from src.modules.parameter.ports.rest_routers_dtos.parameter_dtos import ParameterSearchRequestDto  # type: ignore
 from src.modules.parameter.ports.rest_routers_dtos.parameter_dtos import ParameterDataDto  # type: ignore
 
-# ** info: entities imports
-from src.modules.parameter.adapters.database_providers_entities.parameter_entity import Parameter  # type: ignore
-
 # ** info: providers imports
-from src.modules.parameter.adapters.database_providers.parameter_provider import ParameterProvider  # type: ignore
+from src.modules.parameter.adapters.database_providers.parameter_catalog_provider import ParameterCatalogProvider  # type: ignore
+
+# ** info: sidecards.artifacts imports
+from src.sidecard.system.artifacts.etag_provider import EtagProvider  # type: ignore
 
 __all__: list[str] = ["ParameterCore"]
 
@@ -27,7 +31,7 @@ class ParameterCore:
     # ! info: core slots section start
     # !------------------------------------------------------------------------
 
-    __slots__ = ["_parameter_provider"]
+    __slots__ = ["_parameter_catalog_provider", "_etag_provider"]
 
     # !------------------------------------------------------------------------
     # ! info: core atributtes and constructor section start
@@ -35,7 +39,9 @@ class ParameterCore:
 
     def __init__(self: Self):
         # ** info: providers building
-        self._parameter_provider: ParameterProvider = ParameterProvider()
+        self._parameter_catalog_provider: ParameterCatalogProvider = ParameterCatalogProvider()
+        # ** info: sidecards building
+        self._etag_provider: EtagProvider = EtagProvider()
 
     # !------------------------------------------------------------------------
     # ! info: driver methods section start
@@ -43,9 +49,14 @@ class ParameterCore:
     # ! warning: a method only can be declared in this section if it is going to be called from the routers layer
     # !------------------------------------------------------------------------
 
-    async def driver_search_parameter(self: Self, parameter_search_request: ParameterSearchRequestDto) -> ParameterSearchResponseDto:
+    async def driver_search_parameter(
+        self: Self, parameter_search_request: ParameterSearchRequestDto, if_none_match: Union[str, None] = None, response: Union[Response, None] = None
+    ) -> ParameterSearchResponseDto:
         logging.info("starting driver_search_parameter")
-        parameters: List[Parameter] = await self._search_by_domain(domain=parameter_search_request.domain)
+        parameters: tuple[tuple[int, str], ...] = await self._search_by_domain(domain=parameter_search_request.domain)
+        # ** info: the catalog keeps the same tuple of a domain until it is refreshed, the etag is only hashed once per refresh
+        etag: str = self._etag_provider.build_etag(scope=f"parameter_search:{parameter_search_request.domain}", data=parameters)
+        self._etag_provider.check_etag(etag=etag, if_none_match=if_none_match, response=response)
         parameter_search_response: ParameterSearchResponseDto = await self._map_parameter_response(parameters=parameters)
         logging.info("driver_search_parameter ended")
         return parameter_search_response
@@ -63,10 +74,9 @@ class ParameterCore:
     # !------------------------------------------------------------------------
 
     # ** info: cpm pc are initials for core port methods parameter core
-    async def cpm_pc_get_set_of_parameter_ids_by_domain(self: Self, domain: str) -> Set[int]:
+    async def cpm_pc_get_set_of_parameter_ids_by_domain(self: Self, domain: str) -> FrozenSet[int]:
         logging.info("starting cpm_pc_get_set_of_parameter_ids_by_domain")
-        parameters_list: List[Parameter] = self._parameter_provider.search_parameters_by_domain(domain=domain)
-        parameters_ids: Set[int] = set([parameter.id for parameter in parameters_list])
+        parameters_ids: FrozenSet[int] = self._parameter_catalog_provider.obtain_ids_by_domain(domain=domain)
         logging.info("cpm_pc_get_set_of_parameter_ids_by_domain ended")
         return parameters_ids
 
@@ -76,19 +86,20 @@ class ParameterCore:
     # ! warning: a method only can be declared in this section if it is going to be called from inside this core
     # !------------------------------------------------------------------------
 
-    async def _search_by_domain(self: Self, domain: str) -> List[Parameter]:
-        parameters: List[Parameter] = self._parameter_provider.search_parameters_by_domain(domain=domain)
+    async def _search_by_domain(self: Self, domain: str) -> tuple[tuple[int, str], ...]:
+        parameters: tuple[tuple[int, str], ...] = self._parameter_catalog_provider.obtain_labels_by_domain(domain=domain)
         return parameters
 
-    async def _map_parameter_response(self: Self, parameters: List[Parameter]) -> ParameterSearchResponseDto:
+    async def _map_parameter_response(self: Self, parameters: tuple[tuple[int, str], ...]) -> ParameterSearchResponseDto:
         return ParameterSearchResponseDto(values=await self._map_parameters_data(parameters=parameters))
 
-    async def _map_parameters_data(self: Self, parameters: List[Parameter]) -> List[ParameterDataDto]:
+    async def _map_parameters_data(self: Self, parameters: tuple[tuple[int, str], ...]) -> List[ParameterDataDto]:
         parameters_data: List[ParameterDataDto] = []
         for parameter in parameters:
             parameter_data: ParameterDataDto = await self._map_parameter_data(parameter=parameter)
             parameters_data.append(parameter_data)
         return parameters_data
 
-    async def _map_parameter_data(self: Self, parameter: Parameter) -> ParameterDataDto:
-        return ParameterDataDto(label=parameter.value, value=parameter.id)
+    async def _map_parameter_data(self: Self, parameter: tuple[int, str]) -> ParameterDataDto:
+        id, label = parameter
+        return ParameterDataDto(label=label, value=id)
@@ -1,8 +1,13 @@
 # !/usr/bin/python3
 
+# ** info: typing imports
+from typing import Union
+
 # ** info: fastapi imports
 from fastapi import APIRouter
+from fastapi import Response
 from fastapi import status
+from fastapi import Header
 from fastapi import Body
 
 # ** info: port dtos imports
@@ -34,6 +39,8 @@ _parameter_core: ParameterCore = ParameterCore()
     response_model=ParameterSearchResponseDto,
     status_code=status.HTTP_200_OK,
 )
-async def api_search_parameter(parameter_search_request: ParameterSearchRequestDto = Body(...)) -> ParameterSearchResponseDto:
-    parameter_search_response: ParameterSearchResponseDto = await _parameter_core.driver_search_parameter(parameter_search_request)
+async def api_search_parameter(
+    response: Response, parameter_search_request: ParameterSearchRequestDto = Body(...), if_none_match: Union[str, None] = Header(default=None)
+) -> ParameterSearchResponseDto:
+    parameter_search_response: ParameterSearchResponseDto = await _parameter_core.driver_search_parameter(parameter_search_request, if_none_match=if_none_match, response=response)
     return parameter_search_response
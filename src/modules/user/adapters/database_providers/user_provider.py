@@ -2,79 +2,87 @@
 # type: ignore
 
 # ** info: python imports
+from dataclasses import fields
 from datetime import datetime
 import logging
 
 # ** info: typing imports
+from typing import Union
 from typing import Self
 from typing import Any
 
 # ** info: sqlmodel imports
-from sqlmodel import Session
 from sqlmodel import select
 
 # ** info: stamina imports
 from stamina import retry
 
 # ** info: users entity
+from src.modules.user.adapters.database_providers_entities.user_entity import UserRecord
 from src.modules.user.adapters.database_providers_entities.user_entity import User
 
 # ** info: sidecards.database_managers imports
 from src.sidecard.system.database_managers.mysql_manager import MySQLManager
 
+# ** info: sidecards.cache_managers imports
+from src.sidecard.system.cache_managers.cache_manager import single_flight
+from src.sidecard.system.cache_managers.cache_manager import MeteredCache
+from src.sidecard.system.cache_managers.cache_manager import CacheManager
+
+# ** info: sidecards.helpers imports
+from src.sidecard.system.helpers.cache_key_helper import CacheKey
+
 # ** info: sidecards.artifacts imports
 from src.sidecard.system.artifacts.datetime_provider import DatetimeProvider
 from src.sidecard.system.artifacts.uuid_provider import UuidProvider
-from src.sidecard.system.artifacts.env_provider import EnvProvider
 
-# ** info: cachetools imports
-from cachetools import TTLCache
-from cachetools import cached
+# ** info: asyncache imports
+from asyncache import cached as async_cached
 
 __all__: list[str] = ["UserProvider"]
 
-# ** info: creating a shared cache for all the waste provider instances
-user_provider_cache: TTLCache = TTLCache(ttl=240, maxsize=20)
+# ** info: every cached method of the user provider gets its own cache, ttl and size come from the cache settings
+_cache_manager: CacheManager = CacheManager()
+search_user_by_email_cache: MeteredCache = _cache_manager.obtain_cache(name="user_provider.search_user_by_email")
+
+# ** info: cache keys of every cached method, the writes use them to evict only the entries they make stale
+search_user_by_email_key: CacheKey = CacheKey("search_user_by_email", "email")
+
+# ** info: columns selected by the cached reads, in the same order as the user record fields
+user_record_columns: tuple[Any, ...] = tuple(getattr(User, field.name) for field in fields(UserRecord))
 
 
 class UserProvider:
     def __init__(self: Self) -> None:
-        self._env_provider: EnvProvider = EnvProvider()
         self._uuid_provider: UuidProvider = UuidProvider()
         self._datetime_provider: DatetimeProvider = DatetimeProvider()
-        self._session_manager: MySQLManager = MySQLManager(
-            password=self._env_provider.database_password,
-            database=self._env_provider.database_name,
-            username=self._env_provider.database_user,
-            host=self._env_provider.database_host,
-            port=self._env_provider.database_port,
-            drivername=r"mysql+pymysql",
-            query={"charset": "utf8"},
-        )
+        self._session_manager: MySQLManager = MySQLManager()
 
     def clear_cache(self: Self) -> None:
-        user_provider_cache.clear()
+        _cache_manager.clear(prefix="user_provider.")
 
     @retry(on=Exception, attempts=4, wait_initial=0.08, wait_exp_base=2)
-    def create_user_with_basic_info(self: Self, email: str, name: str, last_name: str) -> User:
+    async def create_user_with_basic_info(self: Self, email: str, name: str, last_name: str) -> User:
         logging.debug("creating new user with basic info")
-        session: Session = self._session_manager.obtain_session()
-        uuid: str = self._uuid_provider.get_str_uuid()
-        date_time: datetime = self._datetime_provider.get_current_time()
-        new_user: User = User(uuid=uuid, active=True, email=email, name=name, last_name=last_name, create=date_time, update=date_time)
-        session.add(new_user)
-        session.commit()
-        session.refresh(new_user)
-        self.clear_cache()
-        logging.debug("new user with basic info created")
-        return new_user
-
-    @cached(user_provider_cache)
+        async with self._session_manager.obtain_session() as session:
+            uuid: str = self._uuid_provider.get_str_uuid()
+            date_time: datetime = self._datetime_provider.get_current_time()
+            new_user: User = User(uuid=uuid, active=True, email=email, name=name, last_name=last_name, create=date_time, update=date_time)
+            session.add(new_user)
+            await session.commit()
+            await session.refresh(new_user)
+            search_user_by_email_key.evict(cache=search_user_by_email_cache, email=email)
+            logging.debug("new user with basic info created")
+            return new_user
+
+    @async_cached(search_user_by_email_cache, key=search_user_by_email_key)
+    @single_flight(search_user_by_email_cache, key=search_user_by_email_key)
     @retry(on=Exception, attempts=4, wait_initial=0.08, wait_exp_base=2)
-    def search_user_by_email(self: Self, email: str) -> User:
+    async def search_user_by_email(self: Self, email: str) -> Union[UserRecord, None]:
         logging.debug(f"searching user by email {email}")
-        session: Session = self._session_manager.obtain_session()
-        query: Any = select(User).where(User.email == email)
-        query_result: User = session.exec(statement=query).first()
-        logging.debug("searching user by email ended")
-        return query_result
+        async with self._session_manager.obtain_session() as session:
+            query: Any = select(*user_record_columns).where(User.email == email)
+            row: Any = (await session.exec(statement=query)).first()
+            query_result: Union[UserRecord, None] = None if row is None else UserRecord(*row)
+            logging.debug("searching user by email ended")
+            return query_result
@@ -2,6 +2,7 @@
 # type: ignore
 
 # ** info: python imports
+from dataclasses import dataclass
 from datetime import datetime
 
 # ** info: sqlmodel imports
@@ -20,3 +21,15 @@ class User(SQLModel, table=True):
     last_name: str = Field(max_length=200, nullable=False)
     create: datetime = Field(nullable=False)
     update: datetime = Field(nullable=False)
+
+
+# ** info: detached read model of the cached reads, filled straight from the selected columns without identity map tracking
+@dataclass(frozen=True, slots=True)
+class UserRecord:
+    uuid: str
+    active: bool
+    email: str
+    name: str
+    last_name: str
+    create: datetime
+    update: datetime
@@ -4,6 +4,7 @@
 import logging
 
 # ** info: typing imports
+from typing import Union
 from typing import Self
 
 # ** info: fastapi imports
@@ -16,6 +17,7 @@ from src.modules.user.ports.rest_routers_dtos.user_dtos import UserCreationReque
 from src.modules.user.ports.rest_routers_dtos.user_dtos import UserByEmailRequestDto  # type: ignore
 
 # ** info: entities imports
+from src.modules.user.adapters.database_providers_entities.user_entity import UserRecord  # type: ignore
 from src.modules.user.adapters.database_providers_entities.user_entity import User  # type: ignore
 
 # ** info: providers imports
@@ -62,7 +64,7 @@ class UserCore:
 
     async def driver_get_user_by_email(self: Self, user_by_email_request: UserByEmailRequestDto) -> UserCreationResponseDto:
         logging.info("starting driver_get_user_by_email")
-        user_data: User = await self._search_user_by_email(email=user_by_email_request.email)
+        user_data: Union[UserRecord, None] = await self._search_user_by_email(email=user_by_email_request.email)
         if not user_data:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=self._i8n.message(message_key="EM002", email=user_by_email_request.email))
         user_creation_response: UserCreationResponseDto = await self._map_user_to_user_creation_response_dto(user=user_data)
@@ -87,7 +89,7 @@ class UserCore:
     # ! warning: a method only can be declared in this section if it is going to be called from inside this core
     # !------------------------------------------------------------------------
 
-    async def _map_user_to_user_creation_response_dto(self: Self, user: User) -> UserCreationResponseDto:
+    async def _map_user_to_user_creation_response_dto(self: Self, user: Union[User, UserRecord]) -> UserCreationResponseDto:
         user_creation_response: UserCreationResponseDto = UserCreationResponseDto(
             create=self._datetime_provider.prettify_date_time_obj(date_time_obj=user.create),
             update=self._datetime_provider.prettify_date_time_obj(date_time_obj=user.update),
@@ -100,14 +102,16 @@ class UserCore:
         return user_creation_response
 
     async def _create_user_with_basic_info(self: Self, user_creation_request: UserCreationRequestDto) -> User:
-        user: User = self._user_provider.create_user_with_basic_info(email=user_creation_request.email, name=user_creation_request.name, last_name=user_creation_request.lastName)
+        user: User = await self._user_provider.create_user_with_basic_info(
+            email=user_creation_request.email, name=user_creation_request.name, last_name=user_creation_request.lastName
+        )
         return user
 
-    async def _search_user_by_email(self: Self, email: str) -> User:
-        user: User = self._user_provider.search_user_by_email(email=email)
+    async def _search_user_by_email(self: Self, email: str) -> Union[UserRecord, None]:
+        user: Union[UserRecord, None] = await self._user_provider.search_user_by_email(email=email)
         return user
 
     async def _check_if_user_exists_by_email(self: Self, email: str) -> None:
-        user: User = self._user_provider.search_user_by_email(email=email)
+        user: Union[UserRecord, None] = await self._user_provider.search_user_by_email(email=email)
         if user:
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=self._i8n.message(message_key="EM001", email=email))
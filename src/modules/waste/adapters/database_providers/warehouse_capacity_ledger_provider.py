@@ -0,0 +1,278 @@
+# !/usr/bin/python3
+# type: ignore
+
+# ** info: python imports
+from collections import defaultdict
+from time import monotonic
+import logging
+import asyncio
+
+# ** info: typing imports
+from typing import Union
+from typing import Self
+
+# ** info: fastapi imports
+from fastapi import HTTPException
+from fastapi import status
+
+# ** info: entities imports
+from src.modules.waste.adapters.database_providers_entities.warehouse_reservation_entity import WarehouseReservationBatchRecord
+from src.modules.waste.adapters.database_providers_entities.warehouse_reservation_entity import WarehouseReservationRecord
+
+# ** info: providers imports
+from src.modules.waste.adapters.database_providers.warehouse_reservation_provider import WarehouseReservationProvider
+
+# ** info: adapter imports
+from src.modules.waste.adapters.rest_services.warehouse_ms_service import WarehouseMsService
+
+# ** info: sidecards.database_managers imports
+from src.sidecard.system.database_managers.mysql_manager import MySQLManager
+
+# ** info: sidecards.helpers imports
+from src.sidecard.system.helpers.singleton_helper import Singleton
+
+# ** info: sidecards.artifacts imports
+from src.sidecard.system.artifacts.env_provider import EnvProvider
+from src.sidecard.system.artifacts.uuid_provider import UuidProvider
+
+__all__: list[str] = ["WarehouseCapacityLedgerProvider"]
+
+
+class WarehouseCapacityLedgerProvider(metaclass=Singleton):
+    # ** info: the capacity checks of the request path are local arithmetic, the last capacity synced from the warehouse ms minus the kg still reserved
+    # ** info: the reservations are stored in mysql and written to the warehouse ms by a background reconciliation, only the capacity load before the first reservation reads it
+    # ! warning: every worker only counts its own reservations, across workers a warehouse can be overbooked by what the others reserved since the last pass
+    # ** info: a batch left claimed by a worker that died or lost its outcome is recovered once it is stuck for the stuck batch seconds, checking the warehouse ms
+    # ! warning: the stuck batch seconds must be longer than any write with its retries, a batch still written by another worker would be recovered under it
+    def __init__(self: Self) -> None:
+        self._env_provider: EnvProvider = EnvProvider()
+        self._warehouse_reservation_provider: WarehouseReservationProvider = WarehouseReservationProvider()
+        self._warehouse_ms_service: WarehouseMsService = WarehouseMsService()
+        self._mysql_manager: MySQLManager = MySQLManager()
+        self._uuid_provider: UuidProvider = UuidProvider()
+        self._reconcile_seconds: float = self._env_provider.sar_warehouse_ledger_reconcile_seconds
+        self._stuck_batch_seconds: float = self._env_provider.sar_warehouse_ledger_stuck_batch_seconds
+        self._capacities: dict[int, float] = dict()
+        self._reservations: defaultdict[int, dict[str, tuple[float, float]]] = defaultdict(dict)
+        self._locks: defaultdict[int, asyncio.Lock] = defaultdict(asyncio.Lock)
+        self._unsettled_batches: dict[str, bool] = dict()
+        self._in_flight_batches: set[str] = set()
+        self._unrecoverable_batches: set[str] = set()
+        self._reconciler: Union[asyncio.Task, None] = None
+        self._reconciliation: Union[asyncio.Task, None] = None
+        self._metrics: dict[str, int] = {"reservations": 0, "rejected": 0, "reconciliations": 0, "applied": 0, "released": 0, "unconfirmed": 0, "recovered": 0}
+
+    async def start(self: Self) -> None:
+        # ** info: a failed first pass does not stop the app, the reservations stay pending in mysql until a pass succeeds
+        try:
+            await self.reconcile()
+        except Exception:
+            logging.exception("warehouse capacity ledger could not be reconciled at startup")
+        if self._reconciler is None or self._reconciler.done():
+            self._reconciler = asyncio.get_running_loop().create_task(self._reconcile_periodically())
+
+    async def stop(self: Self) -> None:
+        # ** info: only the wait between passes is cancelled, a pass in flight is waited for so the shutdown does not leave its batch claimed
+        if self._reconciler is not None:
+            self._reconciler.cancel()
+            self._reconciler = None
+        if self._reconciliation is not None and self._reconciliation.done() is False:
+            try:
+                await asyncio.shield(self._reconciliation)
+            except Exception:
+                logging.exception("warehouse capacity ledger reconciliation failed")
+            self._reconciliation = None
+
+    async def load_capacity(self: Self, warehouse_id: int) -> None:
+        # ** info: called before the unit of work that reserves, the warehouse ms is never read while a transaction and a database connection are held
+        if warehouse_id in self._capacities:
+            return
+        warehouse_capacity: float = await self._warehouse_ms_service.obtain_warehouse_current_capacity(warehouse_id=warehouse_id)
+        async with self._locks[warehouse_id]:
+            self._capacities.setdefault(warehouse_id, warehouse_capacity)
+
+    async def reserve(self: Self, warehouse_id: int, source_uuid: str, weight_in_kg: float) -> float:
+        # ** info: only local work, the check is arithmetic over the loaded capacity and the reservation row joins the unit of work of the caller
+        async with self._locks[warehouse_id]:
+            if warehouse_id not in self._capacities:
+                logging.error(f"warehouse {warehouse_id} capacity was not loaded before reserving on it")
+                raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR)
+            available_capacity: float = self._obtain_available_capacity(warehouse_id=warehouse_id)
+            if available_capacity < weight_in_kg:
+                self._metrics["rejected"] += 1
+                logging.error(f"warehouse capacity {available_capacity} is less than wastes total weight {weight_in_kg}")
+                raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"warehouse capacity {available_capacity} is less than wastes total weight {weight_in_kg}")
+            uuid: str = self._uuid_provider.get_str_uuid()
+            self._reservations[warehouse_id][uuid] = (weight_in_kg, monotonic())
+
+        # ** info: a unit of work that rolls back takes its reservation out of the index, a retried unit of work does not count it twice
+        def drop_reservation() -> None:
+            self._reservations[warehouse_id].pop(uuid, None)
+
+        try:
+            await self._warehouse_reservation_provider.store_warehouse_reservation(uuid=uuid, warehouse_id=warehouse_id, source_uuid=source_uuid, weight_in_kg=weight_in_kg)
+        except BaseException:
+            drop_reservation()
+            raise
+        self._mysql_manager.run_after_rollback(callback=drop_reservation)
+        self._metrics["reservations"] += 1
+        return available_capacity - weight_in_kg
+
+    async def reconcile(self: Self) -> None:
+        logging.debug("reconciling warehouse capacity ledger")
+        started: float = monotonic()
+        await self._settle_batches()
+        await self._recover_stuck_batches()
+        pending_reservations: tuple[WarehouseReservationRecord, ...] = await self._warehouse_reservation_provider.list_pending_warehouse_reservations()
+        pending_by_warehouse: defaultdict[int, list[WarehouseReservationRecord]] = defaultdict(list)
+        for pending_reservation in pending_reservations:
+            pending_by_warehouse[pending_reservation.warehouse_id].append(pending_reservation)
+        # ** info: the warehouses without pending reservations are read again too, that is how the changes made outside this service reach the ledger
+        for warehouse_id in set(pending_by_warehouse.keys()) | set(self._capacities.keys()):
+            try:
+                await self._reconcile_warehouse(warehouse_id=warehouse_id, pending_reservations=tuple(pending_by_warehouse[warehouse_id]), started=started)
+            except Exception:
+                logging.exception(f"warehouse {warehouse_id} capacity could not be reconciled")
+        self._metrics["reconciliations"] += 1
+        logging.debug(f"warehouse capacity ledger reconciled with {len(pending_reservations)} pending reservations")
+
+    def obtain_metrics(self: Self) -> dict[str, int]:
+        return {
+            **self._metrics,
+            "warehouses": len(self._capacities),
+            "pending": sum(len(reservations) for reservations in self._reservations.values()),
+            "unsettled": len(self._unsettled_batches),
+            "unrecoverable": len(self._unrecoverable_batches),
+        }
+
+    def _obtain_available_capacity(self: Self, warehouse_id: int) -> float:
+        return self._capacities[warehouse_id] - sum(weight_in_kg for weight_in_kg, _ in self._reservations[warehouse_id].values())
+
+    async def _reconcile_warehouse(self: Self, warehouse_id: int, pending_reservations: tuple[WarehouseReservationRecord, ...], started: float) -> None:
+        applied_reservations: tuple[WarehouseReservationRecord, ...] = tuple()
+        warehouse_capacity: float
+        if len(pending_reservations) > 0:
+            applied_reservations, warehouse_capacity = await self._apply_pending_reservations(warehouse_id=warehouse_id, pending_reservations=pending_reservations)
+        if len(applied_reservations) == 0:
+            warehouse_capacity = await self._warehouse_ms_service.obtain_warehouse_current_capacity(warehouse_id=warehouse_id)
+        self._metrics["applied"] += len(applied_reservations)
+        applied_uuids: set[str] = {reservation.uuid for reservation in applied_reservations}
+        pending_uuids: set[str] = {pending_reservation.uuid for pending_reservation in pending_reservations}
+        async with self._locks[warehouse_id]:
+            self._capacities[warehouse_id] = warehouse_capacity
+            reservations: dict[str, tuple[float, float]] = self._reservations[warehouse_id]
+            # ** info: the synced capacity already counts the applied reservations, they leave the index with the same update
+            # ** info: the ones stored before the pass that were not pending were applied by another worker or rolled back, a grace period lets the slow commits land
+            for uuid, (_, reserved_at) in list(reservations.items()):
+                if uuid in applied_uuids:
+                    del reservations[uuid]
+                elif uuid not in pending_uuids and reserved_at < started - self._reconcile_seconds:
+                    self._metrics["released"] += 1
+                    del reservations[uuid]
+
+    async def _apply_pending_reservations(
+        self: Self, warehouse_id: int, pending_reservations: tuple[WarehouseReservationRecord, ...]
+    ) -> tuple[tuple[WarehouseReservationRecord, ...], Union[float, None]]:
+        # ** info: no transaction is open while the warehouse ms is called, the reservations are claimed before the write and marked after it in short ones
+        # ** info: a claimed reservation is not pending anymore, a failure after the write can not make a later pass write it again
+        batch_uuid: str = self._uuid_provider.get_str_uuid()
+        claimed_reservations: tuple[WarehouseReservationRecord, ...] = await self._warehouse_reservation_provider.claim_pending_warehouse_reservations(
+            uuids=tuple(pending_reservation.uuid for pending_reservation in pending_reservations), batch_uuid=batch_uuid
+        )
+        if len(claimed_reservations) == 0:
+            return claimed_reservations, None
+        write_started: bool = False
+
+        async def record_write_start(capacity_before_write: float, capacity_after_write: float) -> None:
+            nonlocal write_started
+            await self._warehouse_reservation_provider.record_warehouse_reservations_write(
+                batch_uuid=batch_uuid, capacity_before_write=capacity_before_write, capacity_after_write=capacity_after_write
+            )
+            write_started = True
+
+        self._in_flight_batches.add(batch_uuid)
+        try:
+            warehouse_capacity: float = await self._warehouse_ms_service.adjust_warehouse_capacity(
+                warehouse_id=warehouse_id,
+                delta=-sum(float(reservation.weight_in_kg) for reservation in claimed_reservations),
+                enforce_capacity=False,
+                before_write=record_write_start,
+            )
+        except BaseException:
+            # ** info: a cancelled pass gives its batch back too, the release is shielded so a second cancellation does not stop it halfway
+            if write_started is False:
+                await asyncio.shield(self._store_batch_outcome(batch_uuid=batch_uuid, applied=False))
+            else:
+                self._metrics["unconfirmed"] += len(claimed_reservations)
+                logging.error(f"warehouse {warehouse_id} batch {batch_uuid} may have been written to the warehouse ms, it stays claimed until the stuck batch recovery checks it")
+            raise
+        finally:
+            self._in_flight_batches.discard(batch_uuid)
+        await self._store_batch_outcome(batch_uuid=batch_uuid, applied=True)
+        return claimed_reservations, warehouse_capacity
+
+    async def _store_batch_outcome(self: Self, batch_uuid: str, applied: bool) -> None:
+        # ** info: the outcome of the write is already known, if it can not be stored now it is stored by the next pass before it claims anything
+        try:
+            if applied is True:
+                await self._warehouse_reservation_provider.mark_warehouse_reservations_as_applied(batch_uuid=batch_uuid)
+            else:
+                await self._warehouse_reservation_provider.release_warehouse_reservations(batch_uuid=batch_uuid)
+        except Exception:
+            logging.exception(f"warehouse reservations batch {batch_uuid} outcome could not be stored")
+            self._unsettled_batches[batch_uuid] = applied
+
+    async def _settle_batches(self: Self) -> None:
+        for batch_uuid, applied in list(self._unsettled_batches.items()):
+            if applied is True:
+                await self._warehouse_reservation_provider.mark_warehouse_reservations_as_applied(batch_uuid=batch_uuid)
+            else:
+                await self._warehouse_reservation_provider.release_warehouse_reservations(batch_uuid=batch_uuid)
+            del self._unsettled_batches[batch_uuid]
+
+    async def _recover_stuck_batches(self: Self) -> None:
+        stuck_batches: tuple[WarehouseReservationBatchRecord, ...] = await self._warehouse_reservation_provider.list_stuck_warehouse_reservation_batches(
+            stuck_for=self._stuck_batch_seconds
+        )
+        for stuck_batch in stuck_batches:
+            # ** info: the batches of this worker still being written or waiting for their outcome to be stored are not stuck
+            if stuck_batch.batch_uuid in self._in_flight_batches or stuck_batch.batch_uuid in self._unsettled_batches or stuck_batch.batch_uuid in self._unrecoverable_batches:
+                continue
+            try:
+                await self._recover_stuck_batch(stuck_batch=stuck_batch)
+            except Exception:
+                logging.exception(f"warehouse reservations batch {stuck_batch.batch_uuid} could not be recovered")
+
+    async def _recover_stuck_batch(self: Self, stuck_batch: WarehouseReservationBatchRecord) -> None:
+        # ** info: a batch that never recorded its write did not reach the warehouse ms, its reservations go back to pending
+        applied: bool = False
+        if stuck_batch.capacity_after_write is not None:
+            # ** info: the warehouse ms is checked, the capacity still at the one written back means the write landed and the one read means it did not
+            warehouse_capacity: float = round(await self._warehouse_ms_service.obtain_warehouse_current_capacity(warehouse_id=stuck_batch.warehouse_id), 2)
+            if warehouse_capacity == float(stuck_batch.capacity_after_write):
+                applied = True
+            elif warehouse_capacity != float(stuck_batch.capacity_before_write):
+                # ** info: the capacity moved since, the write can not be told apart from the later changes so the batch is not guessed
+                self._unrecoverable_batches.add(stuck_batch.batch_uuid)
+                logging.error(
+                    f"warehouse {stuck_batch.warehouse_id} batch {stuck_batch.batch_uuid} is stuck and the warehouse capacity {warehouse_capacity} is neither "
+                    f"{stuck_batch.capacity_before_write} nor {stuck_batch.capacity_after_write}, it stays claimed"
+                )
+                return
+        if applied is True:
+            await self._warehouse_reservation_provider.mark_warehouse_reservations_as_applied(batch_uuid=stuck_batch.batch_uuid)
+        else:
+            await self._warehouse_reservation_provider.release_warehouse_reservations(batch_uuid=stuck_batch.batch_uuid)
+        self._metrics["recovered"] += 1
+        logging.warning(f"warehouse {stuck_batch.warehouse_id} stuck batch {stuck_batch.batch_uuid} recovered as {'applied' if applied is True else 'released'}")
+
+    async def _reconcile_periodically(self: Self) -> None:
+        while True:
+            await asyncio.sleep(self._reconcile_seconds)
+            # ** info: the pass runs on its own task, stopping the ledger cancels this loop but not the pass it is waiting for
+            self._reconciliation = asyncio.ensure_future(self.reconcile())
+            try:
+                await asyncio.shield(self._reconciliation)
+            except Exception:
+                # ** info: the last synced capacities keep being used until a pass succeeds
+                logging.exception("warehouse capacity ledger reconciliation failed")
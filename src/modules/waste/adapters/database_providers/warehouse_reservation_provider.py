@@ -0,0 +1,148 @@
+# !/usr/bin/python3
+# type: ignore
+
+# ** info: python imports
+from dataclasses import fields
+from datetime import timedelta
+from datetime import datetime
+import logging
+
+# ** info: typing imports
+from typing import Self
+from typing import Any
+
+# ** info: sqlmodel imports
+from sqlalchemy import insert
+from sqlalchemy import update
+from sqlmodel import select
+
+# ** info: entities imports
+from src.modules.waste.adapters.database_providers_entities.warehouse_reservation_entity import WarehouseReservationBatchRecord
+from src.modules.waste.adapters.database_providers_entities.warehouse_reservation_entity import WarehouseReservationRecord
+from src.modules.waste.adapters.database_providers_entities.warehouse_reservation_entity import WarehouseReservation
+
+# ** info: sidecards.database_managers imports
+from src.sidecard.system.database_managers.mysql_manager import retry_outside_unit_of_work
+from src.sidecard.system.database_managers.mysql_manager import MySQLManager
+
+# ** info: sidecards.artifacts imports
+from src.sidecard.system.artifacts.datetime_provider import DatetimeProvider
+
+__all__: list[str] = ["WarehouseReservationProvider"]
+
+# ** info: columns selected by the pending reservations read, in the same order as the warehouse reservation record fields
+warehouse_reservation_record_columns: tuple[Any, ...] = tuple(getattr(WarehouseReservation, field.name) for field in fields(WarehouseReservationRecord))
+warehouse_reservation_batch_record_columns: tuple[Any, ...] = tuple(getattr(WarehouseReservation, field.name) for field in fields(WarehouseReservationBatchRecord))
+
+
+class WarehouseReservationProvider:
+    def __init__(self: Self) -> None:
+        self._datetime_provider: DatetimeProvider = DatetimeProvider()
+        self._session_manager: MySQLManager = MySQLManager()
+
+    async def create_warehouse_reservation_table(self: Self) -> None:
+        # ** info: only used by the tables script, the service does not run ddl at startup
+        async with self._session_manager.obtain_session() as session:
+            connection: Any = await session.connection()
+            await connection.run_sync(lambda sync_connection: WarehouseReservation.__table__.create(bind=sync_connection, checkfirst=True))
+            await session.commit()
+
+    async def store_warehouse_reservation(self: Self, uuid: str, warehouse_id: int, source_uuid: str, weight_in_kg: float) -> None:
+        # ** info: no retry on purpose, inside a unit of work the reservation is committed or rolled back with the rows that made it
+        logging.debug(f"storing a reservation of {weight_in_kg} kg on warehouse {warehouse_id}")
+        date_time: datetime = self._datetime_provider.get_current_time()
+        async with self._session_manager.obtain_session() as session:
+            await session.exec(
+                statement=insert(WarehouseReservation).values(
+                    uuid=uuid, warehouse_id=warehouse_id, source_uuid=source_uuid, weight_in_kg=weight_in_kg, batch_uuid=None, applied=False, create=date_time, update=date_time
+                )
+            )
+            await session.commit()
+        logging.debug("reservation stored")
+
+    @retry_outside_unit_of_work(on=Exception, attempts=4, wait_initial=0.08, wait_exp_base=2)
+    async def list_pending_warehouse_reservations(self: Self) -> tuple[WarehouseReservationRecord, ...]:
+        logging.debug("listing pending warehouse reservations")
+        async with self._session_manager.obtain_session() as session:
+            query: Any = select(*warehouse_reservation_record_columns).where(WarehouseReservation.applied == False, WarehouseReservation.batch_uuid == None)  # noqa: E711 E712
+            pending_reservations: tuple[WarehouseReservationRecord, ...] = tuple(WarehouseReservationRecord(*row) for row in (await session.exec(statement=query)).all())
+            logging.debug("listing pending warehouse reservations ended")
+            return pending_reservations
+
+    @retry_outside_unit_of_work(on=Exception, attempts=4, wait_initial=0.08, wait_exp_base=2)
+    async def claim_pending_warehouse_reservations(self: Self, uuids: tuple[str, ...], batch_uuid: str) -> tuple[WarehouseReservationRecord, ...]:
+        # ** info: a short transaction of its own, the rows are claimed by the update so two workers never claim the same reservation
+        # ** info: a retry claims with the same batch uuid, the rows claimed by the failed attempt are read back instead of being lost
+        logging.debug(f"claiming {len(uuids)} pending warehouse reservations for batch {batch_uuid}")
+        async with self._session_manager.obtain_session() as session:
+            update_query: Any = (
+                update(WarehouseReservation)
+                .where(WarehouseReservation.uuid.in_(uuids), WarehouseReservation.applied == False, WarehouseReservation.batch_uuid == None)  # noqa: E711 E712
+                .values(batch_uuid=batch_uuid, update=self._datetime_provider.get_current_time())
+                .execution_options(synchronize_session=False)
+            )
+            await session.exec(statement=update_query)
+            query: Any = select(*warehouse_reservation_record_columns).where(WarehouseReservation.uuid.in_(uuids), WarehouseReservation.batch_uuid == batch_uuid)
+            claimed_reservations: tuple[WarehouseReservationRecord, ...] = tuple(WarehouseReservationRecord(*row) for row in (await session.exec(statement=query)).all())
+            await session.commit()
+        logging.debug("claiming pending warehouse reservations ended")
+        return claimed_reservations
+
+    @retry_outside_unit_of_work(on=Exception, attempts=4, wait_initial=0.08, wait_exp_base=2)
+    async def record_warehouse_reservations_write(self: Self, batch_uuid: str, capacity_before_write: float, capacity_after_write: float) -> None:
+        # ** info: committed before the write to the warehouse ms starts, a batch without these capacities never reached it
+        logging.debug(f"recording the warehouse write of batch {batch_uuid}")
+        async with self._session_manager.obtain_session() as session:
+            update_query: Any = (
+                update(WarehouseReservation)
+                .where(WarehouseReservation.batch_uuid == batch_uuid, WarehouseReservation.applied == False)  # noqa: E712
+                .values(capacity_before_write=capacity_before_write, capacity_after_write=capacity_after_write, update=self._datetime_provider.get_current_time())
+                .execution_options(synchronize_session=False)
+            )
+            await session.exec(statement=update_query)
+            await session.commit()
+        logging.debug("warehouse write recorded")
+
+    @retry_outside_unit_of_work(on=Exception, attempts=4, wait_initial=0.08, wait_exp_base=2)
+    async def list_stuck_warehouse_reservation_batches(self: Self, stuck_for: float) -> tuple[WarehouseReservationBatchRecord, ...]:
+        # ** info: the batches claimed and not applied that were not touched for the stuck seconds, the worker that claimed them is gone or lost their outcome
+        logging.debug("listing stuck warehouse reservation batches")
+        claimed_before: datetime = self._datetime_provider.get_current_time() - timedelta(seconds=stuck_for)
+        async with self._session_manager.obtain_session() as session:
+            query: Any = (
+                select(*warehouse_reservation_batch_record_columns)
+                .where(WarehouseReservation.applied == False, WarehouseReservation.batch_uuid != None, WarehouseReservation.update < claimed_before)  # noqa: E711 E712
+                .distinct()
+            )
+            stuck_batches: tuple[WarehouseReservationBatchRecord, ...] = tuple(WarehouseReservationBatchRecord(*row) for row in (await session.exec(statement=query)).all())
+            logging.debug("listing stuck warehouse reservation batches ended")
+            return stuck_batches
+
+    @retry_outside_unit_of_work(on=Exception, attempts=4, wait_initial=0.08, wait_exp_base=2)
+    async def release_warehouse_reservations(self: Self, batch_uuid: str) -> None:
+        # ** info: only for the batches whose write never reached the warehouse ms, their reservations go back to pending for the next pass
+        logging.debug(f"releasing the warehouse reservations of batch {batch_uuid}")
+        async with self._session_manager.obtain_session() as session:
+            update_query: Any = (
+                update(WarehouseReservation)
+                .where(WarehouseReservation.batch_uuid == batch_uuid, WarehouseReservation.applied == False)  # noqa: E712
+                .values(batch_uuid=None, capacity_before_write=None, capacity_after_write=None, update=self._datetime_provider.get_current_time())
+                .execution_options(synchronize_session=False)
+            )
+            await session.exec(statement=update_query)
+            await session.commit()
+        logging.debug("warehouse reservations released")
+
+    @retry_outside_unit_of_work(on=Exception, attempts=4, wait_initial=0.08, wait_exp_base=2)
+    async def mark_warehouse_reservations_as_applied(self: Self, batch_uuid: str) -> None:
+        logging.debug(f"marking the warehouse reservations of batch {batch_uuid} as applied")
+        async with self._session_manager.obtain_session() as session:
+            update_query: Any = (
+                update(WarehouseReservation)
+                .where(WarehouseReservation.batch_uuid == batch_uuid)
+                .values(applied=True, update=self._datetime_provider.get_current_time())
+                .execution_options(synchronize_session=False)
+            )
+            await session.exec(statement=update_query)
+            await session.commit()
+        logging.debug("warehouse reservations marked as applied")
@@ -2,223 +2,287 @@
 # type: ignore
 
 # ** info: python imports
+from dataclasses import fields
 from datetime import datetime
 import logging
 
 # ** info: typing imports
+from typing import AsyncGenerator
 from typing import Union
 from typing import Self
 from typing import Any
 
 # ** info: sqlmodel imports
-from sqlalchemy import TextClause
-from sqlmodel import Session
+from sqlalchemy import insert
+from sqlalchemy import update
+from sqlalchemy import and_
+from sqlalchemy import or_
 from sqlmodel import select
-from sqlmodel import text
-
-# ** info: stamina imports
-from stamina import retry
 
 # ** info: fastapi imports
 from fastapi import HTTPException
 from fastapi import status
 
 # ** info: users entity
+from src.modules.waste.adapters.database_providers_entities.waste_entity import WasteRecord
 from src.modules.waste.adapters.database_providers_entities.waste_entity import Waste
 
+# ** info: centralized analytics providers imports
+from src.modules.centralized_analytics.adapters.database_providers.monthly_counter_provider import MonthlyCounterProvider
+
 # ** info: sidecards.database_managers imports
+from src.sidecard.system.database_managers.mysql_manager import retry_outside_unit_of_work
 from src.sidecard.system.database_managers.mysql_manager import MySQLManager
 
+# ** info: sidecards.cache_managers imports
+from src.sidecard.system.cache_managers.shared_cache_manager import SharedCacheManager
+from src.sidecard.system.cache_managers.cache_manager import single_flight
+from src.sidecard.system.cache_managers.cache_manager import MeteredCache
+from src.sidecard.system.cache_managers.cache_manager import CacheManager
+
+# ** info: sidecards.helpers imports
+from src.sidecard.system.helpers.cache_key_helper import CacheKey
+
 # ** info: sidecards.artifacts imports
 from src.sidecard.business.constants.waste_states_constants import WasteStates
 from src.sidecard.system.artifacts.datetime_provider import DatetimeProvider
 from src.sidecard.system.artifacts.uuid_provider import UuidProvider
-from src.sidecard.system.artifacts.env_provider import EnvProvider
 
-# ** info: cachetools imports
-from cachetools import TTLCache
-from cachetools import cached
+# ** info: asyncache imports
+from asyncache import cached as async_cached
 
 __all__: list[str] = ["WasteProvider"]
 
-# ** info: creating a shared cache for all the waste provider instances
-waste_provider_cache: TTLCache = TTLCache(ttl=240, maxsize=20)
+# ** info: every cached method of the waste provider gets its own cache, ttl and size come from the cache settings
+_cache_manager: CacheManager = CacheManager()
+search_waste_by_id_cache: MeteredCache = _cache_manager.obtain_cache(name="waste_provider.search_waste_by_id")
+list_wastes_by_process_status_cache: MeteredCache = _cache_manager.obtain_cache(name="waste_provider.list_wastes_by_process_status")
+list_wastes_by_collect_request_id_cache: MeteredCache = _cache_manager.obtain_cache(name="waste_provider.list_wastes_by_collect_request_id")
+
+# ** info: optional tier shared by every worker behind the in process caches
+_shared_cache_manager: SharedCacheManager = SharedCacheManager()
+
+# ** info: cache keys of every cached method, the writes use them to evict only the entries they make stale
+search_waste_by_id_key: CacheKey = CacheKey("search_waste_by_id", "uuid")
+list_wastes_by_process_status_key: CacheKey = CacheKey("list_wastes_by_process_status", "process_status", "limit", "after")
+list_wastes_by_collect_request_id_key: CacheKey = CacheKey("list_wastes_by_collect_request_id", "collect_request_uuid")
+
+# ** info: rows read per session when streaming wastes, the stream keeps going from the last row of every page
+waste_stream_page_size: int = 500
+
+# ** info: columns selected by the list paths and the cached reads, in the same order as the waste record fields
+waste_record_columns: tuple[Any, ...] = tuple(getattr(Waste, field.name) for field in fields(WasteRecord))
 
 
 class WasteProvider:
     def __init__(self: Self) -> None:
-        self._env_provider: EnvProvider = EnvProvider()
         self._uuid_provider: UuidProvider = UuidProvider()
         self._datetime_provider: DatetimeProvider = DatetimeProvider()
-        self._session_manager: MySQLManager = MySQLManager(
-            password=self._env_provider.database_password,
-            database=self._env_provider.database_name,
-            username=self._env_provider.database_user,
-            host=self._env_provider.database_host,
-            port=self._env_provider.database_port,
-            drivername=r"mysql+pymysql",
-            query={"charset": "utf8"},
-        )
+        self._session_manager: MySQLManager = MySQLManager()
+        self._monthly_counter_provider: MonthlyCounterProvider = MonthlyCounterProvider()
+        _shared_cache_manager.subscribe(topic="waste_provider", handler=self._evict_cached_wastes)
 
     def clear_cache(self: Self) -> None:
-        waste_provider_cache.clear()
+        _cache_manager.clear(prefix="waste_provider.")
 
-    @cached(waste_provider_cache)
-    @retry(on=Exception, attempts=4, wait_initial=0.08, wait_exp_base=2)
-    def search_waste_by_id(self: Self, uuid: str) -> Waste:
+    @async_cached(search_waste_by_id_cache, key=search_waste_by_id_key)
+    @single_flight(search_waste_by_id_cache, key=search_waste_by_id_key)
+    @_shared_cache_manager.cached(search_waste_by_id_cache, key=search_waste_by_id_key, group="uuid")
+    @retry_outside_unit_of_work(on=Exception, attempts=4, wait_initial=0.08, wait_exp_base=2)
+    async def search_waste_by_id(self: Self, uuid: str) -> Union[WasteRecord, None]:
         logging.debug(f"searching waste by id {uuid}")
-        session: Session = self._session_manager.obtain_session()
-        query: Any = select(Waste).where(Waste.uuid == uuid)
-        search_waste_by_id_result: Waste = session.exec(statement=query).first()
-        logging.debug("searching waste by id ended")
-        return search_waste_by_id_result
-
-    @cached(waste_provider_cache)
-    @retry(on=Exception, attempts=4, wait_initial=0.08, wait_exp_base=2)
-    def list_wastes_by_process_status(self: Self, process_status: int) -> list[Waste]:
+        async with self._session_manager.obtain_session() as session:
+            query: Any = select(*waste_record_columns).where(Waste.uuid == uuid)
+            row: Any = (await session.exec(statement=query)).first()
+            search_waste_by_id_result: Union[WasteRecord, None] = None if row is None else WasteRecord(*row)
+            logging.debug("searching waste by id ended")
+            return search_waste_by_id_result
+
+    @async_cached(list_wastes_by_process_status_cache, key=list_wastes_by_process_status_key)
+    @single_flight(list_wastes_by_process_status_cache, key=list_wastes_by_process_status_key)
+    @_shared_cache_manager.cached(list_wastes_by_process_status_cache, key=list_wastes_by_process_status_key, group="process_status")
+    @retry_outside_unit_of_work(on=Exception, attempts=4, wait_initial=0.08, wait_exp_base=2)
+    async def list_wastes_by_process_status(self: Self, process_status: int, limit: int, after: Union[tuple[datetime, str], None] = None) -> tuple[WasteRecord, ...]:
         logging.debug(f"searching wastes by process status {process_status}")
-        session: Session = self._session_manager.obtain_session()
-        query: Any = select(Waste).where(Waste.process_status == process_status)
-        search_waste_by_domain_result: list[Waste] = session.exec(statement=query).all()
-        logging.debug("searching wastes by process status ended")
-        return search_waste_by_domain_result
-
-    @cached(waste_provider_cache)
-    @retry(on=Exception, attempts=4, wait_initial=0.08, wait_exp_base=2)
-    def list_wastes_by_collect_request_id(self: Self, collect_request_uuid: str) -> list[Waste]:
+        async with self._session_manager.obtain_session() as session:
+            query: Any = self._build_process_status_query(process_status=process_status, after=after).limit(limit)
+            search_waste_by_domain_result: tuple[WasteRecord, ...] = tuple(WasteRecord(*row) for row in (await session.exec(statement=query)).all())
+            logging.debug("searching wastes by process status ended")
+            return search_waste_by_domain_result
+
+    async def stream_wastes_by_process_status(self: Self, process_status: int, after: Union[tuple[datetime, str], None] = None) -> AsyncGenerator[WasteRecord, None]:
+        logging.debug(f"streaming wastes by process status {process_status}")
+        # ** info: every page is read on its own short session, no connection or limiter slot is held while a slow client downloads the rows
+        while True:
+            wastes_page: tuple[WasteRecord, ...] = await self._read_wastes_page_by_process_status(process_status=process_status, after=after)
+            for waste in wastes_page:
+                yield waste
+            if len(wastes_page) < waste_stream_page_size:
+                break
+            after = (wastes_page[-1].create, wastes_page[-1].uuid)
+        logging.debug("streaming wastes by process status ended")
+
+    @async_cached(list_wastes_by_collect_request_id_cache, key=list_wastes_by_collect_request_id_key)
+    @single_flight(list_wastes_by_collect_request_id_cache, key=list_wastes_by_collect_request_id_key)
+    @_shared_cache_manager.cached(list_wastes_by_collect_request_id_cache, key=list_wastes_by_collect_request_id_key, group="collect_request_uuid")
+    @retry_outside_unit_of_work(on=Exception, attempts=4, wait_initial=0.08, wait_exp_base=2)
+    async def list_wastes_by_collect_request_id(self: Self, collect_request_uuid: str) -> tuple[WasteRecord, ...]:
         logging.debug(f"searching wastes by collect request id {collect_request_uuid}")
-        session: Session = self._session_manager.obtain_session()
-        query: Any = select(Waste).where(Waste.request_uuid == collect_request_uuid)
-        list_wastes_by_collect_request_id: list[Waste] = session.exec(statement=query).all()
-        logging.debug("searching wastes by collect request id ended")
-        return list_wastes_by_collect_request_id
-
-    @retry(on=Exception, attempts=4, wait_initial=0.08, wait_exp_base=2)
-    def create_waste_with_basic_info(
-        self: Self, request_uuid: str, type: int, packaging: int, weight_in_kg: float, volume_in_l: float, description: str, note: Union[str, None] = None
-    ) -> Waste:
-        logging.debug("creating new waste with basic info")
-        session: Session = self._session_manager.obtain_session()
-        uuid: str = self._uuid_provider.get_str_uuid()
+        async with self._session_manager.obtain_session() as session:
+            query: Any = select(*waste_record_columns).where(Waste.request_uuid == collect_request_uuid)
+            list_wastes_by_collect_request_id: tuple[WasteRecord, ...] = tuple(WasteRecord(*row) for row in (await session.exec(statement=query)).all())
+            logging.debug("searching wastes by collect request id ended")
+            return list_wastes_by_collect_request_id
+
+    @retry_outside_unit_of_work(on=Exception, attempts=4, wait_initial=0.08, wait_exp_base=2)
+    async def create_wastes_with_basic_info(self: Self, request_uuid: str, wastes: list[dict[str, Any]]) -> list[Waste]:
+        logging.debug(f"creating {len(wastes)} new wastes with basic info")
         date_time: datetime = self._datetime_provider.get_current_time()
-        new_waste: Waste = Waste(
-            uuid=uuid,
-            request_uuid=request_uuid,
-            type=type,
-            packaging=packaging,
-            process_status=WasteStates.in_review,
-            weight_in_kg=weight_in_kg,
-            volume_in_l=volume_in_l,
-            description=description,
-            note=note,
-            create=date_time,
-            update=date_time,
-        )
-        session.add(new_waste)
-        session.commit()
-        session.refresh(new_waste)
-        self.clear_cache()
-        logging.debug("new waste with basic info created")
-        return new_waste
-
-    @retry(on=Exception, attempts=4, wait_initial=0.08, wait_exp_base=2)
-    def update_waste_internal_classification_info(self: Self, uuid: str, isotopes_number: float, state_waste: int, store: int) -> Waste:
+        new_wastes_rows: list[dict[str, Any]] = [
+            {
+                "uuid": self._uuid_provider.get_str_uuid(),
+                "request_uuid": request_uuid,
+                "type": waste["type"],
+                "packaging": waste["packaging"],
+                "process_status": WasteStates.in_review,
+                "weight_in_kg": waste["weight_in_kg"],
+                "volume_in_l": waste["volume_in_l"],
+                "description": waste["description"],
+                "note": waste.get("note"),
+                "create": date_time,
+                "update": date_time,
+            }
+            for waste in wastes
+        ]
+        async with self._session_manager.obtain_session() as session:
+            # ** info: a single multi row insert, the rows are built here so there is no need to refresh them afterwards
+            await session.exec(statement=insert(Waste).values(new_wastes_rows))
+            await self._monthly_counter_provider.increment_monthly_counters(session=session, create=date_time, wastes=len(new_wastes_rows))
+            await session.commit()
+        new_wastes: list[Waste] = [Waste(**new_waste_row) for new_waste_row in new_wastes_rows]
+        await self._invalidate_cached_wastes(wastes=new_wastes)
+        logging.debug(f"{len(new_wastes)} new wastes with basic info created")
+        return new_wastes
+
+    @retry_outside_unit_of_work(on=Exception, attempts=4, wait_initial=0.08, wait_exp_base=2)
+    async def update_waste_internal_classification_info(self: Self, uuid: str, isotopes_number: float, state_waste: int, store: int) -> Waste:
         logging.debug(f"updating waste {uuid} internal classification info")
-        session: Session = self._session_manager.obtain_session()
-        query: Any = select(Waste).where(Waste.uuid == uuid)
-        waste_data: Waste = session.exec(statement=query).first()
-        if waste_data is None:
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="waste not found")
-        waste_data.update = self._datetime_provider.get_current_time()
-        waste_data.process_status = WasteStates.waste_treatement_in_course
-        waste_data.isotopes_number = isotopes_number
-        waste_data.state_waste = state_waste
-        waste_data.store = store
-        session.add(waste_data)
-        session.commit()
-        session.refresh(waste_data)
-        self.clear_cache()
-        logging.debug(f"waste {uuid} internal classification info updated")
-        return waste_data
-
-    @retry(on=Exception, attempts=4, wait_initial=0.08, wait_exp_base=2)
-    def update_waste_store(self: Self, uuid: str, store: int, note: str) -> Waste:
+        async with self._session_manager.obtain_session() as session:
+            query: Any = select(Waste).where(Waste.uuid == uuid)
+            waste_data: Waste = (await session.exec(statement=query)).first()
+            if waste_data is None:
+                raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="waste not found")
+            previous_process_status: int = waste_data.process_status
+            waste_data.update = self._datetime_provider.get_current_time()
+            waste_data.process_status = WasteStates.waste_treatement_in_course
+            waste_data.isotopes_number = isotopes_number
+            waste_data.state_waste = state_waste
+            waste_data.store = store
+            session.add(waste_data)
+            await session.commit()
+            await session.refresh(waste_data)
+            await self._invalidate_cached_wastes(wastes=[waste_data], previous_process_statuses={previous_process_status})
+            logging.debug(f"waste {uuid} internal classification info updated")
+            return waste_data
+
+    @retry_outside_unit_of_work(on=Exception, attempts=4, wait_initial=0.08, wait_exp_base=2)
+    async def update_waste_store(self: Self, uuid: str, store: int, note: str) -> Waste:
         logging.debug(f"updating waste {uuid} store")
-        session: Session = self._session_manager.obtain_session()
-        query: Any = select(Waste).where(Waste.uuid == uuid)
-        waste_data: Waste = session.exec(statement=query).first()
-        if waste_data is None:
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="waste not found")
-        waste_data.update = self._datetime_provider.get_current_time()
-        waste_data.store = store
-        waste_data.note = note
-        waste_data.process_status = WasteStates.permanent_storage
-        session.add(waste_data)
-        session.commit()
-        session.refresh(waste_data)
-        self.clear_cache()
-        logging.debug(f"waste {uuid} store updated")
-        return waste_data
-
-    @retry(on=Exception, attempts=4, wait_initial=0.08, wait_exp_base=2)
-    def update_waste_status_by_request_id(self: Self, request_uuid: str, process_status: int) -> list[Waste]:
+        async with self._session_manager.obtain_session() as session:
+            query: Any = select(Waste).where(Waste.uuid == uuid)
+            waste_data: Waste = (await session.exec(statement=query)).first()
+            if waste_data is None:
+                raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="waste not found")
+            previous_process_status: int = waste_data.process_status
+            waste_data.update = self._datetime_provider.get_current_time()
+            waste_data.store = store
+            waste_data.note = note
+            waste_data.process_status = WasteStates.permanent_storage
+            session.add(waste_data)
+            await session.commit()
+            await session.refresh(waste_data)
+            await self._invalidate_cached_wastes(wastes=[waste_data], previous_process_statuses={previous_process_status})
+            logging.debug(f"waste {uuid} store updated")
+            return waste_data
+
+    @retry_outside_unit_of_work(on=Exception, attempts=4, wait_initial=0.08, wait_exp_base=2)
+    async def update_waste_status_by_request_id(self: Self, request_uuid: str, process_status: int) -> list[Waste]:
         logging.debug(f"updating waste {request_uuid} status")
-        return_wastes: list[Waste] = []
-        session: Session = self._session_manager.obtain_session()
-        query: Any = select(Waste).where(Waste.request_uuid == request_uuid)
-        wastes: list[Waste] = session.exec(statement=query).all()
-        if wastes is None:
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="wastes not found")
-        for waste in wastes:
-            waste.update = self._datetime_provider.get_current_time()
-            waste.process_status = process_status
-            session.add(waste)
-        session.commit()
-        for waste in wastes:
-            session.refresh(waste)
-            return_wastes.append(waste)
-        self.clear_cache()
+        values: dict[str, Any] = {"update": self._datetime_provider.get_current_time(), "process_status": process_status}
+        return_wastes: list[Waste] = await self._update_wastes_by_request_id(request_uuid=request_uuid, values=values)
         logging.debug(f"waste {request_uuid} status updated")
         return return_wastes
 
-    @retry(on=Exception, attempts=4, wait_initial=0.08, wait_exp_base=2)
-    def update_waste_status_and_store_id_by_request_id(self: Self, request_uuid: str, process_status: int, store_id: int) -> list[Waste]:
+    @retry_outside_unit_of_work(on=Exception, attempts=4, wait_initial=0.08, wait_exp_base=2)
+    async def update_waste_status_and_store_id_by_request_id(self: Self, request_uuid: str, process_status: int, store_id: int) -> list[Waste]:
         logging.debug(f"updating waste {request_uuid} status")
-        return_wastes: list[Waste] = []
-        session: Session = self._session_manager.obtain_session()
-        query: Any = select(Waste).where(Waste.request_uuid == request_uuid)
-        wastes: list[Waste] = session.exec(statement=query).all()
-        if wastes is None:
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="wastes not found")
-        for waste in wastes:
-            waste.update = self._datetime_provider.get_current_time()
-            waste.process_status = process_status
-            waste.store = store_id
-            session.add(waste)
-        session.commit()
-        for waste in wastes:
-            session.refresh(waste)
-            return_wastes.append(waste)
-        self.clear_cache()
+        values: dict[str, Any] = {"update": self._datetime_provider.get_current_time(), "process_status": process_status, "store": store_id}
+        return_wastes: list[Waste] = await self._update_wastes_by_request_id(request_uuid=request_uuid, values=values)
         logging.debug(f"waste {request_uuid} status updated")
         return return_wastes
 
-    @cached(waste_provider_cache)
-    @retry(on=Exception, attempts=4, wait_initial=0.08, wait_exp_base=2)
-    def search_wastes_by_ids(self: Self, uuids: tuple[str, ...]) -> list[Waste]:
-        logging.debug(f"searching wastes by ids {", ".join(uuids)}")
-        session: Session = self._session_manager.obtain_session()
-        query: Any = select(Waste).where(Waste.uuid.in_(uuids))
-        search_waste_by_id_result: list[Waste] = session.exec(statement=query).all()
-        logging.debug("searching wastes by ids ended")
-        return search_waste_by_id_result
-
-    @cached(waste_provider_cache)
-    @retry(on=Exception, attempts=4, wait_initial=0.08, wait_exp_base=2)
-    def waste_quantity_by_year(self: Self, year: int) -> Any:
-        logging.debug(f"searching wastes quantity by year {year}")
-        session: Session = self._session_manager.obtain_session()
-        query: TextClause = text("select month(`create`) as month, count(*) as quantity from `waste` where year(`create`) = :year group by month(`create`);").bindparams(year=year)
-        collect_req_quantity_by_year: Any = session.exec(statement=query)
-        logging.debug("searching wastes quantity by year ended")
-        return collect_req_quantity_by_year.mappings().all()
+    async def _update_wastes_by_request_id(self: Self, request_uuid: str, values: dict[str, Any]) -> list[Waste]:
+        # ** info: one set based update plus one select, mysql has no returning clause so the updated rows are read back in a single query
+        async with self._session_manager.obtain_session() as session:
+            # ** info: the shared pages of the statuses the wastes are leaving can not be scanned, so those statuses are read before the update
+            previous_process_statuses: set[int] = set()
+            if _shared_cache_manager.enabled is True:
+                previous_query: Any = select(Waste.process_status).where(Waste.request_uuid == request_uuid).distinct()
+                previous_process_statuses = set((await session.exec(statement=previous_query)).all())
+            update_query: Any = update(Waste).where(Waste.request_uuid == request_uuid).values(**values).execution_options(synchronize_session=False)
+            await session.exec(statement=update_query)
+            query: Any = select(Waste).where(Waste.request_uuid == request_uuid)
+            updated_wastes: list[Waste] = (await session.exec(statement=query)).all()
+            await session.commit()
+        await self._invalidate_cached_wastes(wastes=updated_wastes, previous_process_statuses=previous_process_statuses)
+        return updated_wastes
+
+    async def _invalidate_cached_wastes(self: Self, wastes: list[Waste], previous_process_statuses: set[int] = frozenset()) -> None:
+        invalidation: dict[str, list[Any]] = {
+            "uuids": sorted({waste.uuid for waste in wastes}),
+            "request_uuids": sorted({waste.request_uuid for waste in wastes}),
+            "process_statuses": sorted({waste.process_status for waste in wastes}),
+        }
+        # ** info: the shared groups are dropped before the local entries, so this worker can not refill its cache from a stale shared value
+        groups: list[tuple[MeteredCache, Any]] = [
+            *((search_waste_by_id_cache, uuid) for uuid in invalidation["uuids"]),
+            *((list_wastes_by_collect_request_id_cache, request_uuid) for request_uuid in invalidation["request_uuids"]),
+            *((list_wastes_by_process_status_cache, process_status) for process_status in set(invalidation["process_statuses"]) | previous_process_statuses),
+        ]
+
+        # ** info: inside a unit of work the invalidation waits for the commit, before it the rows could still roll back
+        async def invalidate() -> None:
+            await _shared_cache_manager.invalidate(topic="waste_provider", payload=invalidation, groups=groups)
+            self._evict_cached_wastes(invalidation=invalidation)
+
+        await self._session_manager.run_after_commit(callback=invalidate)
+
+    def _evict_cached_wastes(self: Self, invalidation: dict[str, list[Any]]) -> None:
+        # ** info: runs on the writer and on every other worker receiving the invalidation, it only touches the in process caches
+        uuids: set[str] = set(invalidation["uuids"])
+        process_statuses: set[int] = set(invalidation["process_statuses"])
+        for uuid in uuids:
+            search_waste_by_id_key.evict(cache=search_waste_by_id_cache, uuid=uuid)
+        for request_uuid in invalidation["request_uuids"]:
+            list_wastes_by_collect_request_id_key.evict(cache=list_wastes_by_collect_request_id_cache, collect_request_uuid=request_uuid)
+        # ** info: the pages holding one of the wastes are stale for its previous status, any page of its new status could now include it
+        list_wastes_by_process_status_key.evict_where(
+            cache=list_wastes_by_process_status_cache,
+            predicate=lambda arguments, records: arguments["process_status"] in process_statuses or any(record.uuid in uuids for record in records),
+        )
+
+    @retry_outside_unit_of_work(on=Exception, attempts=4, wait_initial=0.08, wait_exp_base=2)
+    async def _read_wastes_page_by_process_status(self: Self, process_status: int, after: Union[tuple[datetime, str], None]) -> tuple[WasteRecord, ...]:
+        # ** info: the stream pages are not cached, they would push the regular pages out of the caches
+        async with self._session_manager.obtain_session() as session:
+            query: Any = self._build_process_status_query(process_status=process_status, after=after).limit(waste_stream_page_size)
+            return tuple(WasteRecord(*row) for row in (await session.exec(statement=query)).all())
+
+    def _build_process_status_query(self: Self, process_status: int, after: Union[tuple[datetime, str], None]) -> Any:
+        # ** info: only the record columns are selected, the rows are plain tuples so no orm instance is built or tracked
+        query: Any = select(*waste_record_columns).where(Waste.process_status == process_status)
+        # ** info: keyset pagination over (create, uuid), the results start right after the given row
+        if after is not None:
+            after_create, after_uuid = after
+            query = query.where(or_(Waste.create > after_create, and_(Waste.create == after_create, Waste.uuid > after_uuid)))
+        return query.order_by(Waste.create, Waste.uuid)
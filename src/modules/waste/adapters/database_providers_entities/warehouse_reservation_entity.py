@@ -0,0 +1,61 @@
+# !/usr/bin/python3
+# type: ignore
+
+# ** info: python imports
+from dataclasses import dataclass
+from datetime import datetime
+from decimal import Decimal
+
+# ** info: typing imports
+from typing import Optional
+
+# ** info: sqlalchemy imports
+from sqlalchemy import Index
+
+# ** info: sqlmodel imports
+from sqlmodel import SQLModel
+from sqlmodel import Field
+
+__all__: list[str] = ["WarehouseReservation", "WarehouseReservationRecord", "WarehouseReservationBatchRecord"]
+
+
+class WarehouseReservation(SQLModel, table=True):
+    # ** info: kg taken from a warehouse capacity that are not yet written to the warehouse ms, the reconciliation reads the pending ones through the first index
+    # ** info: a reservation is pending without batch, claimed while its batch is written to the warehouse ms and applied once the write is confirmed
+    # ** info: the batch writes go through the second one, an update without it would lock every reservation it scans
+    __table_args__ = (
+        Index("warehouse_reservation_applied_warehouse_id_idx", "applied", "warehouse_id"),
+        Index("warehouse_reservation_batch_uuid_idx", "batch_uuid"),
+        {"extend_existing": True},
+    )
+    __tablename__ = "warehouse_reservation"
+
+    uuid: str = Field(max_length=36, primary_key=True)
+    warehouse_id: int = Field(nullable=False)
+    # ** info: the collect request finished or the waste classified that took the kg
+    source_uuid: str = Field(max_length=36, nullable=False)
+    weight_in_kg: Decimal = Field(max_digits=10, decimal_places=2, nullable=False)
+    batch_uuid: Optional[str] = Field(default=None, max_length=36, nullable=True)
+    # ** info: the capacity read and the one written back by the batch, stored right before the write so a stuck batch can be checked against the warehouse ms
+    capacity_before_write: Decimal = Field(default=None, max_digits=12, decimal_places=2, nullable=True)
+    capacity_after_write: Decimal = Field(default=None, max_digits=12, decimal_places=2, nullable=True)
+    applied: bool = Field(default=False, nullable=False)
+    create: datetime = Field(nullable=False)
+    update: datetime = Field(nullable=False)
+
+
+# ** info: detached read model of the pending reservations
+@dataclass(frozen=True, slots=True)
+class WarehouseReservationRecord:
+    uuid: str
+    warehouse_id: int
+    weight_in_kg: Decimal
+
+
+# ** info: detached read model of the batches left claimed, the capacities are none when the batch never started its write
+@dataclass(frozen=True, slots=True)
+class WarehouseReservationBatchRecord:
+    batch_uuid: str
+    warehouse_id: int
+    capacity_before_write: Optional[Decimal]
+    capacity_after_write: Optional[Decimal]
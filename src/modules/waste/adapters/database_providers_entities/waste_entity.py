@@ -2,19 +2,24 @@
 # type: ignore
 
 # ** info: python imports
+from dataclasses import dataclass
 from datetime import datetime
 from decimal import Decimal
 
 # ** info: typing imports
 from typing import Optional
 
+# ** info: sqlalchemy imports
+from sqlalchemy import Index
+
 # ** info: sqlmodel imports
 from sqlmodel import SQLModel
 from sqlmodel import Field
 
 
 class Waste(SQLModel, table=True):
-    __table_args__ = {"extend_existing": True}
+    # ** info: the by status listings are keyset paginated over (create, uuid), this index keeps every page a range scan
+    __table_args__ = (Index("waste_process_status_create_uuid_idx", "process_status", "create", "uuid"), {"extend_existing": True})
     __tablename__ = "waste"
 
     uuid: str = Field(max_length=36, primary_key=True)
@@ -31,3 +36,22 @@ class Waste(SQLModel, table=True):
     note: Optional[str] = Field(max_length=65535, nullable=False)
     create: datetime = Field(nullable=False)
     update: datetime = Field(nullable=False)
+
+
+# ** info: detached read model of the list paths and of every cached read, filled straight from the selected columns without identity map tracking
+@dataclass(frozen=True, slots=True)
+class WasteRecord:
+    uuid: str
+    request_uuid: str
+    type: int
+    packaging: int
+    process_status: int
+    weight_in_kg: Decimal
+    volume_in_l: Decimal
+    isotopes_number: Optional[Decimal]
+    state_waste: Optional[int]
+    store: Optional[int]
+    description: str
+    note: Optional[str]
+    create: datetime
+    update: datetime
@@ -3,14 +3,20 @@
 
 # ** info: python imports
 from urllib.parse import urljoin
+from time import monotonic
 import logging
 
+# ** info: asyncio imports
+from asyncio import Semaphore
+from asyncio import gather
+
 # ** info: typing imports
+from typing import Union
 from typing import Self
+from typing import Any
 
 # ** info: httpx imports
 from httpx import Response
-import httpx
 
 # ** info: stamina imports
 from stamina import retry
@@ -19,40 +25,153 @@ from stamina import retry
 from fastapi import HTTPException
 from fastapi import status
 
+# ** info: sidecards.cache_managers imports
+from src.sidecard.system.cache_managers.cache_manager import single_flight
+from src.sidecard.system.cache_managers.cache_manager import MeteredCache
+from src.sidecard.system.cache_managers.cache_manager import CacheManager
+
+# ** info: sidecards.http_managers imports
+from src.sidecard.system.http_managers.httpx_client_manager import HttpxClientManager
+
+# ** info: sidecards.helpers imports
+from src.sidecard.system.helpers.circuit_breaker_helper import CircuitBreaker
+from src.sidecard.system.helpers.micro_batcher_helper import MicroBatcher
+from src.sidecard.system.helpers.cache_key_helper import CacheKey
+
 # ** info: sidecards.artifacts imports
 from src.sidecard.system.artifacts.env_provider import EnvProvider
 
-# ** info: cachetools imports
-from cachetools import TTLCache
-
 # ** info: asyncache imports
 from asyncache import cached as async_cached
 
 __all__: list[str] = ["BrmsService"]
 
-# ** info: creating a shared cache for all the brms service instances
-brms_service_cache: TTLCache = TTLCache(ttl=60, maxsize=20)
+# ** info: every cached method of the brms service gets its own cache shared by all the instances, ttl and size come from the cache settings
+_cache_manager: CacheManager = CacheManager()
+obtain_waste_clasification_cache: MeteredCache = _cache_manager.obtain_cache(name="brms_service.obtain_waste_clasification", ttl=60)
+
+# ** info: cache keys of every cached method
+obtain_waste_clasification_key: CacheKey = CacheKey("obtain_waste_clasification", "state_waste", "weight_in_kg", "isotopes_number")
+
+# ** info: the cache misses of every brms service instance that happen in the same short window are sent to the brms as a single batch
+_env_provider: EnvProvider = EnvProvider()
+obtain_waste_clasification_batcher: MicroBatcher = MicroBatcher(
+    name="brms_service.obtain_waste_clasification", window=_env_provider.sar_brms_batch_window_seconds, max_size=_env_provider.sar_brms_batch_max_size
+)
+
+# ** info: circuit breaker shared by every call to the brms, while it is open the calls fail fast instead of waiting on a down upstream
+brms_breaker: CircuitBreaker = HttpxClientManager().obtain_breaker(name="brms")
+
+# ** info: status codes meaning the brms has no batch classification route
+brms_missing_route_status_codes: frozenset[int] = frozenset({status.HTTP_404_NOT_FOUND, status.HTTP_405_METHOD_NOT_ALLOWED, status.HTTP_501_NOT_IMPLEMENTED})
 
 
 class BrmsService:
+    # ** info: when the brms answers that it has no batch route the batches are fanned out as single calls, the route is probed again after a cooldown
+    _batch_route_missing_since: Union[float, None] = None
+
     def __init__(self: Self):
         self._env_provider: EnvProvider = EnvProvider()
         self.base_url: str = str(self._env_provider.sar_brms_base_url)
-        self._httpx_client: httpx.AsyncClient = httpx.AsyncClient()
+        self._httpx_client_manager: HttpxClientManager = HttpxClientManager()
 
     def clear_cache(self: Self) -> None:
-        brms_service_cache.clear()
+        _cache_manager.clear(prefix="brms_service.")
 
-    @async_cached(brms_service_cache)
-    @retry(on=HTTPException, attempts=4, wait_initial=0.4, wait_exp_base=2)
+    @async_cached(obtain_waste_clasification_cache, key=obtain_waste_clasification_key)
+    @single_flight(obtain_waste_clasification_cache, key=obtain_waste_clasification_key)
     async def obtain_waste_clasification(self: Self, state_waste: str, weight_in_kg: float, isotopes_number: float) -> int:
         logging.debug("obtaining waste classification from brms")
-        data: dict[str, any] = {"stateWaste": state_waste, "weightInKg": weight_in_kg, "isotopesNumber": isotopes_number}
+        response: int = await obtain_waste_clasification_batcher.submit(item=(state_waste, weight_in_kg, isotopes_number), handler=self._obtain_clasifications_from_brms)
+        if response == 0:
+            logging.error("the waste was not classified by the brms")
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="waste not classifiable")
+        logging.debug("waste classification obtained from brms")
+        return response
+
+    async def obtain_waste_clasifications(self: Self, wastes: list[tuple[str, float, float]]) -> list[Union[int, None]]:
+        # ** info: every waste goes through the cached single path, so the repeated ones are answered from the cache and the misses share upstream batches
+        logging.debug(f"obtaining {len(wastes)} waste classifications from brms")
+        clasifications: list[Union[int, None]] = list(
+            await gather(
+                *(
+                    self._obtain_waste_clasification_or_none(state_waste=state_waste, weight_in_kg=weight_in_kg, isotopes_number=isotopes_number)
+                    for state_waste, weight_in_kg, isotopes_number in wastes
+                )
+            )
+        )
+        logging.debug(f"{len(clasifications)} waste classifications obtained from brms")
+        return clasifications
+
+    async def _obtain_waste_clasification_or_none(self: Self, state_waste: str, weight_in_kg: float, isotopes_number: float) -> Union[int, None]:
+        try:
+            return await self.obtain_waste_clasification(state_waste=state_waste, weight_in_kg=weight_in_kg, isotopes_number=isotopes_number)
+        except HTTPException as error:
+            if error.status_code != status.HTTP_404_NOT_FOUND:
+                raise
+            return None
+
+    async def _obtain_clasifications_from_brms(self: Self, wastes: list[tuple[str, float, float]]) -> list[Union[int, BaseException]]:
+        if self._is_batch_route_worth_trying() is True:
+            clasifications: Union[list[int], None] = await self._post_clasification_batch(wastes=wastes)
+            if clasifications is not None:
+                BrmsService._batch_route_missing_since = None
+                return clasifications
+            logging.warning("the brms has no batch classification route, the batches are going to be sent as parallel single calls")
+            BrmsService._batch_route_missing_since = monotonic()
+        # ** info: without a batch route the batch is fanned out, the semaphore bounds the calls in flight so a big batch does not take the whole pool
+        semaphore: Semaphore = Semaphore(self._env_provider.sar_brms_max_parallel_calls)
+
+        async def post_bounded_clasification(waste: tuple[str, float, float]) -> int:
+            async with semaphore:
+                return await self._post_clasification(state_waste=waste[0], weight_in_kg=waste[1], isotopes_number=waste[2])
+
+        # ** info: every waste keeps its own result or error, a failed single call only fails the callers waiting for that waste
+        return list(await gather(*(post_bounded_clasification(waste=waste) for waste in wastes), return_exceptions=True))
+
+    def _is_batch_route_worth_trying(self: Self) -> bool:
+        missing_since: Union[float, None] = BrmsService._batch_route_missing_since
+        return missing_since is None or monotonic() - missing_since >= self._env_provider.sar_brms_batch_route_retry_seconds
+
+    @brms_breaker.fail_fast
+    @retry(on=HTTPException, attempts=4, wait_initial=0.4, wait_exp_base=2)
+    @brms_breaker.guard
+    async def _post_clasification_batch(self: Self, wastes: list[tuple[str, float, float]]) -> Union[list[int], None]:
+        logging.debug(f"posting a batch of {len(wastes)} wastes to the brms")
+        data: list[dict[str, Any]] = [
+            {"stateWaste": state_waste, "weightInKg": weight_in_kg, "isotopesNumber": isotopes_number} for state_waste, weight_in_kg, isotopes_number in wastes
+        ]
+        url: str = urljoin(self.base_url, r"/brms/waste/clasification/batch")
+        response: list[int]
+        logging.debug(f"brms url: {url}")
+        try:
+            raw_response: Response = await self._httpx_client_manager.obtain_client(name="brms").post(url=url, json=data, timeout=10)
+        except Exception:
+            logging.error("error unable to connect to brms")
+            raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE)
+        if raw_response.status_code in brms_missing_route_status_codes:
+            return None
+        if raw_response.status_code != status.HTTP_200_OK:
+            logging.error("the brms service didnt respond correctly")
+            raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE)
+        try:
+            response = [int(clasification) for clasification in raw_response.json()]
+        except Exception:
+            logging.error("error parsing response from brms")
+            raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR)
+        logging.debug("batch posted to the brms")
+        return response
+
+    @brms_breaker.fail_fast
+    @retry(on=HTTPException, attempts=4, wait_initial=0.4, wait_exp_base=2)
+    @brms_breaker.guard
+    async def _post_clasification(self: Self, state_waste: str, weight_in_kg: float, isotopes_number: float) -> int:
+        data: dict[str, Any] = {"stateWaste": state_waste, "weightInKg": weight_in_kg, "isotopesNumber": isotopes_number}
         url: str = urljoin(self.base_url, r"/brms/waste/clasification")
         response: int
         logging.debug(f"brms url: {url}")
         try:
-            raw_response: Response = await self._httpx_client.post(url=url, json=data, timeout=10)
+            raw_response: Response = await self._httpx_client_manager.obtain_client(name="brms").post(url=url, json=data, timeout=10)
         except Exception:
             logging.error("error unable to connect to brms")
             raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE)
@@ -64,8 +183,4 @@ class BrmsService:
         except Exception:
             logging.error("error parsing response from brms")
             raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR)
-        if response == 0:
-            logging.error("the waste was not classified by the brms")
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="waste not classifiable")
-        logging.debug("waste classification obtained from brms")
         return response
@@ -2,15 +2,19 @@
 # type: ignore
 
 # ** info: python imports
+from collections import defaultdict
 from urllib.parse import urljoin
 import logging
+import asyncio
 
 # ** info: typing imports
+from typing import Awaitable
+from typing import Callable
+from typing import Union
 from typing import Self
 
 # ** info: httpx imports
 from httpx import Response
-import httpx
 
 # ** info: stamina imports
 from stamina import retry
@@ -23,39 +27,40 @@ from fastapi import status
 from src.modules.waste.adapters.rest_services_dtos.warehouse_ms_dtos import WarehouseFullDataResponseDto
 from src.modules.waste.adapters.rest_services_dtos.warehouse_ms_dtos import WarehouseFullDataRequestDto
 
-# ** info: sidecards.artifacts imports
-from src.sidecard.system.artifacts.env_provider import EnvProvider
+# ** info: sidecards.http_managers imports
+from src.sidecard.system.http_managers.httpx_client_manager import HttpxClientManager
 
-# ** info: cachetools imports
-from cachetools import TTLCache
+# ** info: sidecards.helpers imports
+from src.sidecard.system.helpers.circuit_breaker_helper import CircuitBreaker
 
-# ** info: asyncache imports
-from asyncache import cached as async_cached
+# ** info: sidecards.artifacts imports
+from src.sidecard.system.artifacts.env_provider import EnvProvider
 
 __all__: list[str] = ["WarehouseMsService"]
 
-# ** info: creating a shared cache for all the warehouse ms service instances
-warehouse_ms_service_cache: TTLCache = TTLCache(ttl=10, maxsize=20)
+# ** info: circuit breaker shared by every call to the warehouse ms, while it is open the calls fail fast instead of waiting on a down upstream
+warehouse_ms_breaker: CircuitBreaker = HttpxClientManager().obtain_breaker(name="warehouse_ms")
+
+# ** info: one lock per warehouse, the capacity adjustments of the same warehouse in this process run one after the other, other processes do not see it
+warehouse_capacity_locks: defaultdict[int, asyncio.Lock] = defaultdict(asyncio.Lock)
 
 
 class WarehouseMsService:
     def __init__(self: Self):
         self._env_provider: EnvProvider = EnvProvider()
         self.base_url: str = str(self._env_provider.sar_warehouse_ms_base_url)
-        self._httpx_client: httpx.AsyncClient = httpx.AsyncClient()
-
-    def clear_cache(self: Self) -> None:
-        warehouse_ms_service_cache.clear()
+        self._httpx_client_manager: HttpxClientManager = HttpxClientManager()
 
-    @async_cached(warehouse_ms_service_cache)
+    @warehouse_ms_breaker.fail_fast
     @retry(on=HTTPException, attempts=8, wait_initial=0.4, wait_exp_base=2)
+    @warehouse_ms_breaker.guard
     async def obtain_warehouse_full_data(self: Self, warehouse_id: int) -> WarehouseFullDataResponseDto:
         logging.debug("obtaining warehouse full data from warehouse ms")
         url: str = urljoin(self.base_url, f"/store/{warehouse_id}")
         warehouse_full_data: WarehouseFullDataResponseDto
         logging.debug(f"warehouse ms url: {url}")
         try:
-            raw_response: Response = await self._httpx_client.get(url=url, timeout=10)
+            raw_response: Response = await self._httpx_client_manager.obtain_client(name="warehouse_ms").get(url=url, timeout=10)
         except Exception:
             logging.error("error unable to connect to warehouse ms")
             raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE)
@@ -70,7 +75,9 @@ class WarehouseMsService:
         logging.debug("warehouse full data obtained from warehouse ms")
         return warehouse_full_data
 
+    @warehouse_ms_breaker.fail_fast
     @retry(on=HTTPException, attempts=8, wait_initial=0.4, wait_exp_base=2)
+    @warehouse_ms_breaker.guard
     async def update_warehouse_full_data(self: Self, warehouse_id: int, warehouse_current_full_data: WarehouseFullDataResponseDto) -> WarehouseFullDataResponseDto:
         logging.debug("updating warehouse full data on warehouse ms")
         url: str = urljoin(self.base_url, f"/store/{warehouse_id}")
@@ -83,7 +90,7 @@ class WarehouseMsService:
             logging.error("error parsing request for warehouse ms")
             raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR)
         try:
-            raw_response: Response = await self._httpx_client.put(url=url, json=raw_data, timeout=10)
+            raw_response: Response = await self._httpx_client_manager.obtain_client(name="warehouse_ms").put(url=url, json=raw_data, timeout=10)
         except Exception:
             logging.error("error unable to connect to warehouse ms")
             raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE)
@@ -95,7 +102,6 @@ class WarehouseMsService:
         except Exception:
             logging.error("error parsing response from warehouse ms")
             raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR)
-        self.clear_cache()
         logging.debug("warehouse full data updated on warehouse ms")
         return warehouse_full_data
 
@@ -105,12 +111,28 @@ class WarehouseMsService:
         logging.debug("warehouse current capacity obtained from warehouse ms")
         return warehouse_full_data.capacity
 
-    async def update_warehouse_current_capacity(self: Self, warehouse_id: int, new_warehouse_capacity: float) -> float:
-        logging.debug("updating warehouse current capacity on warehouse ms")
-        warehouse_full_data: WarehouseFullDataResponseDto = await self.obtain_warehouse_full_data(warehouse_id=warehouse_id)
-        warehouse_full_data.capacity = new_warehouse_capacity
-        update_warehouse_data: WarehouseFullDataResponseDto = await self.update_warehouse_full_data(warehouse_id=warehouse_id, warehouse_current_full_data=warehouse_full_data)
-        logging.debug("warehouse current capacity updated on warehouse ms")
+    async def adjust_warehouse_capacity(
+        self: Self, warehouse_id: int, delta: float, enforce_capacity: bool = True, before_write: Union[Callable[[float, float], Awaitable[None]], None] = None
+    ) -> float:
+        # ** info: this is not a compare and set, it is a read modify write serialized by the warehouse lock and it is only safe within one process
+        # ** info: the warehouse ms only takes whole documents and has no compare and set or delta api, so a write from another process or instance
+        # ** info: landing between the read and the write back is lost, closing that gap needs one of those apis on the warehouse ms side
+        logging.debug("adjusting warehouse current capacity on warehouse ms")
+        async with warehouse_capacity_locks[warehouse_id]:
+            warehouse_full_data: WarehouseFullDataResponseDto = await self.obtain_warehouse_full_data(warehouse_id=warehouse_id)
+            # ** info: the reservations already granted by the capacity ledger are written back without the check, refusing them would not release the wastes
+            if enforce_capacity is True and warehouse_full_data.capacity + delta < 0:
+                logging.error(f"warehouse capacity {warehouse_full_data.capacity} is less than waste weight {-delta}")
+                raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"warehouse capacity {warehouse_full_data.capacity} is less than waste weight {-delta}")
+            if warehouse_full_data.capacity + delta < 0:
+                logging.error(f"warehouse {warehouse_id} capacity {warehouse_full_data.capacity} overbooked by {-(warehouse_full_data.capacity + delta)} kg")
+            capacity_before_write: float = warehouse_full_data.capacity
+            warehouse_full_data.capacity = warehouse_full_data.capacity + delta
+            # ** info: lets the caller tell a failure before the write, that changed nothing, from a failed write that may have reached the warehouse ms
+            if before_write is not None:
+                await before_write(capacity_before_write, warehouse_full_data.capacity)
+            update_warehouse_data: WarehouseFullDataResponseDto = await self.update_warehouse_full_data(warehouse_id=warehouse_id, warehouse_current_full_data=warehouse_full_data)
+        logging.debug("warehouse current capacity adjusted on warehouse ms")
         return update_warehouse_data.capacity
 
     async def _map_warehouse_ms_dict_to_full_data_dto(self: Self, warehouse_full_data_dict: dict[str, any]) -> WarehouseFullDataResponseDto:
@@ -5,23 +5,27 @@ import logging
 
 # ** info: asyncio imports
 from functools import reduce
-from asyncio import gather
 
 # ** info: typing imports
+from typing import AsyncGenerator
+from typing import FrozenSet
 from typing import Union
 from typing import List
 from typing import Self
 from typing import Any
-from typing import Set
 
 # ** info: fastapi imports
 from fastapi import HTTPException
+from fastapi import Response
 from fastapi import status
 
 # ** info: cores imports
 from src.modules.parameter.cores.business.parameter_core import ParameterCore  # type: ignore
 
 # ** info: dtos imports
+from src.modules.waste.ports.rest_routers_dtos.waste_dtos import WasteClasificationBatchItemResponseDto  # type: ignore
+from src.modules.waste.ports.rest_routers_dtos.waste_dtos import WasteClasificationBatchResponseDto  # type: ignore
+from src.modules.waste.ports.rest_routers_dtos.waste_dtos import WasteClasificationBatchRequestDto  # type: ignore
 from src.modules.waste.ports.rest_routers_dtos.waste_dtos import WasteClasificationResponseDto  # type: ignore
 from src.modules.waste.ports.rest_routers_dtos.waste_dtos import WasteFilterByStatusRequestDto  # type: ignore
 from src.modules.waste.ports.rest_routers_dtos.waste_dtos import WasteClasificationRequestDto  # type: ignore
@@ -31,17 +35,24 @@ from src.modules.waste.ports.rest_routers_dtos.waste_dtos import WasteFullDataRe
 from src.modules.waste.ports.rest_routers_dtos.waste_dtos import WasteClassifyRequestDto  # type: ignore
 
 # ** info: entities imports
+from src.modules.waste.adapters.database_providers_entities.waste_entity import WasteRecord  # type: ignore
 from src.modules.waste.adapters.database_providers_entities.waste_entity import Waste  # type: ignore
 
 # ** info: providers imports
+from src.modules.waste.adapters.database_providers.warehouse_capacity_ledger_provider import WarehouseCapacityLedgerProvider  # type: ignore
 from src.modules.waste.adapters.database_providers.waste_provider import WasteProvider  # type: ignore
 
 # ** info: adapter imports
-from src.modules.waste.adapters.rest_services.warehouse_ms_service import WarehouseMsService  # type: ignore
 from src.modules.waste.adapters.rest_services.brms_service import BrmsService  # type: ignore
 
+# ** info: sidecards.database_managers imports
+from src.sidecard.system.database_managers.mysql_manager import retry_unit_of_work  # type: ignore
+from src.sidecard.system.database_managers.mysql_manager import MySQLManager  # type: ignore
+
 # ** info: sidecards.artifacts imports
 from src.sidecard.system.artifacts.datetime_provider import DatetimeProvider  # type: ignore
+from src.sidecard.system.artifacts.cursor_provider import CursorProvider  # type: ignore
+from src.sidecard.system.artifacts.etag_provider import EtagProvider  # type: ignore
 from src.sidecard.system.artifacts.i8n_provider import I8nProvider  # type: ignore
 
 __all__: list[str] = ["WasteCore"]
@@ -52,7 +63,17 @@ class WasteCore:
     # ! info: core slots section start
     # !------------------------------------------------------------------------
 
-    __slots__ = ["_parameter_core", "_waste_provider", "_warehouse_ms_service", "_brms_service", "_datetime_provider", "_i8n"]
+    __slots__ = [
+        "_parameter_core",
+        "_waste_provider",
+        "_warehouse_capacity_ledger_provider",
+        "_brms_service",
+        "_datetime_provider",
+        "_cursor_provider",
+        "_etag_provider",
+        "_mysql_manager",
+        "_i8n",
+    ]
 
     # !------------------------------------------------------------------------
     # ! info: core atributtes and constructor section start
@@ -63,11 +84,14 @@ class WasteCore:
         self._parameter_core: ParameterCore = ParameterCore()
         # ** info: providers building
         self._waste_provider: WasteProvider = WasteProvider()
+        self._warehouse_capacity_ledger_provider: WarehouseCapacityLedgerProvider = WarehouseCapacityLedgerProvider()
         # ** info: rest services building
-        self._warehouse_ms_service: WarehouseMsService = WarehouseMsService()
         self._brms_service: BrmsService = BrmsService()
         # ** info: sidecards building
         self._datetime_provider: DatetimeProvider = DatetimeProvider()
+        self._cursor_provider: CursorProvider = CursorProvider()
+        self._etag_provider: EtagProvider = EtagProvider()
+        self._mysql_manager: MySQLManager = MySQLManager()
         self._i8n: I8nProvider = I8nProvider(module="waste")
 
     # !------------------------------------------------------------------------
@@ -85,31 +109,56 @@ class WasteCore:
         logging.info("driver_obtain_waste_classify ended")
         return obtain_waste_classify_response
 
+    async def driver_obtain_wastes_classify(self: Self, waste_clasification_batch_request: WasteClasificationBatchRequestDto) -> WasteClasificationBatchResponseDto:
+        logging.info("starting driver_obtain_wastes_classify")
+        clasifications: list[Union[int, None]] = await self._obtain_wastes_clasifications(wastes=waste_clasification_batch_request.wastes)
+        obtain_wastes_classify_response: WasteClasificationBatchResponseDto = await self._map_wastes_classify_response(
+            wastes=waste_clasification_batch_request.wastes, clasifications=clasifications
+        )
+        logging.info("driver_obtain_wastes_classify ended")
+        return obtain_wastes_classify_response
+
     async def driver_update_waste_classify(self: Self, waste_classify_request: WasteClassifyRequestDto) -> WasteFullDataResponseDto:
         logging.info("starting driver_update_waste_classify")
         await self._validate_wastes_state(waste_classify_request=waste_classify_request)
-        warehouse_capacity_and_waste_data = await self._get_warehouse_capacity_and_waste_data(warehouse_id=waste_classify_request.storeId, waste_id=waste_classify_request.wasteId)
-        warehouse_current_capacity: float = warehouse_capacity_and_waste_data[0]
-        waste_wight_in_kg: float = float(warehouse_capacity_and_waste_data[1].weight_in_kg)
-        await self._validate_warehouse_capacity_vs_waste_weight(waste_weight_in_kg=waste_wight_in_kg, warehouse_current_capacity=warehouse_current_capacity)
-        new_warehouse_capacity: float = await self._compute_new_warehouse_capacity(warehouse_current_capacity=warehouse_current_capacity, waste_weight_in_kg=waste_wight_in_kg)
-        await self._update_warehouse_current_capacity(warehouse_id=waste_classify_request.storeId, new_warehouse_capacity=new_warehouse_capacity)
-        waste_info: Waste = await self._waste_classify_request(waste_classify_request=waste_classify_request)
+        waste_data: WasteRecord = await self._get_waste_data_by_id(uuid=waste_classify_request.wasteId)
+        waste_info: Waste = await self._reserve_waste_weight_and_classify_waste_at_once(waste_classify_request=waste_classify_request, waste_data=waste_data)
         update_waste_classify_response: WasteFullDataResponseDto = await self._map_full_data_response(waste_info=waste_info)
         logging.info("driver_update_waste_classify ended")
         return update_waste_classify_response
 
-    async def driver_search_waste_by_status(self: Self, filter_waste_by_status_request: WasteFilterByStatusRequestDto) -> WasteFullDataResponseListDto:
+    async def driver_search_waste_by_status(
+        self: Self, filter_waste_by_status_request: WasteFilterByStatusRequestDto, if_none_match: Union[str, None] = None, response: Union[Response, None] = None
+    ) -> WasteFullDataResponseListDto:
         logging.info("starting driver_search_waste_by_status")
         await self._validate_waste_process_status(process_status=filter_waste_by_status_request.processStatus)
-        wastes_info: List[Waste] = self._waste_provider.list_wastes_by_process_status(process_status=filter_waste_by_status_request.processStatus)
-        filtered_wastes_response: WasteFullDataResponseListDto = await self._map_full_data_response_list(wastes_info=wastes_info)
+        page_size: int = filter_waste_by_status_request.pageSize
+        # ** info: one extra row is requested to know if there is a next page without running a count query
+        wastes_info: tuple[WasteRecord, ...] = await self._waste_provider.list_wastes_by_process_status(
+            process_status=filter_waste_by_status_request.processStatus,
+            limit=page_size + 1,
+            after=self._cursor_provider.decode_keyset_cursor(cursor=filter_waste_by_status_request.cursor),
+        )
+        await self._check_search_waste_by_status_etag(
+            filter_waste_by_status_request=filter_waste_by_status_request, wastes_info=wastes_info, if_none_match=if_none_match, response=response
+        )
+        filtered_wastes_response: WasteFullDataResponseListDto = await self._map_full_data_response_list(wastes_info=wastes_info, page_size=page_size)
         logging.info("driver_search_waste_by_status ended")
         return filtered_wastes_response
 
+    async def driver_stream_waste_by_status(self: Self, filter_waste_by_status_request: WasteFilterByStatusRequestDto) -> AsyncGenerator[str, None]:
+        logging.info("starting driver_stream_waste_by_status")
+        # ** info: the validations run before the first byte is sent so a bad request still gets a regular error response
+        await self._validate_waste_process_status(process_status=filter_waste_by_status_request.processStatus)
+        wastes_info: AsyncGenerator[WasteRecord, None] = self._waste_provider.stream_wastes_by_process_status(
+            process_status=filter_waste_by_status_request.processStatus, after=self._cursor_provider.decode_keyset_cursor(cursor=filter_waste_by_status_request.cursor)
+        )
+        # ** info: the rows are read while the response is sent, the driver is logged as ended once the lines generator is exhausted or closed
+        return self._map_full_data_response_lines(wastes_info=wastes_info)
+
     async def driver_update_waste_store(self: Self, waste_update_store_request: WasteUpdateStoreRequestDto) -> WasteFullDataResponseDto:
         logging.info("starting driver_update_waste_store")
-        waste_info: Waste = self._waste_provider.update_waste_store(
+        waste_info: Waste = await self._waste_provider.update_waste_store(
             uuid=waste_update_store_request.wasteId, store=waste_update_store_request.finalStore, note=waste_update_store_request.note
         )
         waste_update_store_response: WasteFullDataResponseDto = await self._map_full_data_response(waste_info=waste_info)
@@ -123,9 +172,9 @@ class WasteCore:
     # !------------------------------------------------------------------------
 
     # ** info: cam pc are initials for core adapter methods parameter core
-    async def _cam_pc_get_set_of_parameter_ids_by_domain(self: Self, domain: str) -> Set[int]:
+    async def _cam_pc_get_set_of_parameter_ids_by_domain(self: Self, domain: str) -> FrozenSet[int]:
         logging.info("starting _cam_pc_get_set_of_parameter_ids_by_domain")
-        ids: Set[int] = await self._parameter_core.cpm_pc_get_set_of_parameter_ids_by_domain(domain=domain)
+        ids: FrozenSet[int] = await self._parameter_core.cpm_pc_get_set_of_parameter_ids_by_domain(domain=domain)
         logging.info("ending _cam_pc_get_set_of_parameter_ids_by_domain")
         return ids
 
@@ -136,83 +185,58 @@ class WasteCore:
     # !------------------------------------------------------------------------
 
     # ** info: cpm wc are initials for core port methods waste core
-    async def cpm_wc_create_waste_with_basic_info(
-        self: Self, request_uuid: str, type: int, packaging: int, weight_in_kg: float, volume_in_l: float, description: str, note: Union[str, None] = None
-    ) -> Waste:
-        logging.info("starting cpm_wc_create_waste_with_basic_info")
-        new_waste: Waste = self._waste_provider.create_waste_with_basic_info(
-            request_uuid=request_uuid, type=type, packaging=packaging, weight_in_kg=weight_in_kg, volume_in_l=volume_in_l, description=description, note=note
-        )
-        logging.info("ending cpm_wc_create_waste_with_basic_info")
-        return new_waste
+    async def cpm_wc_create_wastes_with_basic_info(self: Self, request_uuid: str, wastes: list[dict[str, Any]]) -> list[Waste]:
+        logging.info("starting cpm_wc_create_wastes_with_basic_info")
+        new_wastes: list[Waste] = await self._waste_provider.create_wastes_with_basic_info(request_uuid=request_uuid, wastes=wastes)
+        logging.info("ending cpm_wc_create_wastes_with_basic_info")
+        return new_wastes
 
     # ** info: cpm wc are initials for core port methods waste core
     async def cpm_wc_update_waste_status_by_request_id(self: Self, request_uuid: str, process_status: int) -> list[Waste]:
         logging.info("starting cpm_wc_update_waste_by_requestId")
-        updated_wastes: list[Waste] = self._waste_provider.update_waste_status_by_request_id(request_uuid=request_uuid, process_status=process_status)
+        updated_wastes: list[Waste] = await self._waste_provider.update_waste_status_by_request_id(request_uuid=request_uuid, process_status=process_status)
         logging.info("ending cpm_wc_update_waste_by_requestId")
         return updated_wastes
 
     # ** info: cpm wc are initials for core port methods waste core
     async def cpm_wc_update_waste_status_and_store_by_request_id(self: Self, request_uuid: str, process_status: int, store_id: int) -> list[Waste]:
         logging.info("starting cpm_wc_update_waste_status_and_store_by_request_id")
-        updated_wastes: list[Waste] = self._waste_provider.update_waste_status_and_store_id_by_request_id(
+        updated_wastes: list[Waste] = await self._waste_provider.update_waste_status_and_store_id_by_request_id(
             request_uuid=request_uuid, process_status=process_status, store_id=store_id
         )
         logging.info("ending cpm_wc_update_waste_status_and_store_by_request_id")
         return updated_wastes
 
     # ** info: cpm wc are initials for core port methods waste core
-    async def cpm_wc_check_if_wastes_batch_are_assignable_to_warehouse(self: Self, warehouse_id: int, wastes_ids: list[str]) -> None:
-        logging.info("starting cpm_wc_get_warehouse_capacity")
-        warehouse_current_capacity, wastes_by_ids = await gather(
-            self._get_warehouse_current_capacity(warehouse_id=warehouse_id), self._search_wastes_by_ids(uuids=tuple(wastes_ids))
-        )
-        wastes_total_weight = await self._compute_wastes_total_weight(wastes=wastes_by_ids)
-        if warehouse_current_capacity < wastes_total_weight:
-            logging.error(f"warehouse capacity {warehouse_current_capacity} is less than wastes total weight {wastes_total_weight}")
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST, detail=f"warehouse capacity {warehouse_current_capacity} is less than wastes total weight {wastes_total_weight}"
-            )
-        logging.info("ending cpm_wc_get_warehouse_capacity")
-        return None
-
-    # ** info: cpm wc are initials for core port methods waste core
-    async def cpm_get_wastes_by_collect_request_id(self: Self, collect_request_uuid: str) -> list[Waste]:
+    async def cpm_get_wastes_by_collect_request_id(self: Self, collect_request_uuid: str) -> tuple[WasteRecord, ...]:
         logging.info("starting cpm_get_wastes_by_collect_request_id")
-        list_wastes_by_collect_request_id: list[Waste] = self._waste_provider.list_wastes_by_collect_request_id(collect_request_uuid=collect_request_uuid)
+        list_wastes_by_collect_request_id: tuple[WasteRecord, ...] = await self._waste_provider.list_wastes_by_collect_request_id(collect_request_uuid=collect_request_uuid)
         logging.info("ending cpm_get_wastes_by_collect_request_id")
         return list_wastes_by_collect_request_id
 
-    async def cpm_wc_copute_new_warehouse_capacity_assigning_new_wastes(self: Self, warehouse_id: int, wastes_ids: list[str]) -> float:
-        logging.info("starting cpm_wc_copute_new_warehouse_capacity_assigning_new_wastes")
-        warehouse_current_capacity, wastes_by_ids = await gather(
-            self._get_warehouse_current_capacity(warehouse_id=warehouse_id), self._search_wastes_by_ids(uuids=tuple(wastes_ids))
-        )
-        wastes_total_weight = await self._compute_wastes_total_weight(wastes=wastes_by_ids)
-        new_warehouse_capacity = await self._compute_new_warehouse_capacity(warehouse_current_capacity=warehouse_current_capacity, waste_weight_in_kg=wastes_total_weight)
-        logging.info("ending cpm_wc_copute_new_warehouse_capacity_assigning_new_wastes")
-        return new_warehouse_capacity
+    # ** info: cpm wc are initials for core port methods waste core
+    async def cpm_wc_load_warehouse_capacity(self: Self, warehouse_id: int) -> None:
+        logging.info("starting cpm_wc_load_warehouse_capacity")
+        await self._warehouse_capacity_ledger_provider.load_capacity(warehouse_id=warehouse_id)
+        logging.info("ending cpm_wc_load_warehouse_capacity")
 
-    async def cpm_wc_update_warehouse_current_capacity(self: Self, warehouse_id: int, new_warehouse_capacity: float) -> float:
-        logging.info("starting cpm_wc_update_warehouse_capacity")
-        updated_warehouse_capacity = await self._update_warehouse_current_capacity(warehouse_id=warehouse_id, new_warehouse_capacity=new_warehouse_capacity)
-        logging.info("ending cpm_wc_update_warehouse_capacity")
-        return updated_warehouse_capacity
+    # ** info: cpm wc are initials for core port methods waste core
+    async def cpm_wc_reserve_wastes_weight_in_warehouse(self: Self, warehouse_id: int, collect_request_uuid: str, wastes: tuple[WasteRecord, ...]) -> float:
+        logging.info("starting cpm_wc_reserve_wastes_weight_in_warehouse")
+        wastes_total_weight: float = await self._compute_wastes_total_weight(wastes=wastes)
+        available_warehouse_capacity: float = await self._warehouse_capacity_ledger_provider.reserve(
+            warehouse_id=warehouse_id, source_uuid=collect_request_uuid, weight_in_kg=wastes_total_weight
+        )
+        logging.info("ending cpm_wc_reserve_wastes_weight_in_warehouse")
+        return available_warehouse_capacity
 
     # ** info: cpm wc are initials for core port methods waste core
-    async def cpm_wc_list_wastes_by_collect_request_id(self: Self, collect_request_uuid: str) -> list[Waste]:
+    async def cpm_wc_list_wastes_by_collect_request_id(self: Self, collect_request_uuid: str) -> tuple[WasteRecord, ...]:
         logging.info("starting cpm_wc_list_wastes_by_collect_request_id")
-        list_wastes_by_collect_request_id: list[Waste] = self._waste_provider.list_wastes_by_collect_request_id(collect_request_uuid=collect_request_uuid)
+        list_wastes_by_collect_request_id: tuple[WasteRecord, ...] = await self._waste_provider.list_wastes_by_collect_request_id(collect_request_uuid=collect_request_uuid)
         logging.info("ending cpm_wc_list_wastes_by_collect_request_id")
         return list_wastes_by_collect_request_id
 
-    async def cpm_waste_quantity_by_year(self: Self, year: int) -> Any:
-        logging.info("starting cpm_waste_quantity_by_year")
-        waste_quantity_by_year = self._waste_provider.waste_quantity_by_year(year=year)
-        logging.info("ending cpm_waste_quantity_by_year")
-        return waste_quantity_by_year
-
     # !------------------------------------------------------------------------
     # ! info: private class methods section start
     # ! warning: all the methods in this section are the ones that are going to be called from inside this core
@@ -225,22 +249,33 @@ class WasteCore:
     async def _map_waste_classify_response(self: Self, clasification: int) -> WasteClasificationResponseDto:
         return WasteClasificationResponseDto(storeType=clasification)
 
+    async def _obtain_wastes_clasifications(self: Self, wastes: List[WasteClasificationRequestDto]) -> list[Union[int, None]]:
+        return await self._brms_service.obtain_waste_clasifications(wastes=[(waste.stateWaste, waste.weightInKg, waste.isotopesNumber) for waste in wastes])
+
+    async def _map_wastes_classify_response(self: Self, wastes: List[WasteClasificationRequestDto], clasifications: list[Union[int, None]]) -> WasteClasificationBatchResponseDto:
+        return WasteClasificationBatchResponseDto(
+            values=[
+                WasteClasificationBatchItemResponseDto(stateWaste=waste.stateWaste, isotopesNumber=waste.isotopesNumber, weightInKg=waste.weightInKg, storeType=clasification)
+                for waste, clasification in zip(wastes, clasifications)
+            ]
+        )
+
     async def _validate_waste_process_status(self: Self, process_status: int) -> None:
-        waste_state_ids: Set[int] = await self._cam_pc_get_set_of_parameter_ids_by_domain(domain=r"wasteProcessStatus")
+        waste_state_ids: FrozenSet[int] = await self._cam_pc_get_set_of_parameter_ids_by_domain(domain=r"wasteProcessStatus")
         if process_status not in waste_state_ids:
             valid_state_waste: str = r",".join(str(s) for s in waste_state_ids)
             logging.error(f"process status {process_status} is not valid valid types are {valid_state_waste}")
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=self._i8n.message(message_key="EM001", process_status=process_status))
 
     async def _validate_wastes_state(self: Self, waste_classify_request: WasteClassifyRequestDto) -> None:
-        waste_state_ids: Set[int] = await self._cam_pc_get_set_of_parameter_ids_by_domain(domain=r"stateWaste")
+        waste_state_ids: FrozenSet[int] = await self._cam_pc_get_set_of_parameter_ids_by_domain(domain=r"stateWaste")
         if waste_classify_request.stateWaste not in waste_state_ids:
             valid_state_waste: str = r",".join(str(s) for s in waste_state_ids)
             logging.error(f"state type {waste_classify_request.stateWaste} is not valid valid types are {valid_state_waste}")
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"state type {waste_classify_request.stateWaste} is not valid")
 
     async def _waste_classify_request(self: Self, waste_classify_request: WasteClassifyRequestDto) -> Waste:
-        waste_info: Waste = self._waste_provider.update_waste_internal_classification_info(
+        waste_info: Waste = await self._waste_provider.update_waste_internal_classification_info(
             uuid=waste_classify_request.wasteId,
             isotopes_number=waste_classify_request.isotopesNumber,
             state_waste=waste_classify_request.stateWaste,
@@ -248,13 +283,38 @@ class WasteCore:
         )
         return waste_info
 
-    async def _map_full_data_response_list(self: Self, wastes_info: List[Waste]) -> WasteFullDataResponseListDto:
-        return WasteFullDataResponseListDto(values=await self._map_full_data_responses(wastes_info=wastes_info))
-
-    async def _map_full_data_responses(self: Self, wastes_info: List[Waste]) -> List[WasteFullDataResponseDto]:
+    async def _check_search_waste_by_status_etag(
+        self: Self,
+        filter_waste_by_status_request: WasteFilterByStatusRequestDto,
+        wastes_info: tuple[WasteRecord, ...],
+        if_none_match: Union[str, None],
+        response: Union[Response, None],
+    ) -> None:
+        scope: str = f"waste_status_search:{filter_waste_by_status_request.processStatus}:{filter_waste_by_status_request.pageSize}:{filter_waste_by_status_request.cursor}"
+        etag: str = self._etag_provider.build_etag(scope=scope, data=wastes_info)
+        self._etag_provider.check_etag(etag=etag, if_none_match=if_none_match, response=response)
+
+    async def _map_full_data_response_list(self: Self, wastes_info: tuple[WasteRecord, ...], page_size: int) -> WasteFullDataResponseListDto:
+        page: tuple[WasteRecord, ...] = wastes_info[:page_size]
+        next_cursor: Union[str, None] = None
+        if len(wastes_info) > page_size:
+            next_cursor = self._cursor_provider.encode_keyset_cursor(create=page[-1].create, uuid=page[-1].uuid)
+        return WasteFullDataResponseListDto(values=await self._map_full_data_responses(wastes_info=page), pageSize=page_size, nextCursor=next_cursor)
+
+    async def _map_full_data_response_lines(self: Self, wastes_info: AsyncGenerator[WasteRecord, None]) -> AsyncGenerator[str, None]:
+        # ** info: every row is mapped and serialized on its own as one ndjson line, nothing but the current page is held in memory
+        try:
+            async for waste_info in wastes_info:
+                waste_full_data_response: WasteFullDataResponseDto = await self._map_full_data_response(waste_info=waste_info)
+                yield waste_full_data_response.model_dump_json() + "\n"
+        finally:
+            await wastes_info.aclose()
+            logging.info("driver_stream_waste_by_status ended")
+
+    async def _map_full_data_responses(self: Self, wastes_info: tuple[WasteRecord, ...]) -> List[WasteFullDataResponseDto]:
         return [await self._map_full_data_response(waste_info=waste_info) for waste_info in wastes_info]
 
-    async def _map_full_data_response(self: Self, waste_info: Waste) -> WasteFullDataResponseDto:
+    async def _map_full_data_response(self: Self, waste_info: Union[Waste, WasteRecord]) -> WasteFullDataResponseDto:
         created: str = self._datetime_provider.prettify_date_time_obj(date_time_obj=waste_info.create)
         updated: str = self._datetime_provider.prettify_date_time_obj(date_time_obj=waste_info.update)
         waste_full_data_response: WasteFullDataResponseDto = WasteFullDataResponseDto(
@@ -279,32 +339,23 @@ class WasteCore:
             waste_full_data_response.storeType = waste_info.store
         return waste_full_data_response
 
-    async def _get_warehouse_current_capacity(self: Self, warehouse_id: int) -> float:
-        return await self._warehouse_ms_service.obtain_warehouse_current_capacity(warehouse_id=warehouse_id)
-
-    async def _get_waste_data_by_id(self: Self, uuid: str) -> Waste:
-        waste: Waste = self._waste_provider.search_waste_by_id(uuid=uuid)
+    async def _get_waste_data_by_id(self: Self, uuid: str) -> WasteRecord:
+        waste: Union[WasteRecord, None] = await self._waste_provider.search_waste_by_id(uuid=uuid)
         if waste is None:
             logging.error(f"waste with id {uuid} not found")
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"waste with id {uuid} not found")
         return waste
 
-    async def _get_warehouse_capacity_and_waste_data(self: Self, warehouse_id: int, waste_id: str) -> tuple[float, Waste]:
-        return await gather(self._get_warehouse_current_capacity(warehouse_id=warehouse_id), self._get_waste_data_by_id(uuid=waste_id))
-
-    async def _validate_warehouse_capacity_vs_waste_weight(self: Self, warehouse_current_capacity: float, waste_weight_in_kg: float) -> None:
-        if warehouse_current_capacity < waste_weight_in_kg:
-            logging.error(f"warehouse capacity {warehouse_current_capacity} is less than waste weight {waste_weight_in_kg}")
-            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"warehouse capacity {warehouse_current_capacity} is less than waste weight {waste_weight_in_kg}")
-
-    async def _compute_new_warehouse_capacity(self: Self, warehouse_current_capacity: float, waste_weight_in_kg: float) -> float:
-        return warehouse_current_capacity - waste_weight_in_kg
-
-    async def _update_warehouse_current_capacity(self: Self, warehouse_id: int, new_warehouse_capacity: float) -> float:
-        return await self._warehouse_ms_service.update_warehouse_current_capacity(warehouse_id=warehouse_id, new_warehouse_capacity=new_warehouse_capacity)
-
-    async def _search_wastes_by_ids(self: Self, uuids: tuple[str, ...]) -> List[Waste]:
-        return self._waste_provider.search_wastes_by_ids(uuids=tuple(uuids))
+    @retry_unit_of_work
+    async def _reserve_waste_weight_and_classify_waste_at_once(self: Self, waste_classify_request: WasteClassifyRequestDto, waste_data: WasteRecord) -> Waste:
+        # ** info: the warehouse capacity is only written by the ledger, the classification takes it through a reservation committed with the waste update
+        await self._warehouse_capacity_ledger_provider.load_capacity(warehouse_id=waste_classify_request.storeId)
+        async with self._mysql_manager.unit_of_work():
+            await self._warehouse_capacity_ledger_provider.reserve(
+                warehouse_id=waste_classify_request.storeId, source_uuid=waste_data.uuid, weight_in_kg=float(waste_data.weight_in_kg)
+            )
+            waste_info: Waste = await self._waste_classify_request(waste_classify_request=waste_classify_request)
+        return waste_info
 
-    async def _compute_wastes_total_weight(self: Self, wastes: list[Waste]) -> float:
-        return reduce(lambda weight_1, weight_2: weight_1 + weight_2, list(map(lambda waste: float(waste.weight_in_kg), wastes)))
+    async def _compute_wastes_total_weight(self: Self, wastes: tuple[WasteRecord, ...]) -> float:
+        return reduce(lambda weight_1, weight_2: weight_1 + weight_2, map(lambda waste: float(waste.weight_in_kg), wastes), 0.0)
@@ -5,6 +5,7 @@
 from pathlib import Path
 
 # ** info: typing imports
+from typing import Union
 from typing import Any
 
 # ** info: starlette imports
@@ -59,12 +60,24 @@ query: QueryType = QueryType()
 
 
 @query.field("wastesByStatus")
-async def wastes_by_status(*_: Any, processStatus: int) -> WasteFullDataResponseListDto:
-    filter_waste_by_status_request: WasteFilterByStatusRequestDto = WasteFilterByStatusRequestDto(processStatus=processStatus)
-    filtered_wastes_response: WasteFullDataResponseListDto = await _waste_core.driver_search_waste_by_status(filter_waste_by_status_request)
+async def wastes_by_status(*_: Any, processStatus: int, pageSize: Union[int, None] = None, cursor: Union[str, None] = None) -> WasteFullDataResponseListDto:
+    filtered_wastes_response: WasteFullDataResponseListDto = await _search_wastes_by_status(processStatus=processStatus, pageSize=pageSize, cursor=cursor)
     return filtered_wastes_response.values
 
 
+@query.field("wastesByStatusPage")
+async def wastes_by_status_page(*_: Any, processStatus: int, pageSize: Union[int, None] = None, cursor: Union[str, None] = None) -> WasteFullDataResponseListDto:
+    filtered_wastes_response: WasteFullDataResponseListDto = await _search_wastes_by_status(processStatus=processStatus, pageSize=pageSize, cursor=cursor)
+    return filtered_wastes_response
+
+
+async def _search_wastes_by_status(processStatus: int, pageSize: Union[int, None], cursor: Union[str, None]) -> WasteFullDataResponseListDto:
+    # ** info: the page size is only forwarded when the client sends it so the dto default keeps applying
+    page_args: dict[str, Any] = {"cursor": cursor} if pageSize is None else {"cursor": cursor, "pageSize": pageSize}
+    filter_waste_by_status_request: WasteFilterByStatusRequestDto = WasteFilterByStatusRequestDto(processStatus=processStatus, **page_args)
+    return await _waste_core.driver_search_waste_by_status(filter_waste_by_status_request)
+
+
 # ---------------------------------------------------------------------------------------------------------------------
 # ** info: assembling schema literal with schema executable
 # ---------------------------------------------------------------------------------------------------------------------
@@ -1,11 +1,19 @@
 # !/usr/bin/python3
 
+# ** info: typing imports
+from typing import Union
+
 # ** info: fastapi imports
+from fastapi.responses import StreamingResponse
 from fastapi import APIRouter
+from fastapi import Response
 from fastapi import status
+from fastapi import Header
 from fastapi import Body
 
 # ** info: port dtos imports
+from src.modules.waste.ports.rest_routers_dtos.waste_dtos import WasteClasificationBatchResponseDto  # type: ignore
+from src.modules.waste.ports.rest_routers_dtos.waste_dtos import WasteClasificationBatchRequestDto  # type: ignore
 from src.modules.waste.ports.rest_routers_dtos.waste_dtos import WasteClasificationResponseDto  # type: ignore
 from src.modules.waste.ports.rest_routers_dtos.waste_dtos import WasteFilterByStatusRequestDto  # type: ignore
 from src.modules.waste.ports.rest_routers_dtos.waste_dtos import WasteFullDataResponseListDto  # type: ignore
@@ -17,6 +25,9 @@ from src.modules.waste.ports.rest_routers_dtos.waste_dtos import WasteClassifyRe
 # ** info: app core imports
 from src.modules.waste.cores.business.waste_core import WasteCore  # type: ignore
 
+# ** info: sidecards.helpers imports
+from src.sidecard.system.helpers.closing_streaming_response_helper import ClosingStreamingResponse  # type: ignore
+
 # ** info: sidecards.artifacts imports
 from src.sidecard.system.artifacts.path_provider import PathProvider  # type: ignore
 
@@ -44,6 +55,18 @@ async def api_obtain_waste_classify(parameter_search_request: WasteClasification
     return obtain_waste_classify_response
 
 
+@waste_router.post(
+    description="allow to obtain the clasification of many wastes in a single call, the wastes that the brms can not classify get a null store type",
+    summary="allow to obtain the clasification of many wastes in a single call",
+    path=_path_provider.build_posix_path("clasification", "obtain", "batch"),
+    response_model=WasteClasificationBatchResponseDto,
+    status_code=status.HTTP_200_OK,
+)
+async def api_obtain_wastes_classify(waste_clasification_batch_request: WasteClasificationBatchRequestDto = Body(...)) -> WasteClasificationBatchResponseDto:
+    obtain_wastes_classify_response: WasteClasificationBatchResponseDto = await _waste_core.driver_obtain_wastes_classify(waste_clasification_batch_request)
+    return obtain_wastes_classify_response
+
+
 @waste_router.post(
     description="allow to change a waste store id, isotopes number and state of matter",
     summary="allow to change a waste store id, isotopes number and state of matter",
@@ -63,11 +86,29 @@ async def api_update_waste_classify(waste_classify_request: WasteClassifyRequest
     response_model=WasteFullDataResponseListDto,
     status_code=status.HTTP_200_OK,
 )
-async def api_search_waste_by_status(filter_waste_by_status_request: WasteFilterByStatusRequestDto = Body(...)) -> WasteFullDataResponseListDto:
-    filtered_wastes_response: WasteFullDataResponseListDto = await _waste_core.driver_search_waste_by_status(filter_waste_by_status_request)
+async def api_search_waste_by_status(
+    response: Response, filter_waste_by_status_request: WasteFilterByStatusRequestDto = Body(...), if_none_match: Union[str, None] = Header(default=None)
+) -> WasteFullDataResponseListDto:
+    filtered_wastes_response: WasteFullDataResponseListDto = await _waste_core.driver_search_waste_by_status(
+        filter_waste_by_status_request, if_none_match=if_none_match, response=response
+    )
     return filtered_wastes_response
 
 
+@waste_router.post(
+    description="allow to stream all the wastes with the given status as newline delimited json, the page size is ignored and the cursor sets the starting row",
+    summary="allow to stream all the wastes with the given status as newline delimited json",
+    path=_path_provider.build_posix_path("status", "search", "stream"),
+    response_class=StreamingResponse,
+    status_code=status.HTTP_200_OK,
+)
+async def api_stream_waste_by_status(filter_waste_by_status_request: WasteFilterByStatusRequestDto = Body(...)) -> StreamingResponse:
+    streamed_wastes_response: StreamingResponse = ClosingStreamingResponse(
+        content=await _waste_core.driver_stream_waste_by_status(filter_waste_by_status_request), media_type="application/x-ndjson"
+    )
+    return streamed_wastes_response
+
+
 @waste_router.post(
     description="allow to update the waste status, a note and a temporal store",
     summary="allow to update the waste status, a note and a temporal store",
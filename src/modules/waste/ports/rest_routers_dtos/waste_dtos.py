@@ -15,6 +15,8 @@ from typing import Optional
 
 # **info: metadata for the model imports
 from src.modules.waste.ports.rest_routers_dtos.waste_dtos_metadata import waste_filter_by_status_request_dto
+from src.modules.waste.ports.rest_routers_dtos.waste_dtos_metadata import waste_clasification_batch_req_ex
+from src.modules.waste.ports.rest_routers_dtos.waste_dtos_metadata import waste_clasification_batch_res_ex
 from src.modules.waste.ports.rest_routers_dtos.waste_dtos_metadata import waste_full_data_response_list_ex
 from src.modules.waste.ports.rest_routers_dtos.waste_dtos_metadata import collect_request_classify_req_ex
 from src.modules.waste.ports.rest_routers_dtos.waste_dtos_metadata import collect_request_classify_res_ex
@@ -25,7 +27,15 @@ from src.modules.waste.ports.rest_routers_dtos.waste_dtos_metadata import waste_
 # ** info: sidecards.artifacts imports
 from src.sidecard.system.artifacts.uuid_provider import UuidProvider
 
-__all__: list[str] = ["WasteClasificationRequestDto", "WasteClasificationResponseDto", "WasteClassifyRequestDto", "WasteFullDataResponseDto", "WasteFilterByStatusRequestDto"]
+__all__: list[str] = [
+    "WasteClasificationBatchResponseDto",
+    "WasteClasificationBatchRequestDto",
+    "WasteClasificationRequestDto",
+    "WasteClasificationResponseDto",
+    "WasteClassifyRequestDto",
+    "WasteFullDataResponseDto",
+    "WasteFilterByStatusRequestDto",
+]
 
 
 # !------------------------------------------------------------------------
@@ -65,6 +75,11 @@ class WasteClasificationRequestDto(BaseModel):
         return value
 
 
+class WasteClasificationBatchRequestDto(BaseModel):
+    wastes: list[WasteClasificationRequestDto] = Field(..., min_length=1, max_length=500)
+    model_config = waste_clasification_batch_req_ex
+
+
 class WasteClassifyRequestDto(BaseModel):
     wasteId: str = Field(...)
     isotopesNumber: float = Field(...)
@@ -103,8 +118,10 @@ class WasteClassifyRequestDto(BaseModel):
 
 class WasteFilterByStatusRequestDto(BaseModel):
     processStatus: int = Field(...)
+    pageSize: int = Field(default=50, ge=1, le=200)
+    cursor: Optional[str] = None
 
-    @field_validator("processStatus")
+    @field_validator("processStatus", "pageSize")
     @classmethod
     def int_validator(cls, value: int, info: ValidationInfo) -> int:
         if isinstance(value, int):
@@ -154,6 +171,18 @@ class WasteClasificationResponseDto(BaseModel):
     model_config = waste_clasification_res_ex
 
 
+class WasteClasificationBatchItemResponseDto(BaseModel):
+    stateWaste: StateWasteOptions = Field(...)
+    isotopesNumber: float = Field(...)
+    weightInKg: float = Field(...)
+    storeType: Optional[int] = None
+
+
+class WasteClasificationBatchResponseDto(BaseModel):
+    values: list[WasteClasificationBatchItemResponseDto] = Field(...)
+    model_config = waste_clasification_batch_res_ex
+
+
 class WasteFullDataResponseDto(BaseModel):
     id: str = Field(...)
     requestId: str = Field(...)
@@ -176,5 +205,7 @@ class WasteFullDataResponseDto(BaseModel):
 
 class WasteFullDataResponseListDto(BaseModel):
     values: list[WasteFullDataResponseDto] = Field(...)
+    pageSize: int = Field(...)
+    nextCursor: Optional[str] = None
 
     model_config = waste_full_data_response_list_ex
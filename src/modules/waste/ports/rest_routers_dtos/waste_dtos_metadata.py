@@ -2,7 +2,26 @@ waste_clasification_req_ex = {"json_schema_extra": {"examples": [{"stateWaste":
 
 waste_clasification_res_ex = {"json_schema_extra": {"examples": [{"storeType": 4}]}}
 
-waste_filter_by_status_request_dto = {"json_schema_extra": {"examples": [{"processStatus": 9}]}}
+waste_clasification_batch_req_ex = {
+    "json_schema_extra": {
+        "examples": [{"wastes": [{"stateWaste": "solid", "weightInKg": 100, "isotopesNumber": 31}, {"stateWaste": "liquid", "weightInKg": 20, "isotopesNumber": 12}]}]
+    }
+}
+
+waste_clasification_batch_res_ex = {
+    "json_schema_extra": {
+        "examples": [
+            {
+                "values": [
+                    {"stateWaste": "solid", "weightInKg": 100, "isotopesNumber": 31, "storeType": 4},
+                    {"stateWaste": "liquid", "weightInKg": 20, "isotopesNumber": 12, "storeType": None},
+                ]
+            }
+        ]
+    }
+}
+
+waste_filter_by_status_request_dto = {"json_schema_extra": {"examples": [{"processStatus": 9, "pageSize": 50, "cursor": None}]}}
 
 waste_update_store_req = {"json_schema_extra": {"examples": [{"wasteId": "97ed79c5-eb28-4f80-93b1-1d5800c95bc9", "finalStore": 4, "note": "Almacenamiento final"}]}}
 
@@ -71,7 +90,9 @@ waste_full_data_response_list_ex = {
                         "create": "2024-03-03 02:54:12.000000",
                         "update": "2024-03-03 02:54:12.000000",
                     },
-                ]
+                ],
+                "pageSize": 2,
+                "nextCursor": "WyIyMDI0LTAzLTAzVDAyOjU0OjEyIiwiMWJmNDI5NmUtNGFkOS00OWQ5LTk2YjAtNGNhNGFmOWE3ZmNiIl0",
             }
         ]
     }
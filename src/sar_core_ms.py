@@ -1,6 +1,7 @@
 # !/usr/bin/python3
 
 # ** info: python imports
+from contextlib import asynccontextmanager
 from os.path import join
 from os import path
 import logging
@@ -9,6 +10,7 @@ import sys
 import gc
 
 # ** info: typing imports
+from typing import AsyncIterator
 from typing import List
 from typing import Dict
 from typing import Any
@@ -68,10 +70,21 @@ from src.modules.centralized_analytics.ports.rest_routers.centralized_analytics_
 from src.modules.collect_request.ports.rest_routers.collect_request_router import collect_request_router  # type: ignore
 from src.modules.heart_beat.ports.rest_routers.heart_beat_router import heart_beat_router
 from src.modules.parameter.ports.rest_routers.parameter_router import parameter_router
+from src.modules.introspection.ports.rest_routers.introspection_router import introspection_router  # type: ignore
 from src.modules.waste.ports.rest_routers.waster_router import waste_router
 from src.modules.user.ports.rest_routers.user_router import user_router
 
+# ** info: catalogs imports
+from src.modules.waste.adapters.database_providers.warehouse_capacity_ledger_provider import WarehouseCapacityLedgerProvider  # type: ignore
+from src.modules.parameter.adapters.database_providers.parameter_catalog_provider import ParameterCatalogProvider  # type: ignore
+
+# ** info: sidecard.managers imports
+from src.sidecard.system.cache_managers.shared_cache_manager import SharedCacheManager  # type: ignore
+from src.sidecard.system.http_managers.httpx_client_manager import HttpxClientManager  # type: ignore
+from src.sidecard.system.database_managers.mysql_manager import MySQLManager  # type: ignore
+
 # ** info: sidecard.middlewares imports
+from src.sidecard.system.middlewares.root.private_endpoints_authentication_middleware import PrivateEndpointsAuthenticationMiddleware  # type: ignore
 from src.sidecard.system.middlewares.root.logger_contextualizer_middleware import LoggerContextualizerMiddleware  # type: ignore
 from src.sidecard.system.middlewares.root.authentication_middleware import AuthenticationMiddleware  # type: ignore
 from src.sidecard.system.middlewares.root.error_handler_middleware import ErrorHandlerMiddleware  # type: ignore
@@ -106,6 +119,29 @@ routes.append(user_gpl_router)
 
 graphql_routers: List[BaseRoute] = [Mount(path=path_provider.build_posix_path("graphql"), routes=routes)]
 
+# ---------------------------------------------------------------------------------------------------------------------
+# ** info: setting up app lifespan
+# ---------------------------------------------------------------------------------------------------------------------
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    # ** info: the shared cache listener has to be running before the first request so the invalidations of the other workers are not missed
+    SharedCacheManager().start()
+    # ** info: the parameter catalog is loaded before serving so the domain validations are in memory lookups from the first request
+    await ParameterCatalogProvider().start()
+    # ** info: one client per upstream for the whole process, their keep alive connections are closed on shutdown instead of being left to the gc
+    HttpxClientManager().start()
+    # ** info: the capacity ledger writes the reservations left pending by the previous run before serving, then keeps reconciling in background
+    await WarehouseCapacityLedgerProvider().start()
+    yield
+    await WarehouseCapacityLedgerProvider().stop()
+    await HttpxClientManager().dispose()
+    await ParameterCatalogProvider().stop()
+    await SharedCacheManager().dispose()
+    await MySQLManager().dispose()
+
+
 # ---------------------------------------------------------------------------------------------------------------------
 # ** info: initializing app metadata and documentation
 # ---------------------------------------------------------------------------------------------------------------------
@@ -119,10 +155,10 @@ metadata: Dict[str, Any] = {
 
 sar_core_ms: FastAPI
 if env_provider.app_swagger_docs is True:
-    sar_core_ms = FastAPI(routes=graphql_routers, docs_url=path_provider.build_posix_path("rest", "docs"), redoc_url=None, swagger_ui_parameters={"defaultModelsExpandDepth": -1}, **metadata)  # noqa # fmt: skip
+    sar_core_ms = FastAPI(routes=graphql_routers, docs_url=path_provider.build_posix_path("rest", "docs"), redoc_url=None, swagger_ui_parameters={"defaultModelsExpandDepth": -1}, lifespan=lifespan, **metadata)  # noqa # fmt: skip
     logging.warning("swagger docs active")
 else:
-    sar_core_ms = FastAPI(routes=graphql_routers, docs_url=None, redoc_url=None, **metadata)
+    sar_core_ms = FastAPI(routes=graphql_routers, docs_url=None, redoc_url=None, lifespan=lifespan, **metadata)
     logging.warning("swagger docs inactive")
 
 # ---------------------------------------------------------------------------------------------------------------------
@@ -142,6 +178,17 @@ rest_router.include_router(router=parameter_router)
 rest_router.include_router(router=waste_router)
 rest_router.include_router(router=user_router)
 
+# ** info: the private endpoints are never served without their api key, an empty key stops the app instead of leaving them open
+if env_provider.app_mount_private_endpoints is True and env_provider.app_private_endpoints_api_key == "":
+    logging.critical("private endpoints active without an api key, set APP_PRIVATE_ENDPOINTS_API_KEY or turn APP_MOUNT_PRIVATE_ENDPOINTS off")
+    raise ValueError("APP_PRIVATE_ENDPOINTS_API_KEY can not be empty while APP_MOUNT_PRIVATE_ENDPOINTS is true")
+
+if env_provider.app_mount_private_endpoints is True:
+    rest_router.include_router(router=introspection_router)
+    logging.warning("private endpoints active")
+else:
+    logging.info("private endpoints inactive")
+
 # ---------------------------------------------------------------------------------------------------------------------
 # ** info: mounting rest based routers
 # ---------------------------------------------------------------------------------------------------------------------
@@ -158,6 +205,10 @@ if env_provider.app_mount_authentication_middleware is True:
 else:
     logging.warning("authentication middleware inactive")
 
+if env_provider.app_mount_private_endpoints is True:
+    logging.info("private endpoints authentication middleware active")
+    sar_core_ms.add_middleware(middleware_class=BaseHTTPMiddleware, dispatch=PrivateEndpointsAuthenticationMiddleware())
+
 sar_core_ms.add_middleware(middleware_class=BaseHTTPMiddleware, dispatch=ErrorHandlerMiddleware())
 sar_core_ms.add_middleware(middleware_class=BaseHTTPMiddleware, dispatch=LoggerContextualizerMiddleware())
 sar_core_ms.add_middleware(CORSMiddleware, allow_credentials=True, allow_origins=["*"], allow_methods=["*"], allow_headers=["*"])
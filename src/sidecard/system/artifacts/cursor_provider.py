@@ -0,0 +1,38 @@
+# !/usr/bin/python3
+# type: ignore
+
+# ** info: python imports
+from base64 import urlsafe_b64decode
+from base64 import urlsafe_b64encode
+from datetime import datetime
+import logging
+import json
+
+# ** info: typing imports
+from typing import Union
+from typing import Self
+
+# ** info: fastapi imports
+from fastapi import HTTPException
+from fastapi import status
+
+__all__: list[str] = ["CursorProvider"]
+
+
+class CursorProvider:
+    def encode_keyset_cursor(self: Self, create: datetime, uuid: str) -> str:
+        raw_cursor: str = json.dumps([create.isoformat(), uuid], separators=(",", ":"))
+        return urlsafe_b64encode(raw_cursor.encode("utf-8")).decode("ascii").rstrip("=")
+
+    def decode_keyset_cursor(self: Self, cursor: Union[str, None]) -> Union[tuple[datetime, str], None]:
+        if cursor is None:
+            return None
+
+        try:
+            padded_cursor: str = cursor + "=" * (-len(cursor) % 4)
+            create, uuid = json.loads(urlsafe_b64decode(padded_cursor.encode("ascii")))
+            return datetime.fromisoformat(create), str(uuid)
+
+        except Exception:
+            logging.error(f"invalid page cursor {cursor}")
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="invalid page cursor")
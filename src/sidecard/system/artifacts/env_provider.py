@@ -4,6 +4,9 @@
 # ** info: python imports
 from enum import Enum
 
+# ** info: typing imports
+from typing import Any
+
 # ** info: pydantic imports
 from pydantic_settings import SettingsConfigDict
 from pydantic_settings import BaseSettings
@@ -52,7 +55,6 @@ class EnvProvider(BaseSettings):
     app_swagger_docs: bool = Field(..., validation_alias="APP_SWAGGER_DOCS")
     app_posix_locale: SupportedLocales = Field(..., validation_alias="APP_POSIX_LOCALE")
     app_time_zone: SupportedTimeZones = Field(..., validation_alias="APP_TIME_ZONE")
-    app_mount_private_endpoints_authentication_middleware: bool = Field(..., validation_alias="APP_MOUNT_PRIVATE_ENDPOINTS_AUTHENTICATION_MIDDLEWARE")
     app_private_endpoints_api_key: str = Field(..., validation_alias="APP_PRIVATE_ENDPOINTS_API_KEY")
     app_mount_private_endpoints: bool = Field(..., validation_alias="APP_MOUNT_PRIVATE_ENDPOINTS")
 
@@ -62,6 +64,38 @@ class EnvProvider(BaseSettings):
     database_name: str = Field(..., validation_alias="DATABASE_NAME")
     database_user: str = Field(..., validation_alias="DATABASE_USER")
     database_port: int = Field(..., validation_alias="DATABASE_PORT")
+    database_pool_size: int = Field(default=10, validation_alias="DATABASE_POOL_SIZE")
+    database_max_overflow: int = Field(default=5, validation_alias="DATABASE_MAX_OVERFLOW")
+    database_pool_recycle: int = Field(default=1800, validation_alias="DATABASE_POOL_RECYCLE")
+    database_pool_timeout: int = Field(default=30, validation_alias="DATABASE_POOL_TIMEOUT")
+    database_pool_pre_ping_idle_seconds: float = Field(default=30.0, validation_alias="DATABASE_POOL_PRE_PING_IDLE_SECONDS")
+    database_max_workers: int = Field(default=15, validation_alias="DATABASE_MAX_WORKERS")
+    database_max_queue_depth: int = Field(default=100, validation_alias="DATABASE_MAX_QUEUE_DEPTH")
+
+    cache_default_ttl: float = Field(default=240, validation_alias="CACHE_DEFAULT_TTL")
+    cache_default_max_bytes: int = Field(default=1048576, validation_alias="CACHE_DEFAULT_MAX_BYTES")
+    cache_settings: dict[str, dict[str, float]] = Field(default_factory=dict, validation_alias="CACHE_SETTINGS")
+    cache_shared_url: str = Field(default="", validation_alias="CACHE_SHARED_URL")
+    cache_shared_namespace: str = Field(default="sar_core_ms", validation_alias="CACHE_SHARED_NAMESPACE")
+
+    parameter_catalog_refresh_seconds: float = Field(default=300, validation_alias="PARAMETER_CATALOG_REFRESH_SECONDS")
+
+    http_client_default_max_connections: int = Field(default=20, validation_alias="HTTP_CLIENT_DEFAULT_MAX_CONNECTIONS")
+    http_client_default_max_keepalive_connections: int = Field(default=10, validation_alias="HTTP_CLIENT_DEFAULT_MAX_KEEPALIVE_CONNECTIONS")
+    http_client_default_keepalive_expiry: float = Field(default=30, validation_alias="HTTP_CLIENT_DEFAULT_KEEPALIVE_EXPIRY")
+    http_client_default_http2: bool = Field(default=False, validation_alias="HTTP_CLIENT_DEFAULT_HTTP2")
+    http_client_settings: dict[str, dict[str, Any]] = Field(default_factory=dict, validation_alias="HTTP_CLIENT_SETTINGS")
+
+    circuit_breaker_default_failure_threshold: int = Field(default=5, validation_alias="CIRCUIT_BREAKER_DEFAULT_FAILURE_THRESHOLD")
+    circuit_breaker_default_reset_timeout: float = Field(default=30, validation_alias="CIRCUIT_BREAKER_DEFAULT_RESET_TIMEOUT")
+    circuit_breaker_default_half_open_max_calls: int = Field(default=1, validation_alias="CIRCUIT_BREAKER_DEFAULT_HALF_OPEN_MAX_CALLS")
+    circuit_breaker_settings: dict[str, dict[str, float]] = Field(default_factory=dict, validation_alias="CIRCUIT_BREAKER_SETTINGS")
 
     sar_warehouse_ms_base_url: HttpUrl = Field(..., validation_alias="SAR_WAREHOUSE_MS_BASE_URL")
     sar_brms_base_url: HttpUrl = Field(..., validation_alias="SAR_BRMS_BASE_URL")
+    sar_brms_batch_window_seconds: float = Field(default=0.005, validation_alias="SAR_BRMS_BATCH_WINDOW_SECONDS")
+    sar_brms_batch_max_size: int = Field(default=50, validation_alias="SAR_BRMS_BATCH_MAX_SIZE")
+    sar_brms_max_parallel_calls: int = Field(default=8, validation_alias="SAR_BRMS_MAX_PARALLEL_CALLS")
+    sar_brms_batch_route_retry_seconds: float = Field(default=300, validation_alias="SAR_BRMS_BATCH_ROUTE_RETRY_SECONDS")
+    sar_warehouse_ledger_reconcile_seconds: float = Field(default=5, validation_alias="SAR_WAREHOUSE_LEDGER_RECONCILE_SECONDS")
+    sar_warehouse_ledger_stuck_batch_seconds: float = Field(default=600, validation_alias="SAR_WAREHOUSE_LEDGER_STUCK_BATCH_SECONDS")
@@ -0,0 +1,50 @@
+# !/usr/bin/python3
+# type: ignore
+
+# ** info: python imports
+from hashlib import blake2b
+
+# ** info: typing imports
+from typing import Union
+from typing import Self
+from typing import Any
+
+# ** info: fastapi imports
+from fastapi import HTTPException
+from fastapi import Response
+from fastapi import status
+
+# ** info: sidecards.helpers imports
+from src.sidecard.system.helpers.singleton_helper import Singleton
+
+__all__: list[str] = ["EtagProvider"]
+
+# ** info: max number of etags remembered, every one of them keeps its data alive until it is replaced
+etag_memo_size: int = 64
+
+
+class EtagProvider(metaclass=Singleton):
+    # ** info: strong etags are hashes of the data a response is mapped from, so a match is answered before any mapping or serialization
+    def __init__(self: Self) -> None:
+        self._etags: dict[tuple[int, str], tuple[Any, str]] = dict()
+
+    def build_etag(self: Self, scope: str, data: Any) -> str:
+        # ** info: cached values are shared immutable objects, polling the same cached value reuses its etag instead of hashing it again
+        known_etag: Union[tuple[Any, str], None] = self._etags.get((id(data), scope))
+        if known_etag is not None and known_etag[0] is data:
+            return known_etag[1]
+        etag: str = f'"{blake2b(repr((scope, data)).encode("utf-8"), digest_size=16).hexdigest()}"'
+        if len(self._etags) >= etag_memo_size:
+            del self._etags[next(iter(self._etags))]
+        self._etags[(id(data), scope)] = (data, etag)
+        return etag
+
+    def check_etag(self: Self, etag: str, if_none_match: Union[str, None], response: Union[Response, None]) -> None:
+        if response is not None:
+            response.headers["ETag"] = etag
+        if if_none_match is None:
+            return
+        # ** info: if none match uses the weak comparison, a weak validator of the same data also matches
+        candidates: set[str] = {candidate.strip().removeprefix("W/") for candidate in if_none_match.split(",")}
+        if etag in candidates or "*" in candidates:
+            raise HTTPException(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
@@ -0,0 +1,281 @@
+# !/usr/bin/python3
+# type: ignore
+
+# ** info: python imports
+from collections.abc import MutableMapping
+from contextvars import ContextVar
+import functools
+import logging
+import asyncio
+import sys
+
+# ** info: typing imports
+from typing import Awaitable
+from typing import Callable
+from typing import Iterator
+from typing import Union
+from typing import Self
+from typing import Any
+
+# ** info: cachetools imports
+from cachetools import TTLCache
+from cachetools import Cache
+
+# ** info: sidecards.helpers imports
+from src.sidecard.system.helpers.singleton_helper import Singleton
+
+# ** info: sidecards.artifacts imports
+from src.sidecard.system.artifacts.env_provider import EnvProvider
+
+__all__: list[str] = ["CacheManager", "MeteredCache", "single_flight"]
+
+_missing: object = object()
+
+# ** info: cache and key of a load the current task got back after an invalidation, the store of the cached decorator right above is skipped
+_stale_load: ContextVar[Union[tuple["MeteredCache", Any], None]] = ContextVar("_stale_load", default=None)
+
+
+def estimate_size(value: Any) -> int:
+    # ** info: walks the cached value so the cache is bounded by the memory it holds instead of by its number of entries
+    size: int = 0
+    seen: set[int] = set()
+    pending: list[Any] = [value]
+    while pending:
+        item: Any = pending.pop()
+        if id(item) in seen:
+            continue
+        seen.add(id(item))
+        size += sys.getsizeof(item)
+        if isinstance(item, (str, bytes, int, float, bool)) or item is None:
+            continue
+        if isinstance(item, dict):
+            pending.extend(item.keys())
+            pending.extend(item.values())
+        elif isinstance(item, (list, tuple, set, frozenset)):
+            pending.extend(item)
+        elif hasattr(item, "__dict__"):
+            # ** info: the orm instance state is shared bookkeeping, not part of the cached data
+            pending.extend(attribute for name, attribute in vars(item).items() if not name.startswith("_sa_"))
+        elif hasattr(item, "__slots__"):
+            pending.extend(getattr(item, name) for name in item.__slots__ if hasattr(item, name))
+    return size
+
+
+class _CountingTTLCache(TTLCache):
+    def __init__(self: Self, maxsize: int, ttl: float, metrics: dict[str, int]) -> None:
+        super().__init__(maxsize=maxsize, ttl=ttl, getsizeof=estimate_size)
+        self._metrics: dict[str, int] = metrics
+        # ** info: store time of every entry in store order, the first one still cached is the oldest entry
+        self._stored_at: dict[Any, float] = dict()
+
+    def __setitem__(self: Self, key: Any, value: Any) -> None:
+        super().__setitem__(key, value)
+        self._stored_at.pop(key, None)
+        self._stored_at[key] = self.timer()
+
+    def __delitem__(self: Self, key: Any) -> None:
+        super().__delitem__(key)
+        self._stored_at.pop(key, None)
+
+    def popitem(self: Self) -> tuple[Any, Any]:
+        # ** info: only called by cachetools when the cache is full and needs room for a new value
+        self._metrics["evictions"] += 1
+        return super().popitem()
+
+    def expire(self: Self, time: Union[float, None] = None) -> None:
+        entries: int = Cache.__len__(self)
+        super().expire(time)
+        self._metrics["expirations"] += entries - Cache.__len__(self)
+        # ** info: the expired entries are the oldest ones, they are always at the front of the store times
+        while len(self._stored_at) > 0:
+            key: Any = next(iter(self._stored_at))
+            if Cache.__contains__(self, key) is True:
+                break
+            del self._stored_at[key]
+
+    def oldest_entry_age(self: Self) -> Union[float, None]:
+        self.expire()
+        if len(self._stored_at) == 0:
+            return None
+        return self.timer() - next(iter(self._stored_at.values()))
+
+
+class MeteredCache(MutableMapping):
+    # ** info: mapping handed to the cached decorators, the backing ttl cache can be swapped on reload without touching the decorated methods
+    def __init__(self: Self, name: str, ttl: float, max_bytes: int) -> None:
+        self._name: str = name
+        self._metrics: dict[str, int] = {"hits": 0, "misses": 0, "evictions": 0, "expirations": 0, "invalidations": 0, "coalesced": 0}
+        self._in_flight: dict[Any, tuple[int, asyncio.Task]] = dict()
+        self._generation: int = 0
+        self.configure(ttl=ttl, max_bytes=max_bytes)
+
+    def configure(self: Self, ttl: float, max_bytes: int) -> None:
+        self._ttl: float = ttl
+        self._max_bytes: int = max_bytes
+        self._cache: _CountingTTLCache = _CountingTTLCache(maxsize=max_bytes, ttl=ttl, metrics=self._metrics)
+        self.invalidate_in_flight()
+
+    @property
+    def name(self: Self) -> str:
+        return self._name
+
+    @property
+    def ttl(self: Self) -> float:
+        return self._ttl
+
+    @property
+    def generation(self: Self) -> int:
+        return self._generation
+
+    def __getitem__(self: Self, key: Any) -> Any:
+        try:
+            value: Any = self._cache[key]
+        except KeyError:
+            self._metrics["misses"] += 1
+            raise
+        self._metrics["hits"] += 1
+        return value
+
+    def __setitem__(self: Self, key: Any, value: Any) -> None:
+        stale_load: Union[tuple[MeteredCache, Any], None] = _stale_load.get()
+        if stale_load is not None and stale_load[0] is self and stale_load[1] == key:
+            _stale_load.set(None)
+            return
+        self._cache[key] = value
+
+    def __delitem__(self: Self, key: Any) -> None:
+        del self._cache[key]
+        self._metrics["invalidations"] += 1
+
+    def __contains__(self: Self, key: Any) -> bool:
+        return key in self._cache
+
+    def __iter__(self: Self) -> Iterator[Any]:
+        return iter(self._cache)
+
+    def __len__(self: Self) -> int:
+        return len(self._cache)
+
+    def get(self: Self, key: Any, default: Any = None) -> Any:
+        # ** info: peeking does not count as a hit or a miss, only the cached decorator lookups do
+        return self._cache.get(key, default)
+
+    def pop(self: Self, key: Any, default: Any = _missing) -> Any:
+        value: Any = self._cache.pop(key, _missing)
+        if value is _missing:
+            if default is _missing:
+                raise KeyError(key)
+            return default
+        self._metrics["invalidations"] += 1
+        return value
+
+    async def load_once(self: Self, key: Any, loader: Callable[[], Awaitable[Any]]) -> Any:
+        value, generation = await self._load_once(key=key, loader=loader)
+        # ** info: the value was read before an invalidation of this cache, it is returned to the callers but not stored
+        if generation != self._generation:
+            _stale_load.set((self, key))
+        return value
+
+    async def _load_once(self: Self, key: Any, loader: Callable[[], Awaitable[Any]]) -> tuple[Any, int]:
+        # ** info: concurrent misses on the same key share a single load instead of running the same query or call once per caller
+        in_flight: Union[tuple[int, asyncio.Task], None] = self._in_flight.get(key)
+        if in_flight is not None and in_flight[0] == self._generation:
+            self._metrics["coalesced"] += 1
+            return await asyncio.shield(in_flight[1]), in_flight[0]
+        # ** info: the load runs on its own task, a caller that gets cancelled does not cancel it for the callers still waiting
+        generation: int = self._generation
+        load: asyncio.Task = asyncio.ensure_future(loader())
+        load.add_done_callback(_retrieve_exception)
+        self._in_flight[key] = (generation, load)
+        try:
+            return await asyncio.shield(load), generation
+        finally:
+            # ** info: the caller storing the value is the one that forgets the load, so there is no gap between both steps for new callers
+            if self._in_flight.get(key, (None, None))[1] is load:
+                del self._in_flight[key]
+
+    def invalidate_in_flight(self: Self) -> None:
+        # ** info: loads started before an invalidation could read stale data, callers arriving after it start a fresh load instead of joining them
+        self._generation += 1
+
+    def clear(self: Self) -> None:
+        # ** info: a fresh backing cache instead of popping every entry, a flush is not counted as evictions
+        self.configure(ttl=self._ttl, max_bytes=self._max_bytes)
+
+    def obtain_metrics(self: Self) -> dict[str, float]:
+        lookups: int = self._metrics["hits"] + self._metrics["misses"]
+        return {
+            **self._metrics,
+            "hit_ratio": self._metrics["hits"] / lookups if lookups > 0 else None,
+            "in_flight": len(self._in_flight),
+            "entries": len(self._cache),
+            "bytes": self._cache.currsize,
+            "max_bytes": self._max_bytes,
+            "ttl": self._ttl,
+            "oldest_entry_age": self._cache.oldest_entry_age(),
+        }
+
+
+def single_flight(cache: MeteredCache, key: Callable[..., Any]) -> Callable:
+    # ** info: goes right below the cached decorator of the same cache, only the misses reach it
+    def decorator(method: Callable[..., Awaitable[Any]]) -> Callable[..., Awaitable[Any]]:
+        @functools.wraps(method)
+        async def wrapper(*args: Any, **kwargs: Any) -> Any:
+            return await cache.load_once(key=key(*args, **kwargs), loader=lambda: method(*args, **kwargs))
+
+        return wrapper
+
+    return decorator
+
+
+def _retrieve_exception(load: asyncio.Task) -> None:
+    # ** info: every caller of a failed load already gets its exception, this only keeps asyncio from logging it again when they were cancelled
+    if load.cancelled() is False:
+        load.exception()
+
+
+class CacheManager(metaclass=Singleton):
+    # ** info: one cache per provider method, named <provider>.<method>, so a method with big values can not push the others out
+    def __init__(self: Self) -> None:
+        self._env_provider: EnvProvider = EnvProvider()
+        self._caches: dict[str, MeteredCache] = dict()
+        self._defaults: dict[str, tuple[float, int]] = dict()
+
+    def obtain_cache(self: Self, name: str, ttl: Union[float, None] = None, max_bytes: Union[int, None] = None) -> MeteredCache:
+        if name not in self._caches:
+            self._defaults[name] = (ttl, max_bytes)
+            self._caches[name] = MeteredCache(name=name, **self._resolve_settings(name=name))
+        return self._caches[name]
+
+    def reload(self: Self) -> None:
+        # ** info: settings are read again from the environment, every cache starts empty with its new ttl and size
+        logging.warning("reloading cache settings")
+        self._env_provider = EnvProvider()
+        for name, cache in self._caches.items():
+            cache.configure(**self._resolve_settings(name=name))
+        logging.warning("cache settings reloaded")
+
+    def clear(self: Self, prefix: str = "") -> None:
+        for name, cache in self._caches.items():
+            if name.startswith(prefix):
+                cache.clear()
+
+    def flush(self: Self, name: str) -> Union[int, None]:
+        # ** info: empties a single cache and returns how many entries it held, none when there is no cache with that name
+        if name not in self._caches:
+            return None
+        entries: int = len(self._caches[name])
+        self._caches[name].clear()
+        logging.warning(f"cache {name} flushed with {entries} entries")
+        return entries
+
+    def obtain_metrics(self: Self) -> dict[str, dict[str, float]]:
+        return {name: cache.obtain_metrics() for name, cache in self._caches.items()}
+
+    def _resolve_settings(self: Self, name: str) -> dict[str, Any]:
+        default_ttl, default_max_bytes = self._defaults[name]
+        overrides: dict[str, Any] = self._env_provider.cache_settings.get(name, dict())
+        return {
+            "ttl": overrides.get("ttl", default_ttl if default_ttl is not None else self._env_provider.cache_default_ttl),
+            "max_bytes": int(overrides.get("max_bytes", default_max_bytes if default_max_bytes is not None else self._env_provider.cache_default_max_bytes)),
+        }
@@ -0,0 +1,280 @@
+# !/usr/bin/python3
+# type: ignore
+
+# ** info: python imports
+from collections import defaultdict
+from time import monotonic
+import functools
+import logging
+import asyncio
+import pickle
+import json
+
+# ** info: typing imports
+from typing import AsyncIterator
+from typing import Awaitable
+from typing import Callable
+from typing import Union
+from typing import Self
+from typing import Any
+
+# ** info: redis imports
+from redis.asyncio import Redis
+
+# ** info: sidecards.cache_managers imports
+from src.sidecard.system.cache_managers.cache_manager import MeteredCache
+
+# ** info: sidecards.helpers imports
+from src.sidecard.system.helpers.cache_key_helper import CacheKey
+from src.sidecard.system.helpers.singleton_helper import Singleton
+
+# ** info: sidecards.artifacts imports
+from src.sidecard.system.artifacts.env_provider import EnvProvider
+from src.sidecard.system.artifacts.uuid_provider import UuidProvider
+
+__all__: list[str] = ["SharedCacheManager", "InMemoryRedis"]
+
+# ** info: extra seconds a group version outlives the entries written under it, it only has to cover the longest load
+shared_cache_version_margin: int = 300
+
+# ** info: version of the groups that were never invalidated or whose version already expired
+shared_cache_initial_version: str = "0"
+
+
+class InMemoryRedis:
+    # ** info: process local stand in for the subset of the redis api used by the shared cache, selected with the memory:// url
+    def __init__(self: Self) -> None:
+        self._values: dict[str, bytes] = dict()
+        self._hashes: dict[str, dict[str, bytes]] = dict()
+        self._expirations: dict[str, float] = dict()
+        self._subscribers: dict[str, list[asyncio.Queue]] = defaultdict(list)
+
+    async def get(self: Self, name: str) -> Union[bytes, None]:
+        self._expire(name=name)
+        return self._values.get(name)
+
+    async def set(self: Self, name: str, value: str, ex: Union[int, None] = None) -> bool:
+        self._expirations.pop(name, None)
+        self._values[name] = value.encode("utf-8")
+        if ex is not None:
+            await self.expire(name=name, time=ex)
+        return True
+
+    async def hget(self: Self, name: str, key: str) -> Union[bytes, None]:
+        self._expire(name=name)
+        return self._hashes.get(name, dict()).get(key)
+
+    async def hset(self: Self, name: str, key: str, value: bytes) -> int:
+        self._expire(name=name)
+        self._hashes.setdefault(name, dict())[key] = value
+        return 1
+
+    async def expire(self: Self, name: str, time: int) -> bool:
+        self._expirations[name] = monotonic() + time
+        return name in self._hashes or name in self._values
+
+    async def delete(self: Self, *names: str) -> int:
+        deleted: int = 0
+        for name in names:
+            self._expirations.pop(name, None)
+            deleted += 0 if self._hashes.pop(name, None) is None and self._values.pop(name, None) is None else 1
+        return deleted
+
+    async def publish(self: Self, channel: str, message: str) -> int:
+        for queue in self._subscribers[channel]:
+            queue.put_nowait({"type": "message", "channel": channel, "data": message.encode("utf-8")})
+        return len(self._subscribers[channel])
+
+    def pubsub(self: Self) -> "InMemoryPubSub":
+        return InMemoryPubSub(redis=self)
+
+    async def aclose(self: Self) -> None:
+        self._values.clear()
+        self._hashes.clear()
+        self._expirations.clear()
+
+    def _expire(self: Self, name: str) -> None:
+        if name in self._expirations and self._expirations[name] <= monotonic():
+            self._expirations.pop(name)
+            self._values.pop(name, None)
+            self._hashes.pop(name, None)
+
+
+class InMemoryPubSub:
+    def __init__(self: Self, redis: InMemoryRedis) -> None:
+        self._redis: InMemoryRedis = redis
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._channels: list[str] = list()
+
+    async def subscribe(self: Self, *channels: str) -> None:
+        for channel in channels:
+            self._redis._subscribers[channel].append(self._queue)
+            self._channels.append(channel)
+
+    async def listen(self: Self) -> AsyncIterator[dict[str, Any]]:
+        while True:
+            yield await self._queue.get()
+
+    async def aclose(self: Self) -> None:
+        for channel in self._channels:
+            self._redis._subscribers[channel].remove(self._queue)
+        self._channels.clear()
+
+
+class SharedCacheManager(metaclass=Singleton):
+    # ** info: optional second cache tier shared by every worker, it sits behind the in process caches and it is turned off when no url is set
+    # ** info: values are pickled, the store must be private to the service
+    def __init__(self: Self) -> None:
+        self._env_provider: EnvProvider = EnvProvider()
+        self._uuid_provider: UuidProvider = UuidProvider()
+        self._origin: str = self._uuid_provider.get_str_uuid()
+        self._namespace: str = self._env_provider.cache_shared_namespace
+        self._channel: str = f"{self._namespace}:invalidations"
+        self._client: Union[Redis, InMemoryRedis, None] = self._build_client(url=self._env_provider.cache_shared_url)
+        self._handlers: dict[str, Callable[[dict[str, Any]], None]] = dict()
+        self._listener: Union[asyncio.Task, None] = None
+        self._metrics: dict[str, int] = {"hits": 0, "misses": 0, "errors": 0, "version_errors": 0, "publish_errors": 0, "published": 0, "received": 0}
+
+    @property
+    def enabled(self: Self) -> bool:
+        return self._client is not None
+
+    def cached(self: Self, cache: MeteredCache, key: CacheKey, group: str) -> Callable:
+        # ** info: goes right below the in process cache, the entries are grouped in one redis hash per value of the group argument so a write drops a whole group at once
+        # ** info: the hash is named after the group version read before the load, a load that overlaps an invalidation writes to a hash nobody reads anymore
+        def decorator(method: Callable[..., Awaitable[Any]]) -> Callable[..., Awaitable[Any]]:
+            @functools.wraps(method)
+            async def wrapper(*args: Any, **kwargs: Any) -> Any:
+                if self.enabled is False:
+                    return await method(*args, **kwargs)
+                cache_key: tuple[Any, ...] = key(*args, **kwargs)
+                group_name: str = self._group_name(cache=cache, group=key.argument(cache_key=cache_key, parameter=group))
+                version: Union[str, None] = await self._get_version(group_name=group_name)
+                if version is None:
+                    return await method(*args, **kwargs)
+                hash_name: str = self._hash_name(group_name=group_name, version=version)
+                found, value = await self._get(hash_name=hash_name, field=repr(cache_key))
+                if found is True:
+                    return value
+                value = await method(*args, **kwargs)
+                await self._set(hash_name=hash_name, field=repr(cache_key), value=value, ttl=cache.ttl)
+                return value
+
+            return wrapper
+
+        return decorator
+
+    def subscribe(self: Self, topic: str, handler: Callable[[dict[str, Any]], None]) -> None:
+        self._handlers[topic] = handler
+
+    async def invalidate(self: Self, topic: str, payload: dict[str, Any], groups: list[tuple[MeteredCache, Any]]) -> None:
+        # ** info: the writer drops the shared groups and tells every other worker to run the same local eviction
+        if self.enabled is False:
+            return
+        self._ensure_listener()
+        # ** info: every group and the publish are attempted on their own, one failure does not leave the others serving stale data
+        for cache, group in groups:
+            group_name: str = self._group_name(cache=cache, group=group)
+            try:
+                await self._bump_version(group_name=group_name, ttl=cache.ttl)
+            except Exception:
+                self._metrics["errors"] += 1
+                self._metrics["version_errors"] += 1
+                logging.exception(f"shared cache group {group_name} could not be invalidated")
+        try:
+            await self._client.publish(self._channel, json.dumps({"origin": self._origin, "topic": topic, "payload": payload}))
+            self._metrics["published"] += 1
+        except Exception:
+            self._metrics["errors"] += 1
+            self._metrics["publish_errors"] += 1
+            logging.exception(f"shared cache invalidation of {topic} could not be published")
+
+    def start(self: Self) -> None:
+        if self.enabled is True:
+            self._ensure_listener()
+
+    def obtain_metrics(self: Self) -> dict[str, Any]:
+        return {**self._metrics, "enabled": self.enabled, "listening": self._listener is not None and not self._listener.done()}
+
+    async def dispose(self: Self) -> None:
+        if self._listener is not None:
+            self._listener.cancel()
+            self._listener = None
+        if self._client is not None:
+            await self._client.aclose()
+
+    def _build_client(self: Self, url: str) -> Union[Redis, InMemoryRedis, None]:
+        if url == "":
+            return None
+        if url == "memory://":
+            return InMemoryRedis()
+        return Redis.from_url(url)
+
+    def _group_name(self: Self, cache: MeteredCache, group: Any) -> str:
+        return f"{self._namespace}:{cache.name}:{group}"
+
+    def _hash_name(self: Self, group_name: str, version: str) -> str:
+        return f"{group_name}:{version}"
+
+    async def _get_version(self: Self, group_name: str) -> Union[str, None]:
+        try:
+            raw_version: Union[bytes, None] = await self._client.get(f"{group_name}:version")
+        except Exception:
+            self._metrics["errors"] += 1
+            logging.exception(f"shared cache version read of {group_name} failed")
+            return None
+        return shared_cache_initial_version if raw_version is None else raw_version.decode("utf-8")
+
+    async def _bump_version(self: Self, group_name: str, ttl: float) -> None:
+        # ** info: every version is a new uuid, a hash written under a previous one is never read again and leaves on its own ttl
+        # ** info: the version outlives the entries written under the initial one, when it expires that hash is long gone
+        previous_version: Union[bytes, None] = await self._client.get(f"{group_name}:version")
+        await self._client.set(f"{group_name}:version", self._uuid_provider.get_str_uuid(), ex=int(ttl) + shared_cache_version_margin)
+        await self._client.delete(self._hash_name(group_name=group_name, version=shared_cache_initial_version if previous_version is None else previous_version.decode("utf-8")))
+
+    async def _get(self: Self, hash_name: str, field: str) -> tuple[bool, Any]:
+        self._ensure_listener()
+        try:
+            raw_value: Union[bytes, None] = await self._client.hget(hash_name, field)
+        except Exception:
+            # ** info: the shared tier is only an optimization, when it fails the value is read from the database
+            self._metrics["errors"] += 1
+            logging.exception(f"shared cache read of {hash_name} failed")
+            return False, None
+        if raw_value is None:
+            self._metrics["misses"] += 1
+            return False, None
+        self._metrics["hits"] += 1
+        return True, pickle.loads(raw_value)
+
+    async def _set(self: Self, hash_name: str, field: str, value: Any, ttl: float) -> None:
+        try:
+            await self._client.hset(hash_name, field, pickle.dumps(value))
+            await self._client.expire(hash_name, int(ttl))
+        except Exception:
+            self._metrics["errors"] += 1
+            logging.exception(f"shared cache write of {hash_name} failed")
+
+    def _ensure_listener(self: Self) -> None:
+        if self._listener is None or self._listener.done():
+            self._listener = asyncio.get_running_loop().create_task(self._listen())
+
+    async def _listen(self: Self) -> None:
+        pubsub: Any = self._client.pubsub()
+        try:
+            await pubsub.subscribe(self._channel)
+            async for message in pubsub.listen():
+                if message["type"] != "message":
+                    continue
+                invalidation: dict[str, Any] = json.loads(message["data"])
+                if invalidation["origin"] == self._origin or invalidation["topic"] not in self._handlers:
+                    continue
+                self._metrics["received"] += 1
+                self._handlers[invalidation["topic"]](invalidation["payload"])
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            self._metrics["errors"] += 1
+            logging.exception("shared cache invalidation listener stopped, it is going to be restarted on the next cache access")
+        finally:
+            await pubsub.aclose()
@@ -2,145 +2,313 @@
 # type: ignore
 
 # ** info: python imports
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from contextvars import Token
+from functools import wraps
+from time import monotonic
 import logging
-import gc
 
 # ** info: typing imports
+from typing import AsyncIterator
+from typing import Awaitable
+from typing import Callable
+from typing import Union
 from typing import Self
+from typing import Any
 
 # ** info: fastapi imports
 from fastapi import HTTPException
 from fastapi import status
 
 # **info: sqlalchemy imports
-from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from sqlalchemy.ext.asyncio import AsyncConnection
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.exc import DisconnectionError
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy import event
 from sqlalchemy import URL
 
 # ** info: sqlmodel imports
-from sqlmodel import create_engine
-from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
 
-# ** info: sidecards.artifacts imports
-from src.sidecard.system.artifacts.datetime_provider import DatetimeProvider
-from src.sidecard.system.artifacts.uuid_provider import UuidProvider
-from src.sidecard.system.artifacts.env_provider import EnvProvider
-
-__all__: list[str] = ["MySQLManager"]
+# ** info: stamina imports
+from stamina import retry
 
+# ** info: sidecards.helpers imports
+from src.sidecard.system.helpers.concurrency_limiter_helper import ConcurrencyLimiter
+from src.sidecard.system.helpers.singleton_helper import Singleton
 
-class MySQLManager:
-    instances: set = set()
-
-    def __init__(self: Self, password: str, database: str, username: str, drivername: str, host: str, port: int, query: dict) -> None:
-        self.env_provider: EnvProvider = EnvProvider()
-        self._uuid_provider: UuidProvider = UuidProvider()
-        self._url = URL(drivername=drivername, password=password, database=database, username=username, query=query, host=host, port=port)
-        self._date_time_provider: DatetimeProvider = DatetimeProvider()
-        self._engine = create_engine(url=self._url, echo=self.env_provider.database_logs)
-        self._connection_id: str = self._uuid_provider.get_str_uuid()
-        self._session = Session(bind=self._engine, autobegin=True, expire_on_commit=False, autoflush=False)
-        self._post_init()
+# ** info: sidecards.artifacts imports
+from src.sidecard.system.artifacts.env_provider import EnvProvider
 
-    def obtain_session(self: Self) -> Session:
-        logging.info("obtaining connection")
+__all__: list[str] = ["MySQLManager", "retry_outside_unit_of_work", "retry_unit_of_work"]
+
+# ** info: connection of the unit of work running on the current task, sessions opened inside it join its transaction
+unit_of_work_connection: ContextVar[Union[AsyncConnection, None]] = ContextVar("unit_of_work_connection", default=None)
+
+# ** info: work queued by the unit of work running on the current task, it runs once the transaction commits and is dropped if it rolls back
+unit_of_work_after_commit: ContextVar[Union[list[Callable[[], Awaitable[Any]]], None]] = ContextVar("unit_of_work_after_commit", default=None)
+
+# ** info: undo of the in memory state changed by the unit of work running on the current task, it runs if the transaction rolls back and is dropped if it commits
+unit_of_work_after_rollback: ContextVar[Union[list[Callable[[], Any]], None]] = ContextVar("unit_of_work_after_rollback", default=None)
+
+
+def retry_outside_unit_of_work(**retry_arguments: Any) -> Callable:
+    # ** info: mysql rolls the whole transaction back on a deadlock, retrying a single statement of a unit of work would commit it without the others
+    # ** info: inside a unit of work the statements run once and the whole unit of work is retried by the core that opened it
+    def decorator(function: Callable) -> Callable:
+        retried_function: Callable = retry(**retry_arguments)(function)
+
+        @wraps(function)
+        async def wrapper(*args: Any, **kwargs: Any) -> Any:
+            if unit_of_work_connection.get() is not None:
+                return await function(*args, **kwargs)
+            return await retried_function(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def retry_unit_of_work(function: Callable) -> Callable:
+    # ** info: for the core methods that open a unit of work, deadlocks and lock wait timeouts run the whole unit of work again on a new transaction
+    return retry_outside_unit_of_work(on=OperationalError, attempts=4, wait_initial=0.08, wait_exp_base=2)(function)
+
+
+class MySQLManager(metaclass=Singleton):
+    def __init__(self: Self) -> None:
+        self._env_provider: EnvProvider = EnvProvider()
+        self._url: URL = URL.create(
+            drivername=r"mysql+aiomysql",
+            password=self._env_provider.database_password,
+            database=self._env_provider.database_name,
+            username=self._env_provider.database_user,
+            host=self._env_provider.database_host,
+            port=self._env_provider.database_port,
+            query={"charset": "utf8"},
+        )
+        self._idle_threshold: float = self._env_provider.database_pool_pre_ping_idle_seconds
+        self._engine: AsyncEngine = None
+        self._session_factory: async_sessionmaker[AsyncSession] = None
+        self._revalidate_connections: bool = False
+        self._query_counters: dict[str, int] = {"statements": 0, "checkouts": 0, "pings": 0, "pings_skipped": 0, "disconnects": 0, "restarts": 0}
+        self._limiter: ConcurrencyLimiter = ConcurrencyLimiter(
+            name="database", max_workers=self._env_provider.database_max_workers, max_queue_depth=self._env_provider.database_max_queue_depth
+        )
+        self._start_engine()
+
+    @asynccontextmanager
+    async def obtain_session(self: Self) -> AsyncIterator[AsyncSession]:
+        logging.debug("obtaining session")
+
+        # ** info: inside a unit of work the session joins the already open transaction, its commits are deferred to the unit of work end
+        connection: Union[AsyncConnection, None] = unit_of_work_connection.get()
+        if connection is not None:
+            session: AsyncSession = self._session_factory(bind=connection)
+            try:
+                yield session
+            finally:
+                await session.close()
+            return
 
-        if self._session is not None and self._session.is_active is True:
-            self._session.close()
+        # ** info: units of work are admitted through a bounded limiter so a burst waits in a short queue instead of piling up on the pool
+        async with self._limiter.admit():
+            if self._engine is None:
+                self._start_engine()
 
-        self._check_session_health()
+            # ** info: every unit of work gets its own short lived session, the connection goes back to the shared pool on close
+            engine: AsyncEngine = self._engine
+            session: AsyncSession = self._session_factory()
 
-        if self._session is not None and self._session.is_active is False:
-            self._session.begin()
+            logging.debug(f"session obtained, pool status: {engine.pool.status()}")
 
-        logging.info("connection obtained")
+            try:
+                yield session
 
-        instances_count: int = MySQLManager.instances.__len__()
-        logging.debug(f"mysql instances count: {instances_count}")
+            except DBAPIError as error:
+                await self._handle_lost_connection(error=error, engine=engine)
+                raise
 
-        return self._session
+            finally:
+                await session.close()
+                logging.debug("session closed")
 
-    def _check_session_health(self: Self) -> None:
-        if self._test_qeury() is True:
-            logging.info(f"connection {self._connection_id} is healthy")
+    @asynccontextmanager
+    async def unit_of_work(self: Self) -> AsyncIterator[None]:
+        # ** info: nested units of work are flattened into the outer one
+        if unit_of_work_connection.get() is not None:
+            yield
             return
 
-        if self._connection_id is None:
-            logging.error(r"connection not established trying to stablish a new one")
-        else:
-            logging.error(f"connection {self._connection_id} is unhealthy")
-
-        self._restart_session()
-
-        if self._test_qeury() is True:
-            logging.info(f"connection {self._connection_id} is healthy")
+        logging.debug("starting unit of work")
+
+        async with self._limiter.admit():
+            if self._engine is None:
+                self._start_engine()
+
+            engine: AsyncEngine = self._engine
+            after_commit: list[Callable[[], Awaitable[Any]]] = list()
+            after_rollback: list[Callable[[], Any]] = list()
+
+            try:
+                async with engine.connect() as connection:
+                    async with connection.begin():
+                        token: Token = unit_of_work_connection.set(connection)
+                        after_commit_token: Token = unit_of_work_after_commit.set(after_commit)
+                        after_rollback_token: Token = unit_of_work_after_rollback.set(after_rollback)
+                        try:
+                            yield
+                        finally:
+                            unit_of_work_after_rollback.reset(after_rollback_token)
+                            unit_of_work_after_commit.reset(after_commit_token)
+                            unit_of_work_connection.reset(token)
+
+            except BaseException as error:
+                self._run_after_rollback(after_rollback=after_rollback)
+                if isinstance(error, DBAPIError):
+                    await self._handle_lost_connection(error=error, engine=engine)
+                raise
+
+        logging.debug("unit of work committed")
+
+        # ** info: the transaction is already committed, a failed callback is logged instead of turning the request into an error
+        for callback in after_commit:
+            try:
+                await callback()
+            except Exception:
+                logging.exception("after commit callback of a unit of work failed")
+
+    async def run_after_commit(self: Self, callback: Callable[[], Awaitable[Any]]) -> None:
+        # ** info: the cache invalidations of the writes go through here, inside a unit of work they would publish rows that can still roll back
+        after_commit: Union[list[Callable[[], Awaitable[Any]]], None] = unit_of_work_after_commit.get()
+        if after_commit is None:
+            await callback()
             return
+        after_commit.append(callback)
 
-        logging.error("connection is still unhealthy after restart")
-        logging.error("shutting down connection")
-        self._end_session_and_engine()
-        logging.error("connection shuted down")
-        logging.error("a new attempt to restart the connection is going to be executed on the next database request")
-        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE)
+    def run_after_rollback(self: Self, callback: Callable[[], Any]) -> None:
+        # ** info: outside a unit of work the statements are already committed and there is nothing to undo
+        after_rollback: Union[list[Callable[[], Any]], None] = unit_of_work_after_rollback.get()
+        if after_rollback is not None:
+            after_rollback.append(callback)
 
-    def _test_qeury(self: Self) -> bool:
-        if self._connection_id is None:
-            return False
-
-        try:
-            self._session.exec(text(r"select 1"))
-            return True
+    def obtain_query_counters(self: Self) -> dict[str, int]:
+        return dict(self._query_counters)
 
-        except Exception:
-            logging.error("connection test query failed")
-            return False
+    def obtain_limiter_metrics(self: Self) -> dict[str, float]:
+        return self._limiter.obtain_metrics()
 
-    def _restart_session(self: Self) -> None:
-        logging.warning("restarting connection")
-        self._end_session_and_engine()
-        self._start_session_and_engine()
-        logging.warning("connection restarted")
+    def obtain_pool_status(self: Self) -> dict[str, int]:
+        # ** info: the time waited for a connection shows on the limiter queue wait, the limiter sits in front of the pool and is sized like it
+        if self._engine is None:
+            return {"size": 0, "checked_in": 0, "checked_out": 0, "overflow": 0, "max_overflow": self._env_provider.database_max_overflow}
+        pool: Any = self._engine.pool
+        return {
+            "size": pool.size(),
+            "checked_in": pool.checkedin(),
+            "checked_out": pool.checkedout(),
+            "overflow": max(pool.overflow(), 0),
+            "max_overflow": self._env_provider.database_max_overflow,
+        }
+
+    async def dispose(self: Self) -> None:
+        if self._engine is None:
+            return
 
-    def _end_session_and_engine(self: Self) -> None:
-        if self._connection_id is None:
+        logging.warning("disposing database engine")
+        await self._engine.dispose()
+        self._engine = None
+        self._session_factory = None
+        logging.warning("database engine disposed")
+
+    def _run_after_rollback(self: Self, after_rollback: list[Callable[[], Any]]) -> None:
+        # ** info: the callbacks only undo in memory state, they run without awaiting so a cancelled unit of work still runs all of them
+        for callback in after_rollback:
+            try:
+                callback()
+            except Exception:
+                logging.exception("after rollback callback of a unit of work failed")
+
+    async def _handle_lost_connection(self: Self, error: DBAPIError, engine: AsyncEngine) -> None:
+        if error.connection_invalidated is False:
             return
+        logging.error("database connection lost while running a unit of work")
+        await self._restart_engine(engine=engine)
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE) from error
 
-        logging.warning(f"ending connection {self._connection_id}")
+    async def _restart_engine(self: Self, engine: AsyncEngine) -> None:
+        # ** info: concurrent failures on the same engine must trigger a single restart
+        if engine is not self._engine:
+            return
 
-        if self._session is not None:
-            self._session.close()
-            del self._session
-            gc.collect()
-            self._session = None
+        logging.warning("restarting engine")
+        self._query_counters["restarts"] += 1
+        await self.dispose()
+        self._start_engine()
+        logging.warning("engine restarted")
 
+    def _start_engine(self: Self) -> None:
         if self._engine is not None:
-            self._engine.dispose()
-            del self._engine
-            gc.collect()
-            self._engine = None
-
-        if self._connection_id is not None:
-            MySQLManager.instances.remove(self._connection_id)
-            self._connection_id = None
-
-        logging.warning("connection ended")
+            return
 
-    def _start_session_and_engine(self: Self) -> None:
-        if self._connection_id is not None:
+        logging.warning("starting new engine")
+
+        self._engine = create_async_engine(
+            url=self._url,
+            echo=self._env_provider.database_logs,
+            pool_size=self._env_provider.database_pool_size,
+            max_overflow=self._env_provider.database_max_overflow,
+            pool_recycle=self._env_provider.database_pool_recycle,
+            pool_timeout=self._env_provider.database_pool_timeout,
+        )
+        self._session_factory = async_sessionmaker(bind=self._engine, class_=AsyncSession, autobegin=True, expire_on_commit=False, autoflush=False)
+        self._register_engine_events()
+
+        logging.warning("new engine started")
+
+    # !------------------------------------------------------------------------
+    # ! info: pool and engine events
+    # !------------------------------------------------------------------------
+
+    def _register_engine_events(self: Self) -> None:
+        event.listen(self._engine.sync_engine.pool, "checkout", self._on_checkout)
+        event.listen(self._engine.sync_engine.pool, "checkin", self._on_checkin)
+        event.listen(self._engine.sync_engine, "handle_error", self._on_handle_error)
+        event.listen(self._engine.sync_engine, "before_cursor_execute", self._on_before_cursor_execute)
+
+    def _on_checkout(self: Self, dbapi_connection: Any, connection_record: Any, connection_proxy: Any) -> None:
+        self._query_counters["checkouts"] += 1
+        last_checkin: float = connection_record.info.get("last_checkin")
+        idle_for: float = 0.0 if last_checkin is None else monotonic() - last_checkin
+
+        # ** info: fresh connections and recently used ones are trusted, only long idle connections or a previous driver error pay a ping
+        if self._revalidate_connections is False and idle_for <= self._idle_threshold:
+            self._query_counters["pings_skipped"] += 1
             return
 
-        logging.warning("starting new connection")
+        self._query_counters["pings"] += 1
+        try:
+            self._engine.dialect.do_ping(dbapi_connection)
+        except Exception as error:
+            logging.warning(f"connection ping failed after {idle_for:.2f} seconds idle, the pool will replace it")
+            raise DisconnectionError() from error
 
-        if self._connection_id is None:
-            self._connection_id = self._uuid_provider.get_str_uuid()
-            MySQLManager.instances.add(self._connection_id)
+        self._revalidate_connections = False
 
-        if self._engine is None:
-            self._engine = create_engine(self._url, echo=self.env_provider.database_logs)
+    def _on_checkin(self: Self, dbapi_connection: Any, connection_record: Any) -> None:
+        connection_record.info["last_checkin"] = monotonic()
 
-        if self._session is None:
-            self._session = Session(bind=self._engine)
+    def _on_handle_error(self: Self, exception_context: Any) -> None:
+        if exception_context.is_disconnect is False:
+            return
 
-        logging.warning(f"new connection {self._connection_id} started")
+        logging.error("database driver reported a disconnect, next checkouts are going to be revalidated")
+        self._query_counters["disconnects"] += 1
+        self._revalidate_connections = True
 
-    def _post_init(self: Self) -> None:
-        MySQLManager.instances.add(self._connection_id)
+    def _on_before_cursor_execute(self: Self, connection: Any, cursor: Any, statement: str, parameters: Any, context: Any, executemany: bool) -> None:
+        self._query_counters["statements"] += 1
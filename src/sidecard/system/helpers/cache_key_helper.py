@@ -0,0 +1,56 @@
+# !/usr/bin/python3
+# type: ignore
+
+# ** info: typing imports
+from typing import Callable
+from typing import Self
+from typing import Any
+
+# ** info: sidecards.cache_managers imports
+from src.sidecard.system.cache_managers.cache_manager import MeteredCache
+
+__all__: list[str] = ["CacheKey"]
+
+_missing: object = object()
+
+
+class CacheKey:
+    # ** info: builds the cache keys of one provider method from its arguments, the provider instance is left out so every instance shares the entries
+    def __init__(self: Self, method: str, *parameters: str) -> None:
+        self._method: str = method
+        self._parameters: tuple[str, ...] = parameters
+
+    def __call__(self: Self, provider: Any, *args: Any, **kwargs: Any) -> tuple[Any, ...]:
+        arguments: dict[str, Any] = dict(zip(self._parameters, args))
+        arguments.update(kwargs)
+        return (self._method, *(arguments.get(parameter) for parameter in self._parameters))
+
+    def argument(self: Self, cache_key: tuple[Any, ...], parameter: str) -> Any:
+        return cache_key[self._parameters.index(parameter) + 1]
+
+    def evict(self: Self, cache: MeteredCache, **arguments: Any) -> int:
+        # ** info: an entry is evicted when every given argument matches, the missing ones match anything
+        cache.invalidate_in_flight()
+        if arguments.keys() == set(self._parameters):
+            key: tuple[Any, ...] = self(None, **arguments)
+            if key not in cache:
+                return 0
+            cache.pop(key, None)
+            return 1
+        return self.evict_where(cache=cache, predicate=lambda entry_arguments, _: all(entry_arguments[name] == value for name, value in arguments.items()))
+
+    def evict_where(self: Self, cache: MeteredCache, predicate: Callable[[dict[str, Any], Any], bool]) -> int:
+        # ** info: the predicate receives the arguments of the cached call and its cached value
+        cache.invalidate_in_flight()
+        evicted: int = 0
+        for key in list(cache.keys()):
+            if key[0] != self._method:
+                continue
+            # ** info: the entry could have expired while scanning, in that case there is nothing left to evict
+            value: Any = cache.get(key, _missing)
+            if value is _missing:
+                continue
+            if predicate(dict(zip(self._parameters, key[1:])), value):
+                cache.pop(key, None)
+                evicted += 1
+        return evicted
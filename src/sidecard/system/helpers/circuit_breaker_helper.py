@@ -0,0 +1,136 @@
+# !/usr/bin/python3
+# type: ignore
+
+# ** info: python imports
+from time import monotonic
+import functools
+import logging
+
+# ** info: typing imports
+from typing import Awaitable
+from typing import Callable
+from typing import Self
+from typing import Any
+
+# ** info: fastapi imports
+from fastapi import HTTPException
+from fastapi import status
+
+__all__: list[str] = ["CircuitBreaker", "CircuitOpenError"]
+
+
+class CircuitOpenError(Exception):
+    # ** info: it is not an http exception on purpose, the retry decorators of the adapters only retry http exceptions so a rejected attempt ends the retries
+    def __init__(self: Self, name: str, retry_in: float) -> None:
+        super().__init__(f"{name} circuit is open")
+        self.name: str = name
+        self.retry_in: float = retry_in
+
+
+class CircuitBreaker:
+    # ** info: after a run of consecutive upstream failures the circuit opens and every call fails fast, once the reset timeout passes
+    # ** info: a few probe calls are let through half open, the first one to succeed closes the circuit and the first one to fail opens it again
+    def __init__(self: Self, name: str, failure_threshold: int, reset_timeout: float, half_open_max_calls: int) -> None:
+        self._name: str = name
+        self._failure_threshold: int = failure_threshold
+        self._reset_timeout: float = reset_timeout
+        self._half_open_max_calls: int = half_open_max_calls
+        self._state: str = "closed"
+        self._opened_at: float = 0.0
+        self._consecutive_failures: int = 0
+        self._probes: int = 0
+        self._metrics: dict[str, int] = {"successes": 0, "failures": 0, "rejected": 0, "opened": 0}
+
+    @property
+    def state(self: Self) -> str:
+        if self._state == "open" and monotonic() - self._opened_at >= self._reset_timeout:
+            return "half_open"
+        return self._state
+
+    def guard(self: Self, function: Callable[..., Awaitable[Any]]) -> Callable[..., Awaitable[Any]]:
+        # ** info: wraps a single attempt, it goes below the retry decorator so every failed attempt counts and an open circuit stops the retries
+        @functools.wraps(function)
+        async def wrapper(*args: Any, **kwargs: Any) -> Any:
+            probe: bool = self._admit()
+            try:
+                result: Any = await function(*args, **kwargs)
+            except HTTPException as error:
+                # ** info: an answer below 500 means the upstream is up, only the unavailability and server side errors count as failures
+                if error.status_code >= status.HTTP_500_INTERNAL_SERVER_ERROR:
+                    self._record_failure(probe=probe)
+                else:
+                    self._record_success(probe=probe)
+                raise
+            except Exception:
+                self._record_failure(probe=probe)
+                raise
+            except BaseException:
+                # ** info: a cancelled caller says nothing about the upstream health, it is not a failure and a probe gives its slot back
+                self._release_probe(probe=probe)
+                raise
+            self._record_success(probe=probe)
+            return result
+
+        return wrapper
+
+    def fail_fast(self: Self, function: Callable[..., Awaitable[Any]]) -> Callable[..., Awaitable[Any]]:
+        # ** info: goes above the retry decorator and turns the rejected attempts into the 503 answered to the callers
+        @functools.wraps(function)
+        async def wrapper(*args: Any, **kwargs: Any) -> Any:
+            try:
+                return await function(*args, **kwargs)
+            except CircuitOpenError as error:
+                raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, headers={"Retry-After": str(max(int(error.retry_in), 1))}) from error
+
+        return wrapper
+
+    def obtain_metrics(self: Self) -> dict[str, Any]:
+        state: str = self.state
+        return {
+            **self._metrics,
+            "state": state,
+            "consecutive_failures": self._consecutive_failures,
+            "failure_threshold": self._failure_threshold,
+            "reset_timeout": self._reset_timeout,
+            "retry_in": max(self._reset_timeout - (monotonic() - self._opened_at), 0.0) if state == "open" else 0.0,
+        }
+
+    def _admit(self: Self) -> bool:
+        state: str = self.state
+        if state == "closed":
+            return False
+        if state == "half_open" and self._probes < self._half_open_max_calls:
+            if self._state != "half_open":
+                logging.warning(f"{self._name} circuit half open, probing the upstream")
+            self._state = "half_open"
+            self._probes += 1
+            return True
+        self._metrics["rejected"] += 1
+        raise CircuitOpenError(name=self._name, retry_in=max(self._reset_timeout - (monotonic() - self._opened_at), 0.0))
+
+    def _record_success(self: Self, probe: bool) -> None:
+        self._metrics["successes"] += 1
+        self._consecutive_failures = 0
+        if probe is True and self._state == "half_open":
+            logging.warning(f"{self._name} circuit closed, the upstream answered the probe")
+            self._state = "closed"
+            self._probes = 0
+
+    def _record_failure(self: Self, probe: bool) -> None:
+        self._metrics["failures"] += 1
+        self._consecutive_failures += 1
+        if probe is True and self._state == "half_open":
+            self._open(reason="the probe failed")
+        elif self._state == "closed" and self._consecutive_failures >= self._failure_threshold:
+            self._open(reason=f"{self._consecutive_failures} consecutive failures")
+
+    def _release_probe(self: Self, probe: bool) -> None:
+        if probe is True and self._state == "half_open":
+            self._probes = max(self._probes - 1, 0)
+
+    def _open(self: Self, reason: str) -> None:
+        logging.error(f"{self._name} circuit open after {reason}, failing fast for {self._reset_timeout} seconds")
+        self._metrics["opened"] += 1
+        self._state = "open"
+        self._opened_at = monotonic()
+        self._probes = 0
@@ -0,0 +1,24 @@
+# !/usr/bin/python3
+# type: ignore
+
+# ** info: typing imports
+from typing import Self
+
+# ** info: starlette imports
+from starlette.types import Receive
+from starlette.types import Scope
+from starlette.types import Send
+
+# ** info: fastapi imports
+from fastapi.responses import StreamingResponse
+
+__all__: list[str] = ["ClosingStreamingResponse"]
+
+
+class ClosingStreamingResponse(StreamingResponse):
+    # ** info: a client that disconnects cancels the response while the body generator is suspended, it is closed here instead of waiting for the garbage collector
+    async def __call__(self: Self, scope: Scope, receive: Receive, send: Send) -> None:
+        try:
+            await super().__call__(scope, receive, send)
+        finally:
+            await self.body_iterator.aclose()
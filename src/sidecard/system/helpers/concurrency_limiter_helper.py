@@ -0,0 +1,79 @@
+# !/usr/bin/python3
+# type: ignore
+
+# ** info: python imports
+from contextlib import asynccontextmanager
+from time import perf_counter
+import asyncio
+import logging
+
+# ** info: typing imports
+from typing import AsyncIterator
+from typing import Self
+
+# ** info: fastapi imports
+from fastapi import HTTPException
+from fastapi import status
+
+__all__: list[str] = ["ConcurrencyLimiter"]
+
+
+class ConcurrencyLimiter:
+    def __init__(self: Self, name: str, max_workers: int, max_queue_depth: int) -> None:
+        self._name: str = name
+        self._max_workers: int = max_workers
+        self._max_queue_depth: int = max_queue_depth
+        self._semaphore: asyncio.Semaphore = asyncio.Semaphore(max_workers)
+        self._queued: int = 0
+        self._running: int = 0
+        self._metrics: dict[str, float] = {
+            "admitted": 0,
+            "rejected": 0,
+            "completed": 0,
+            "failed": 0,
+            "queue_wait_total_seconds": 0.0,
+            "queue_wait_max_seconds": 0.0,
+            "run_time_total_seconds": 0.0,
+            "run_time_max_seconds": 0.0,
+        }
+
+    @asynccontextmanager
+    async def admit(self: Self) -> AsyncIterator[None]:
+        # ** info: fail fast instead of letting the backlog grow without limit when every worker slot is taken
+        if self._semaphore.locked() is True and self._queued >= self._max_queue_depth:
+            self._metrics["rejected"] += 1
+            logging.error(f"{self._name} limiter queue is full, {self._queued} waiting and {self._running} running")
+            raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE)
+
+        queued_at: float = perf_counter()
+        self._queued += 1
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self._queued -= 1
+
+        started_at: float = perf_counter()
+        self._record_time(metric="queue_wait", seconds=started_at - queued_at)
+        self._metrics["admitted"] += 1
+        self._running += 1
+
+        try:
+            yield
+            self._metrics["completed"] += 1
+
+        except BaseException:
+            self._metrics["failed"] += 1
+            raise
+
+        finally:
+            self._running -= 1
+            self._semaphore.release()
+            self._record_time(metric="run_time", seconds=perf_counter() - started_at)
+
+    def obtain_metrics(self: Self) -> dict[str, float]:
+        return {**self._metrics, "max_workers": self._max_workers, "max_queue_depth": self._max_queue_depth, "queued": self._queued, "running": self._running}
+
+    def _record_time(self: Self, metric: str, seconds: float) -> None:
+        self._metrics[f"{metric}_total_seconds"] += seconds
+        if seconds > self._metrics[f"{metric}_max_seconds"]:
+            self._metrics[f"{metric}_max_seconds"] = seconds
@@ -0,0 +1,87 @@
+# !/usr/bin/python3
+# type: ignore
+
+# ** info: python imports
+import asyncio
+import logging
+
+# ** info: typing imports
+from typing import Awaitable
+from typing import Callable
+from typing import Hashable
+from typing import Union
+from typing import Self
+from typing import Any
+
+__all__: list[str] = ["MicroBatcher"]
+
+
+class MicroBatcher:
+    # ** info: coalesces the items submitted during a short window into a single call of the batch handler, every caller gets back the result of its own item
+    def __init__(self: Self, name: str, window: float, max_size: int) -> None:
+        self._name: str = name
+        self._window: float = window
+        self._max_size: int = max_size
+        self._pending: dict[Hashable, asyncio.Future] = dict()
+        self._handler: Union[Callable[[list[Hashable]], Awaitable[list[Any]]], None] = None
+        self._flush_handle: Union[asyncio.TimerHandle, None] = None
+        self._running: set[asyncio.Task] = set()
+        self._metrics: dict[str, int] = {"submitted": 0, "coalesced": 0, "batches": 0, "largest_batch": 0}
+
+    async def submit(self: Self, item: Hashable, handler: Callable[[list[Hashable]], Awaitable[list[Any]]]) -> Any:
+        # ** info: the handler of the submission opening a window runs the whole batch, every submitter must pass an equivalent one
+        future: Union[asyncio.Future, None] = self._pending.get(item)
+        if future is not None:
+            self._metrics["coalesced"] += 1
+        else:
+            future = asyncio.get_running_loop().create_future()
+            self._pending[item] = future
+            self._metrics["submitted"] += 1
+            if self._handler is None:
+                self._handler = handler
+            if len(self._pending) >= self._max_size:
+                self._flush()
+            elif self._flush_handle is None:
+                self._flush_handle = asyncio.get_running_loop().call_later(self._window, self._flush)
+        # ** info: a cancelled caller must not cancel the result the rest of the batch is waiting for
+        return await asyncio.shield(future)
+
+    def obtain_metrics(self: Self) -> dict[str, int]:
+        return {**self._metrics, "pending": len(self._pending), "running": len(self._running)}
+
+    def _flush(self: Self) -> None:
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        batch: dict[Hashable, asyncio.Future] = self._pending
+        handler: Callable[[list[Hashable]], Awaitable[list[Any]]] = self._handler
+        self._pending = dict()
+        self._handler = None
+        self._metrics["batches"] += 1
+        self._metrics["largest_batch"] = max(self._metrics["largest_batch"], len(batch))
+        task: asyncio.Task = asyncio.get_running_loop().create_task(self._run(batch=batch, handler=handler))
+        self._running.add(task)
+        task.add_done_callback(self._running.discard)
+
+    async def _run(self: Self, batch: dict[Hashable, asyncio.Future], handler: Callable[[list[Hashable]], Awaitable[list[Any]]]) -> None:
+        logging.debug(f"{self._name} batcher running a batch of {len(batch)} items")
+        try:
+            results: list[Any] = await handler(list(batch.keys()))
+            if len(results) != len(batch):
+                raise ValueError(f"{self._name} batch handler returned {len(results)} results for {len(batch)} items")
+        except Exception as error:
+            for future in batch.values():
+                if future.done() is False:
+                    future.set_exception(error)
+                    # ** info: marks the error as retrieved, the callers that were cancelled while waiting would make asyncio log it otherwise
+                    future.exception()
+            return
+        # ** info: a handler can answer an item with an exception, only the callers of that item get it
+        for future, result in zip(batch.values(), results):
+            if future.done() is True:
+                continue
+            if isinstance(result, BaseException):
+                future.set_exception(result)
+                future.exception()
+            else:
+                future.set_result(result)
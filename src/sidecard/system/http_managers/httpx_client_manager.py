@@ -0,0 +1,137 @@
+# !/usr/bin/python3
+# type: ignore
+
+# ** info: python imports
+from importlib.util import find_spec
+from collections import defaultdict
+import logging
+
+# ** info: typing imports
+from typing import Self
+from typing import Any
+
+# ** info: httpx imports
+import httpx
+
+# ** info: sidecards.helpers imports
+from src.sidecard.system.helpers.circuit_breaker_helper import CircuitBreaker
+from src.sidecard.system.helpers.singleton_helper import Singleton
+
+# ** info: sidecards.artifacts imports
+from src.sidecard.system.artifacts.env_provider import EnvProvider
+
+__all__: list[str] = ["HttpxClientManager"]
+
+# ** info: upstreams whose clients are opened on start, any other name gets its client on first use
+http_upstreams: tuple[str, ...] = ("brms", "warehouse_ms")
+
+
+class HttpxClientManager(metaclass=Singleton):
+    # ** info: owns one long lived client per upstream, every service instance shares its connection pool so the keep alive connections are reused
+    def __init__(self: Self) -> None:
+        self._env_provider: EnvProvider = EnvProvider()
+        self._clients: dict[str, httpx.AsyncClient] = dict()
+        self._settings: dict[str, dict[str, Any]] = dict()
+        self._counters: dict[str, dict[str, int]] = defaultdict(lambda: {"requests": 0, "connections_opened": 0})
+        self._breakers: dict[str, CircuitBreaker] = dict()
+
+    def start(self: Self) -> None:
+        for name in http_upstreams:
+            self.obtain_client(name=name)
+
+    def obtain_client(self: Self, name: str) -> httpx.AsyncClient:
+        client: httpx.AsyncClient = self._clients.get(name)
+        if client is None or client.is_closed is True:
+            client = self._build_client(name=name)
+            self._clients[name] = client
+        return client
+
+    def obtain_breaker(self: Self, name: str) -> CircuitBreaker:
+        # ** info: the breaker of an upstream outlives its clients, a restarted client does not reset what is known about the upstream health
+        if name not in self._breakers:
+            overrides: dict[str, Any] = self._env_provider.circuit_breaker_settings.get(name, dict())
+            self._breakers[name] = CircuitBreaker(
+                name=name,
+                failure_threshold=int(overrides.get("failure_threshold", self._env_provider.circuit_breaker_default_failure_threshold)),
+                reset_timeout=float(overrides.get("reset_timeout", self._env_provider.circuit_breaker_default_reset_timeout)),
+                half_open_max_calls=int(overrides.get("half_open_max_calls", self._env_provider.circuit_breaker_default_half_open_max_calls)),
+            )
+        return self._breakers[name]
+
+    async def dispose(self: Self) -> None:
+        if len(self._clients) == 0:
+            return
+
+        logging.warning("closing http clients")
+        clients: list[httpx.AsyncClient] = list(self._clients.values())
+        self._clients.clear()
+        for client in clients:
+            await client.aclose()
+        logging.warning("http clients closed")
+
+    def obtain_metrics(self: Self) -> dict[str, dict[str, Any]]:
+        return {name: self._obtain_upstream_metrics(name=name, client=client) for name, client in self._clients.items()}
+
+    def obtain_breakers_metrics(self: Self) -> dict[str, dict[str, Any]]:
+        return {name: breaker.obtain_metrics() for name, breaker in self._breakers.items()}
+
+    def _build_client(self: Self, name: str) -> httpx.AsyncClient:
+        settings: dict[str, Any] = self._resolve_settings(name=name)
+        logging.warning(f"opening http client for {name} with {settings}")
+        self._settings[name] = settings
+        limits: httpx.Limits = httpx.Limits(
+            max_connections=settings["max_connections"], max_keepalive_connections=settings["max_keepalive_connections"], keepalive_expiry=settings["keepalive_expiry"]
+        )
+        return httpx.AsyncClient(limits=limits, http2=settings["http2"], event_hooks={"request": [self._build_request_hook(name=name)]})
+
+    def _resolve_settings(self: Self, name: str) -> dict[str, Any]:
+        overrides: dict[str, Any] = self._env_provider.http_client_settings.get(name, dict())
+        settings: dict[str, Any] = {
+            "max_connections": int(overrides.get("max_connections", self._env_provider.http_client_default_max_connections)),
+            "max_keepalive_connections": int(overrides.get("max_keepalive_connections", self._env_provider.http_client_default_max_keepalive_connections)),
+            "keepalive_expiry": float(overrides.get("keepalive_expiry", self._env_provider.http_client_default_keepalive_expiry)),
+            "http2": bool(overrides.get("http2", self._env_provider.http_client_default_http2)),
+        }
+        # ** info: http2 needs the optional h2 package, without it the client stays on http1.1 instead of failing on start
+        if settings["http2"] is True and find_spec("h2") is None:
+            logging.warning(f"http2 requested for {name} but the h2 package is not installed, using http1.1")
+            settings["http2"] = False
+        return settings
+
+    def _build_request_hook(self: Self, name: str) -> Any:
+        counters: dict[str, int] = self._counters[name]
+
+        # ** info: httpcore traces every new connection, comparing them with the requests sent shows how much the pool is being reused
+        async def trace(event_name: str, info: dict[str, Any]) -> None:
+            if event_name == "connection.connect_tcp.complete":
+                counters["connections_opened"] += 1
+
+        async def on_request(request: httpx.Request) -> None:
+            counters["requests"] += 1
+            request.extensions["trace"] = trace
+
+        return on_request
+
+    def _obtain_upstream_metrics(self: Self, name: str, client: httpx.AsyncClient) -> dict[str, Any]:
+        settings: dict[str, Any] = self._settings[name]
+        metrics: dict[str, Any] = {
+            **self._counters[name],
+            "connections": 0,
+            "idle_connections": 0,
+            "active_connections": 0,
+            "queued_requests": 0,
+            "max_connections": settings["max_connections"],
+            "max_keepalive_connections": settings["max_keepalive_connections"],
+            "keepalive_expiry": settings["keepalive_expiry"],
+            "http2": settings["http2"],
+        }
+        # ** info: httpx does not expose its connection pool, the httpcore one behind the default transport is read when it is there
+        pool: Any = getattr(getattr(client, "_transport", None), "_pool", None)
+        if pool is None:
+            return metrics
+        connections: list[Any] = pool.connections
+        metrics["connections"] = len(connections)
+        metrics["idle_connections"] = sum(1 for connection in connections if connection.is_idle())
+        metrics["active_connections"] = sum(1 for connection in connections if not connection.is_idle() and not connection.is_closed())
+        metrics["queued_requests"] = sum(1 for request in getattr(pool, "_requests", list()) if request.is_queued())
+        return metrics
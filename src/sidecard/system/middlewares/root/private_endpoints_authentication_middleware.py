@@ -0,0 +1,56 @@
+# !/usr/bin/python3
+# type: ignore
+
+# ** info: python imports
+from typing import Callable
+import contextvars
+import logging
+import hmac
+
+# ** info: typing imports
+from typing import Self
+from typing import Dict
+
+# ** info: starlette imports
+from starlette.responses import StreamingResponse
+from starlette.requests import Request
+
+# ** info: fastapi imports
+from fastapi.responses import JSONResponse
+from fastapi import status
+
+# ** info: sidecards.system.artifacts imports
+from src.sidecard.system.artifacts.env_provider import EnvProvider
+from src.sidecard.system.artifacts.path_provider import PathProvider
+
+# ** info: sidecards.system.middlewares.inheritables imports
+from src.sidecard.system.middlewares.inheritables.base_middleware import BaseMiddleware
+
+__all__: list[str] = ["PrivateEndpointsAuthenticationMiddleware"]
+
+
+class PrivateEndpointsAuthenticationMiddleware(BaseMiddleware):
+    # ** info: only the private endpoints are checked, they are called with the private endpoints api key on the x-api-key header
+    def __init__(self: Self) -> None:
+        self._env_provider: EnvProvider = EnvProvider()
+        self._private_path: str = PathProvider().build_posix_path("rest", "private", "")
+        self._api_key: bytes = self._env_provider.app_private_endpoints_api_key.encode("utf-8")
+
+    async def __call__(self: Self, request: Request, call_next: Callable) -> StreamingResponse:
+        if not request.url.path.startswith(self._private_path):
+            return await call_next(request)
+
+        logging.debug("private endpoints authentication middleware started")
+
+        loguru_context: Dict = await self._set_values_from_request_context_to_dict(context=contextvars.copy_context(), context_key=r"loguru_context")
+        internal_id: str = loguru_context[r"internalId"]
+        is_authenticated: bool = hmac.compare_digest(request.headers.get(r"x-api-key", r"").encode("utf-8"), self._api_key)
+
+        if is_authenticated:
+            logging.info(f"the request with id {internal_id} was successfully authorized on the private endpoints")
+            response: StreamingResponse = await call_next(request)
+            logging.debug("private endpoints authentication middleware ended")
+            return response
+        else:
+            logging.error(f"the request with id {internal_id} was not successfully authorized on the private endpoints")
+            return JSONResponse(status_code=status.HTTP_401_UNAUTHORIZED, content={r"detail": r"Unauthorized"})
@@ -0,0 +1,95 @@
+# !/usr/bin/python3
+
+# ** info: python imports
+from contextlib import asynccontextmanager
+from unittest.mock import MagicMock
+from unittest.mock import AsyncMock
+from pytest import MonkeyPatch
+from os.path import join
+from pytest import mark
+from os import path
+import sys
+
+# ** info: typing imports
+from typing import AsyncIterator
+
+# **info: appending src path to the system paths for absolute imports from src path
+sys.path.append(join(path.dirname(path.realpath(__file__)), "..", "..", "."))
+
+# ** info: dtos imports
+from src.modules.centralized_analytics.ports.rest_routers_dtos.centralized_analytics_dtos import YearDataResponseDto  # type: ignore
+
+# ** info: providers imports
+from src.modules.collect_request.adapters.database_providers.collect_request_provider import CollectRequestProvider  # type: ignore
+from src.modules.waste.adapters.database_providers.waste_provider import WasteProvider  # type: ignore
+
+# ** info: core imports
+from src.modules.centralized_analytics.cores.analytics.centralized_analytics_core import CentralyzedAnalyticsCore  # type: ignore
+
+# ** info: fixtures imports
+from test_centralized_analytics_core_fixtures import year_data_response_dto_fixture_1  # type: ignore
+from test_centralized_analytics_core_fixtures import year_data_request_dto_fixture_1  # type: ignore
+from test_centralized_analytics_core_fixtures import wastes_basic_info_fixture_1  # type: ignore
+from test_centralized_analytics_core_fixtures import monthly_counters_fixture_1  # type: ignore
+
+# ---------------------------------------------------------------------------------------------------------------------
+# ** info: building mocks
+# ** info: only the methods that interact with external systems are mocked, the rest of the methods are tested
+# !! info: this includes only adapters from the same module and cpms (core port methods) from other cores
+# ---------------------------------------------------------------------------------------------------------------------
+
+centralized_analytics_core: CentralyzedAnalyticsCore = CentralyzedAnalyticsCore()
+centralized_analytics_core._monthly_counter_provider.list_monthly_counters_by_year = AsyncMock(return_value=monthly_counters_fixture_1)  # type: ignore
+
+
+def mount_session_stand_in(monkeypatch: MonkeyPatch, provider: CollectRequestProvider | WasteProvider) -> MagicMock:
+    # ** info: the create paths run against a session stand in, the counters increment and the cache invalidation are only recorded
+    session: MagicMock = MagicMock(exec=AsyncMock(), commit=AsyncMock(), refresh=AsyncMock())
+
+    @asynccontextmanager
+    async def obtain_session() -> AsyncIterator[MagicMock]:
+        yield session
+
+    # ** info: the commit fails if the counters were not incremented before it, they have to be part of the same transaction
+    async def commit() -> None:
+        provider._monthly_counter_provider.increment_monthly_counters.assert_called_once()
+
+    session.commit.side_effect = commit
+    monkeypatch.setattr(provider, "_session_manager", MagicMock(obtain_session=obtain_session))
+    monkeypatch.setattr(provider._monthly_counter_provider, "increment_monthly_counters", AsyncMock())
+    return session
+
+
+# ---------------------------------------------------------------------------------------------------------------------
+# ** info: executing tests
+# ** info: only the drivers are explicitly tested, the rest of the methods are implicitly tested
+# ---------------------------------------------------------------------------------------------------------------------
+
+
+@mark.asyncio
+async def test_driver_obtain_wcr_yearly_analytics_hpp1() -> None:
+    year_data_response: YearDataResponseDto = await centralized_analytics_core.driver_obtain_wcr_yearly_analytics(year_data_request=year_data_request_dto_fixture_1)
+    centralized_analytics_core._monthly_counter_provider.list_monthly_counters_by_year.assert_called_with(year=year_data_request_dto_fixture_1.year)
+    assert year_data_response == year_data_response_dto_fixture_1
+
+
+@mark.asyncio
+async def test_store_collect_request_increments_the_monthly_counters_on_its_session(monkeypatch: MonkeyPatch) -> None:
+    collect_request_provider: CollectRequestProvider = CollectRequestProvider()
+    monkeypatch.setattr(collect_request_provider, "_invalidate_cached_collect_request", AsyncMock())
+    session: MagicMock = mount_session_stand_in(monkeypatch=monkeypatch, provider=collect_request_provider)
+    new_collect_request = await collect_request_provider.store_collect_request(collect_date=r"01/03/2024", production_center_id=1)
+    collect_request_provider._monthly_counter_provider.increment_monthly_counters.assert_called_once_with(session=session, create=new_collect_request.create, collect_requests=1)
+    session.commit.assert_called_once_with()
+
+
+@mark.asyncio
+async def test_create_wastes_with_basic_info_increments_the_monthly_counters_on_its_session(monkeypatch: MonkeyPatch) -> None:
+    waste_provider: WasteProvider = WasteProvider()
+    monkeypatch.setattr(waste_provider, "_invalidate_cached_wastes", AsyncMock())
+    session: MagicMock = mount_session_stand_in(monkeypatch=monkeypatch, provider=waste_provider)
+    new_wastes = await waste_provider.create_wastes_with_basic_info(request_uuid=r"collect-request", wastes=wastes_basic_info_fixture_1)
+    waste_provider._monthly_counter_provider.increment_monthly_counters.assert_called_once_with(
+        session=session, create=new_wastes[0].create, wastes=len(wastes_basic_info_fixture_1)
+    )
+    session.commit.assert_called_once_with()
@@ -0,0 +1,60 @@
+# !/usr/bin/python3
+
+# ** info: python imports
+from os.path import join
+from os import path
+import sys
+
+# ** info: typing imports
+from typing import Any
+
+# **info: appending src path to the system paths for absolute imports from src path
+sys.path.append(join(path.dirname(path.realpath(__file__)), "..", "..", "."))
+
+# ** info: dtos imports
+from src.modules.centralized_analytics.ports.rest_routers_dtos.centralized_analytics_dtos import YearDataResponseDto  # type: ignore
+from src.modules.centralized_analytics.ports.rest_routers_dtos.centralized_analytics_dtos import YearDataRequestDto  # type: ignore
+from src.modules.centralized_analytics.ports.rest_routers_dtos.centralized_analytics_dtos import MonthAnalyticsDto  # type: ignore
+
+# ** info: entities imports
+from src.modules.centralized_analytics.adapters.database_providers_entities.monthly_counter_entity import MonthlyCounterRecord  # type: ignore
+
+# ---------------------------------------------------------------------------------------------------------------------
+# ** info: monthly counters fixtures declaration
+# ** info: only some months have a counter row, the months without one are expected in the response with zero quantities
+# ---------------------------------------------------------------------------------------------------------------------
+
+monthly_counters_fixture_1: tuple[MonthlyCounterRecord, ...] = (
+    MonthlyCounterRecord(month=2, collect_requests=3, wastes=7),
+    MonthlyCounterRecord(month=5, collect_requests=1, wastes=2),
+    MonthlyCounterRecord(month=12, collect_requests=4, wastes=9),
+)
+
+month_names_fixture_1: list[str] = [r"january", r"february", r"march", r"april", r"may", r"june", r"july", r"august", r"september", r"october", r"november", r"december"]
+
+# ---------------------------------------------------------------------------------------------------------------------
+# ** info: yearly analytics fixtures declaration
+# ---------------------------------------------------------------------------------------------------------------------
+
+year_data_request_dto_fixture_1: YearDataRequestDto = YearDataRequestDto(year=2024)
+
+year_data_response_dto_fixture_1: YearDataResponseDto = YearDataResponseDto(
+    analytics=[
+        MonthAnalyticsDto(
+            collectRequestsQuantity={2: 3, 5: 1, 12: 4}.get(month, 0),
+            wastesQuantity={2: 7, 5: 2, 12: 9}.get(month, 0),
+            monthName=month_names_fixture_1[month - 1],
+            monthNumber=month,
+        )
+        for month in range(1, 12 + 1)
+    ]
+)
+
+# ---------------------------------------------------------------------------------------------------------------------
+# ** info: create paths fixtures declaration
+# ---------------------------------------------------------------------------------------------------------------------
+
+wastes_basic_info_fixture_1: list[dict[str, Any]] = [
+    {"type": 1, "packaging": 1, "weight_in_kg": 10.5, "volume_in_l": 3.0, "description": r"first waste", "note": None},
+    {"type": 2, "packaging": 1, "weight_in_kg": 4.0, "volume_in_l": 1.5, "description": r"second waste", "note": r"fragile"},
+]
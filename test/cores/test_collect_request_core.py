@@ -1,8 +1,8 @@
 # !/usr/bin/python3
 
 # ** info: python imports
-from unittest.mock import AsyncMock
 from unittest.mock import MagicMock
+from unittest.mock import AsyncMock
 from os.path import join
 from pytest import mark
 from os import path
@@ -26,6 +26,7 @@ from test_collect_request_core_fixtures import request_find_request_by_status_fi
 from test_collect_request_core_fixtures import request_full_data_response_fixture_1  # type: ignore
 from test_collect_request_core_fixtures import request_create_request_fixture_1  # type: ignore
 from test_collect_request_core_fixtures import parameters_ids_fixture_1  # type: ignore
+from test_collect_request_core_fixtures import collect_request_record  # type: ignore
 from test_collect_request_core_fixtures import collect_request  # type: ignore
 from test_collect_request_core_fixtures import wastes_list  # type: ignore
 
@@ -37,11 +38,12 @@ from test_collect_request_core_fixtures import wastes_list  # type: ignore
 
 collect_request_core: CollectRequestCore = CollectRequestCore()
 type(collect_request_core._parameter_core).cpm_pc_get_set_of_parameter_ids_by_domain = AsyncMock(return_value=parameters_ids_fixture_1)  # type: ignore
-collect_request_core._collect_request_provider.find_collects_requests_by_state = MagicMock(return_value=[collect_request])  # type: ignore
-collect_request_core._collect_request_provider.modify_collect_request_by_id = MagicMock(return_value=collect_request)
-type(collect_request_core._waste_core).cpm_wc_create_waste_with_basic_info = AsyncMock(side_effect=wastes_list)  # type: ignore
+collect_request_core._collect_request_provider.find_collects_requests_by_state = AsyncMock(return_value=[collect_request_record])  # type: ignore
+collect_request_core._collect_request_provider.modify_collect_request_by_id = AsyncMock(return_value=collect_request)
+type(collect_request_core._waste_core).cpm_wc_create_wastes_with_basic_info = AsyncMock(return_value=wastes_list)  # type: ignore
 type(collect_request_core._waste_core).cpm_wc_update_waste_by_request_id = AsyncMock(return_value=wastes_list)  # type: ignore
-collect_request_core._collect_request_provider.store_collect_request = MagicMock(return_value=collect_request)
+collect_request_core._collect_request_provider.store_collect_request = AsyncMock(return_value=collect_request)
+collect_request_core._mysql_manager.unit_of_work = MagicMock()  # type: ignore
 
 # ---------------------------------------------------------------------------------------------------------------------
 # ** info: executing tests
@@ -63,7 +65,7 @@ async def test_driver_find_request_by_status_hpp1() -> None:
     find_request_by_status_response: CollectRequestFindByStatusResDto = await collect_request_core.driver_find_request_by_status(
         request_find_request_by_status=request_find_request_by_status_fixture_1
     )
-    collect_request_core._collect_request_provider.find_collects_requests_by_state.assert_called_with(process_status=9)
+    collect_request_core._collect_request_provider.find_collects_requests_by_state.assert_called_with(process_status=9, limit=51, after=None)
     assert find_request_by_status_response == collect_request_find_by_status_fixture_1
 
 
@@ -23,6 +23,7 @@ from src.modules.collect_request.ports.rest_routers_dtos.collect_request_dtos im
 from src.modules.collect_request.ports.rest_routers_dtos.collect_request_dtos import RequestWasteDataDto  # type: ignore
 
 # ** info: entities imports
+from src.modules.collect_request.adapters.database_providers_entities.collect_request_entity import CollectRequestRecord  # type: ignore
 from src.modules.collect_request.adapters.database_providers_entities.collect_request_entity import CollectRequest  # type: ignore
 from src.modules.waste.adapters.database_providers_entities.waste_entity import Waste  # type: ignore
 
@@ -120,6 +121,16 @@ collect_request: CollectRequest = CollectRequest(
     update=datetime_provider.get_current_time(),
 )
 
+collect_request_record: CollectRequestRecord = CollectRequestRecord(
+    collect_date=collect_request.collect_date,
+    production_center_id=collect_request.production_center_id,
+    uuid=collect_request.uuid,
+    process_status=collect_request.process_status,
+    note=collect_request.note,
+    create=collect_request.create,
+    update=collect_request.update,
+)
+
 # ---------------------------------------------------------------------------------------------------------------------
 # ** info: create response fixtures declaration
 # ---------------------------------------------------------------------------------------------------------------------
@@ -173,7 +184,9 @@ request_full_data_response_fixture_1: CollectRequestFullDataResponseDto = Collec
 
 request_find_request_by_status_fixture_1: CollectRequestFindByStatusReqDto = CollectRequestFindByStatusReqDto(processStatus=9)
 
-collect_request_find_by_status_fixture_1: CollectRequestFindByStatusResDto = CollectRequestFindByStatusResDto(values=[response_request_data_dto_fixture_1])
+collect_request_find_by_status_fixture_1: CollectRequestFindByStatusResDto = CollectRequestFindByStatusResDto(
+    values=[response_request_data_dto_fixture_1], pageSize=50, nextCursor=None
+)
 
 collect_request_modify_by_id_req_dto_fixture_1: CollectRequestModifyByIdReqDto = CollectRequestModifyByIdReqDto(
     collectReqId=collect_request.uuid, processStatus=9, note="this is a note"
@@ -0,0 +1,57 @@
+# !/usr/bin/python3
+
+# ** info: python imports
+from os.path import join
+from pytest import MonkeyPatch
+from pytest import raises
+from pytest import mark
+from os import path
+import sys
+
+# **info: appending src path to the system paths for absolute imports from src path
+sys.path.append(join(path.dirname(path.realpath(__file__)), "..", "..", "."))
+
+# ** info: pydantic imports
+from pydantic import ValidationError
+
+# ** info: dtos imports
+from src.modules.introspection.ports.rest_routers_dtos.introspection_dtos import CacheReloadResponseDto  # type: ignore
+from src.modules.introspection.ports.rest_routers_dtos.introspection_dtos import CacheStatusDto  # type: ignore
+
+# ** info: core imports
+from src.modules.introspection.cores.system.introspection_core import IntrospectionCore  # type: ignore
+
+# ** info: sidecards.cache_managers imports
+from src.sidecard.system.cache_managers.cache_manager import MeteredCache  # type: ignore
+from src.sidecard.system.cache_managers.cache_manager import CacheManager  # type: ignore
+
+# ---------------------------------------------------------------------------------------------------------------------
+# ** info: building needed artifacts
+# ---------------------------------------------------------------------------------------------------------------------
+
+introspection_core: IntrospectionCore = IntrospectionCore()
+reloaded_cache: MeteredCache = CacheManager().obtain_cache(name="test_introspection_core.reloaded", ttl=60, max_bytes=4096)
+
+# ---------------------------------------------------------------------------------------------------------------------
+# ** info: executing tests
+# ---------------------------------------------------------------------------------------------------------------------
+
+
+@mark.asyncio
+async def test_driver_reload_caches_hpp1(monkeypatch: MonkeyPatch) -> None:
+    reloaded_cache["key"] = "value"
+    monkeypatch.setenv("CACHE_SETTINGS", '{"test_introspection_core.reloaded": {"ttl": 5, "max_bytes": 2048}}')
+    cache_reload_response: CacheReloadResponseDto = await introspection_core.driver_reload_caches()
+    cache_status: CacheStatusDto = next(cache for cache in cache_reload_response.caches if cache.name == reloaded_cache.name)
+    assert (cache_status.ttl, cache_status.maxBytes, cache_status.entries) == (5, 2048, 0)
+    assert "key" not in reloaded_cache
+
+
+@mark.asyncio
+async def test_driver_reload_caches_upp1(monkeypatch: MonkeyPatch) -> None:
+    # ** info: settings that can not be read leave every cache as it was
+    reloaded_cache["key"] = "value"
+    monkeypatch.setenv("CACHE_SETTINGS", '{"test_introspection_core.reloaded": {"ttl": "soon"}}')
+    with raises(ValidationError):
+        await introspection_core.driver_reload_caches()
+    assert reloaded_cache["key"] == "value"
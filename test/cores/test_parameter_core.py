@@ -1,8 +1,9 @@
 # !/usr/bin/python3
 
 # ** info: python imports
-from unittest.mock import MagicMock
+from unittest.mock import AsyncMock
 from os.path import join
+from pytest import raises
 from pytest import mark
 from os import path
 import sys
@@ -10,6 +11,11 @@ import sys
 # **info: appending src path to the system paths for absolute imports from src path
 sys.path.append(join(path.dirname(path.realpath(__file__)), "..", "..", "."))
 
+# ** info: fastapi imports
+from fastapi import HTTPException
+from fastapi import Response
+from fastapi import status
+
 # ** info: dtos imports
 from src.modules.parameter.ports.rest_routers_dtos.parameter_dtos import ParameterSearchResponseDto  # type: ignore
 
@@ -19,7 +25,7 @@ from src.modules.parameter.cores.business.parameter_core import ParameterCore  #
 # ** info: fixtures imports
 from test_parameter_core_fixtures import parameters_search_response_dto_fixture_1  # type: ignore
 from test_parameter_core_fixtures import parameter_search_request_dto_fixture_1  # type: ignore
-from test_parameter_core_fixtures import parameter_list_fixture_1  # type: ignore
+from test_parameter_core_fixtures import parameter_rows_fixture_1  # type: ignore
 
 # ---------------------------------------------------------------------------------------------------------------------
 # ** info: building mocks
@@ -28,7 +34,7 @@ from test_parameter_core_fixtures import parameter_list_fixture_1  # type: ignor
 # ---------------------------------------------------------------------------------------------------------------------
 
 parameter_core: ParameterCore = ParameterCore()
-parameter_core._parameter_provider.search_parameters_by_domain = MagicMock(return_value=parameter_list_fixture_1)  # type: ignore
+parameter_core._parameter_catalog_provider._parameter_provider.list_active_parameters = AsyncMock(return_value=parameter_rows_fixture_1)  # type: ignore
 
 # ---------------------------------------------------------------------------------------------------------------------
 # ** info: executing tests
@@ -38,6 +44,18 @@ parameter_core._parameter_provider.search_parameters_by_domain = MagicMock(retur
 
 @mark.asyncio
 async def test_driver_search_parameter_hpp1() -> None:
+    await parameter_core._parameter_catalog_provider.refresh()
     parameter_search_response: ParameterSearchResponseDto = await parameter_core.driver_search_parameter(parameter_search_request=parameter_search_request_dto_fixture_1)
-    parameter_core._parameter_provider.search_parameters_by_domain.assert_called_with(domain=parameter_search_request_dto_fixture_1.domain)
+    parameter_core._parameter_catalog_provider._parameter_provider.list_active_parameters.assert_called_once_with()
     assert parameter_search_response == parameters_search_response_dto_fixture_1
+
+
+@mark.asyncio
+async def test_driver_search_parameter_hpp2() -> None:
+    await parameter_core._parameter_catalog_provider.refresh()
+    response: Response = Response()
+    await parameter_core.driver_search_parameter(parameter_search_request=parameter_search_request_dto_fixture_1, response=response)
+    with raises(HTTPException) as not_modified:
+        await parameter_core.driver_search_parameter(parameter_search_request=parameter_search_request_dto_fixture_1, if_none_match=response.headers["ETag"])
+    assert not_modified.value.status_code == status.HTTP_304_NOT_MODIFIED
+    assert not_modified.value.headers == {"ETag": response.headers["ETag"]}
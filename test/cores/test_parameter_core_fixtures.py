@@ -6,7 +6,7 @@ from os import path
 import sys
 
 # ** info: typing imports
-from typing import Set
+from typing import FrozenSet
 
 # **info: appending src path to the system paths for absolute imports from src path
 sys.path.append(join(path.dirname(path.realpath(__file__)), "..", "..", "."))
@@ -59,7 +59,9 @@ parameter_fixture_2: Parameter = Parameter(
 parameter_list_fixture_1.append(parameter_fixture_1)
 parameter_list_fixture_1.append(parameter_fixture_2)
 
-paramaters_ids_fixture_1: Set[int] = set([parameter.id for parameter in parameter_list_fixture_1])
+paramaters_ids_fixture_1: FrozenSet[int] = frozenset([parameter.id for parameter in parameter_list_fixture_1])
+
+parameter_rows_fixture_1: list[tuple[str, int, str]] = [(parameter.domain, parameter.id, parameter.value) for parameter in parameter_list_fixture_1]
 
 
 # ---------------------------------------------------------------------------------------------------------------------
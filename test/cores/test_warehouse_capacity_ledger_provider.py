@@ -0,0 +1,309 @@
+# !/usr/bin/python3
+
+# ** info: python imports
+from decimal import Decimal
+from time import monotonic
+from os.path import join
+from pytest import raises
+from pytest import mark
+from os import path
+import asyncio
+import sys
+
+# ** info: typing imports
+from typing import Union
+from typing import Any
+
+# **info: appending src path to the system paths for absolute imports from src path
+sys.path.append(join(path.dirname(path.realpath(__file__)), "..", "..", "."))
+
+# ** info: fastapi imports
+from fastapi import HTTPException
+from fastapi import status
+
+# ** info: entities imports
+from src.modules.waste.adapters.database_providers_entities.warehouse_reservation_entity import WarehouseReservationBatchRecord  # type: ignore
+from src.modules.waste.adapters.database_providers_entities.warehouse_reservation_entity import WarehouseReservationRecord  # type: ignore
+
+# ** info: sidecards.database_managers imports
+from src.sidecard.system.database_managers.mysql_manager import unit_of_work_after_rollback  # type: ignore
+
+# ** info: providers imports
+from src.modules.waste.adapters.database_providers.warehouse_capacity_ledger_provider import WarehouseCapacityLedgerProvider  # type: ignore
+
+# ---------------------------------------------------------------------------------------------------------------------
+# ** info: building needed artifacts
+# ** info: the reservations table and the warehouse ms are replaced by in memory stand ins, every test builds its own ledger skipping the singleton
+# ---------------------------------------------------------------------------------------------------------------------
+
+
+class ReservationTable:
+    def __init__(self) -> None:
+        self.rows: dict[str, dict[str, Any]] = dict()
+        self.failing_marks: int = 0
+
+    async def store_warehouse_reservation(self, uuid: str, warehouse_id: int, source_uuid: str, weight_in_kg: float) -> None:
+        self.rows[uuid] = {"warehouse_id": warehouse_id, "weight_in_kg": Decimal(str(weight_in_kg)), "batch_uuid": None, "applied": False, "capacities": (None, None)}
+        self.rows[uuid]["update"] = monotonic()
+
+    async def list_pending_warehouse_reservations(self) -> tuple[WarehouseReservationRecord, ...]:
+        return tuple(self._record(uuid=uuid) for uuid, row in self.rows.items() if row["applied"] is False and row["batch_uuid"] is None)
+
+    async def claim_pending_warehouse_reservations(self, uuids: tuple[str, ...], batch_uuid: str) -> tuple[WarehouseReservationRecord, ...]:
+        for uuid in uuids:
+            if self.rows[uuid]["applied"] is False and self.rows[uuid]["batch_uuid"] is None:
+                self.rows[uuid]["batch_uuid"] = batch_uuid
+                self.rows[uuid]["update"] = monotonic()
+        return tuple(self._record(uuid=uuid) for uuid in uuids if self.rows[uuid]["batch_uuid"] == batch_uuid)
+
+    async def record_warehouse_reservations_write(self, batch_uuid: str, capacity_before_write: float, capacity_after_write: float) -> None:
+        for row in self.rows.values():
+            if row["batch_uuid"] == batch_uuid and row["applied"] is False:
+                row["capacities"] = (Decimal(str(capacity_before_write)), Decimal(str(capacity_after_write)))
+                row["update"] = monotonic()
+
+    async def list_stuck_warehouse_reservation_batches(self, stuck_for: float) -> tuple[WarehouseReservationBatchRecord, ...]:
+        stuck_rows: list[dict[str, Any]] = [
+            row for row in self.rows.values() if row["applied"] is False and row["batch_uuid"] is not None and monotonic() - row["update"] >= stuck_for
+        ]
+        return tuple({row["batch_uuid"]: WarehouseReservationBatchRecord(row["batch_uuid"], row["warehouse_id"], *row["capacities"]) for row in stuck_rows}.values())
+
+    async def release_warehouse_reservations(self, batch_uuid: str) -> None:
+        for row in self.rows.values():
+            if row["batch_uuid"] == batch_uuid and row["applied"] is False:
+                row["batch_uuid"] = None
+                row["capacities"] = (None, None)
+
+    async def mark_warehouse_reservations_as_applied(self, batch_uuid: str) -> None:
+        if self.failing_marks > 0:
+            self.failing_marks -= 1
+            raise ConnectionError("database down")
+        for row in self.rows.values():
+            if row["batch_uuid"] == batch_uuid:
+                row["applied"] = True
+
+    def _record(self, uuid: str) -> WarehouseReservationRecord:
+        return WarehouseReservationRecord(uuid=uuid, warehouse_id=self.rows[uuid]["warehouse_id"], weight_in_kg=self.rows[uuid]["weight_in_kg"])
+
+
+class WarehouseMs:
+    def __init__(self, capacity: float) -> None:
+        self.capacity: float = capacity
+        self.reads: int = 0
+        self.writes: int = 0
+        self.error: Union[Exception, None] = None
+        self.error_after_write: bool = False
+        self.writing: asyncio.Event = asyncio.Event()
+        self.release: Union[asyncio.Event, None] = None
+
+    async def obtain_warehouse_current_capacity(self, warehouse_id: int) -> float:
+        self.reads += 1
+        return self.capacity
+
+    async def adjust_warehouse_capacity(self, warehouse_id: int, delta: float, enforce_capacity: bool = True, before_write: Any = None) -> float:
+        self.writing.set()
+        if self.release is not None:
+            await self.release.wait()
+        if self.error is not None and self.error_after_write is False:
+            raise self.error
+        await before_write(self.capacity, self.capacity + delta)
+        self.writes += 1
+        self.capacity = self.capacity + delta
+        if self.error is not None:
+            raise self.error
+        return self.capacity
+
+
+def build_ledger(capacity: float = 100.0) -> tuple[WarehouseCapacityLedgerProvider, ReservationTable, WarehouseMs]:
+    ledger: WarehouseCapacityLedgerProvider = type.__call__(WarehouseCapacityLedgerProvider)
+    ledger._warehouse_reservation_provider = ReservationTable()
+    ledger._warehouse_ms_service = WarehouseMs(capacity=capacity)
+    return ledger, ledger._warehouse_reservation_provider, ledger._warehouse_ms_service
+
+
+async def reserve(ledger: WarehouseCapacityLedgerProvider, weight_in_kg: float) -> float:
+    await ledger.load_capacity(warehouse_id=1)
+    return await ledger.reserve(warehouse_id=1, source_uuid="collect-request", weight_in_kg=weight_in_kg)
+
+
+async def leave_claimed(table: ReservationTable, batch_uuid: str, capacities: tuple[float, float] = None) -> None:
+    # ** info: what a worker that died in the middle of a pass leaves behind, the capacities are only there when it got to record its write
+    await table.claim_pending_warehouse_reservations(uuids=tuple(table.rows.keys()), batch_uuid=batch_uuid)
+    if capacities is not None:
+        await table.record_warehouse_reservations_write(batch_uuid=batch_uuid, capacity_before_write=capacities[0], capacity_after_write=capacities[1])
+
+
+def unavailable() -> HTTPException:
+    return HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE)
+
+
+# ---------------------------------------------------------------------------------------------------------------------
+# ** info: executing tests
+# ---------------------------------------------------------------------------------------------------------------------
+
+
+@mark.asyncio
+async def test_reconcile_writes_the_pending_reservations_in_one_batch() -> None:
+    ledger, table, warehouse_ms = build_ledger()
+    await reserve(ledger=ledger, weight_in_kg=30)
+    await reserve(ledger=ledger, weight_in_kg=20)
+    await ledger.reconcile()
+    assert (warehouse_ms.writes, warehouse_ms.capacity) == (1, 50)
+    assert all(row["applied"] is True for row in table.rows.values())
+    assert ledger.obtain_metrics()["pending"] == 0
+    assert await reserve(ledger=ledger, weight_in_kg=50) == 0
+
+
+@mark.asyncio
+async def test_reconcile_failure_before_the_write_gives_the_reservations_back() -> None:
+    ledger, table, warehouse_ms = build_ledger()
+    await reserve(ledger=ledger, weight_in_kg=30)
+    warehouse_ms.error = unavailable()
+    await ledger.reconcile()
+    assert all(row["batch_uuid"] is None for row in table.rows.values())
+    warehouse_ms.error = None
+    await ledger.reconcile()
+    assert (warehouse_ms.writes, warehouse_ms.capacity) == (1, 70)
+
+
+@mark.asyncio
+async def test_reconcile_failure_after_the_write_never_writes_the_batch_again() -> None:
+    ledger, table, warehouse_ms = build_ledger()
+    await reserve(ledger=ledger, weight_in_kg=30)
+    warehouse_ms.error = unavailable()
+    warehouse_ms.error_after_write = True
+    await ledger.reconcile()
+    warehouse_ms.error = None
+    await ledger.reconcile()
+    assert (warehouse_ms.writes, warehouse_ms.capacity) == (1, 70)
+    assert ledger.obtain_metrics()["unconfirmed"] == 1
+
+
+@mark.asyncio
+async def test_reconcile_failed_mark_is_stored_by_the_next_pass_without_writing_again() -> None:
+    ledger, table, warehouse_ms = build_ledger()
+    await reserve(ledger=ledger, weight_in_kg=30)
+    table.failing_marks = 1
+    await ledger.reconcile()
+    assert ledger.obtain_metrics()["unsettled"] == 1
+    await ledger.reconcile()
+    assert (warehouse_ms.writes, warehouse_ms.capacity) == (1, 70)
+    assert all(row["applied"] is True for row in table.rows.values())
+    assert ledger.obtain_metrics()["unsettled"] == 0
+
+
+@mark.asyncio
+async def test_reserve_rejects_what_does_not_fit_the_capacity_left() -> None:
+    ledger, table, warehouse_ms = build_ledger()
+    assert await reserve(ledger=ledger, weight_in_kg=80) == 20
+    with raises(HTTPException):
+        await reserve(ledger=ledger, weight_in_kg=30)
+    assert len(table.rows) == 1
+    assert ledger.obtain_metrics()["rejected"] == 1
+
+
+@mark.asyncio
+async def test_reserve_reads_the_warehouse_ms_only_when_the_capacity_is_loaded() -> None:
+    ledger, table, warehouse_ms = build_ledger()
+    with raises(HTTPException):
+        await ledger.reserve(warehouse_id=1, source_uuid="collect-request", weight_in_kg=10)
+    await reserve(ledger=ledger, weight_in_kg=10)
+    await reserve(ledger=ledger, weight_in_kg=10)
+    assert (warehouse_ms.reads, len(table.rows)) == (1, 2)
+
+
+@mark.asyncio
+async def test_reserve_rolled_back_leaves_the_capacity_it_took() -> None:
+    ledger, table, warehouse_ms = build_ledger()
+    after_rollback: list[Any] = list()
+    token = unit_of_work_after_rollback.set(after_rollback)
+    try:
+        await reserve(ledger=ledger, weight_in_kg=80)
+    finally:
+        unit_of_work_after_rollback.reset(token)
+    for callback in after_rollback:
+        callback()
+    assert ledger.obtain_metrics()["pending"] == 0
+    assert await reserve(ledger=ledger, weight_in_kg=80) == 20
+
+
+@mark.asyncio
+async def test_stop_waits_for_the_pass_in_flight() -> None:
+    ledger, table, warehouse_ms = build_ledger()
+    await reserve(ledger=ledger, weight_in_kg=30)
+    ledger._reconcile_seconds = 0
+    warehouse_ms.release = asyncio.Event()
+    ledger._reconciler = asyncio.create_task(ledger._reconcile_periodically())
+    await warehouse_ms.writing.wait()
+    stopping: asyncio.Task = asyncio.create_task(ledger.stop())
+    await asyncio.sleep(0.01)
+    assert stopping.done() is False
+    warehouse_ms.release.set()
+    await stopping
+    assert (warehouse_ms.writes, warehouse_ms.capacity) == (1, 70)
+    assert all(row["applied"] is True for row in table.rows.values())
+
+
+@mark.asyncio
+async def test_reconcile_cancelled_before_the_write_gives_the_reservations_back() -> None:
+    ledger, table, warehouse_ms = build_ledger()
+    await reserve(ledger=ledger, weight_in_kg=30)
+    warehouse_ms.release = asyncio.Event()
+    reconciliation: asyncio.Task = asyncio.create_task(ledger.reconcile())
+    await warehouse_ms.writing.wait()
+    reconciliation.cancel()
+    with raises(asyncio.CancelledError):
+        await reconciliation
+    assert all(row["batch_uuid"] is None for row in table.rows.values())
+    assert warehouse_ms.writes == 0
+
+
+@mark.asyncio
+async def test_reconcile_recovers_a_stuck_batch_that_never_wrote() -> None:
+    ledger, table, warehouse_ms = build_ledger()
+    await reserve(ledger=ledger, weight_in_kg=30)
+    await leave_claimed(table=table, batch_uuid="lost-batch")
+    await ledger.reconcile()
+    assert all(row["batch_uuid"] == "lost-batch" for row in table.rows.values())
+    ledger._stuck_batch_seconds = 0
+    await ledger.reconcile()
+    assert (warehouse_ms.writes, warehouse_ms.capacity) == (1, 70)
+    assert all(row["applied"] is True for row in table.rows.values())
+    assert ledger.obtain_metrics()["recovered"] == 1
+
+
+@mark.asyncio
+async def test_reconcile_recovers_a_stuck_batch_that_reached_the_warehouse_ms_without_writing_again() -> None:
+    ledger, table, warehouse_ms = build_ledger()
+    await reserve(ledger=ledger, weight_in_kg=30)
+    await leave_claimed(table=table, batch_uuid="lost-batch", capacities=(100, 70))
+    warehouse_ms.capacity = 70
+    ledger._stuck_batch_seconds = 0
+    await ledger.reconcile()
+    assert (warehouse_ms.writes, warehouse_ms.capacity) == (0, 70)
+    assert all(row["applied"] is True for row in table.rows.values())
+
+
+@mark.asyncio
+async def test_reconcile_recovers_a_stuck_batch_whose_write_did_not_land() -> None:
+    ledger, table, warehouse_ms = build_ledger()
+    await reserve(ledger=ledger, weight_in_kg=30)
+    await leave_claimed(table=table, batch_uuid="lost-batch", capacities=(100, 70))
+    ledger._stuck_batch_seconds = 0
+    await ledger.reconcile()
+    assert (warehouse_ms.writes, warehouse_ms.capacity) == (1, 70)
+    assert all(row["applied"] is True for row in table.rows.values())
+
+
+@mark.asyncio
+async def test_reconcile_leaves_a_stuck_batch_claimed_when_the_capacity_moved_since() -> None:
+    ledger, table, warehouse_ms = build_ledger()
+    await reserve(ledger=ledger, weight_in_kg=30)
+    await leave_claimed(table=table, batch_uuid="lost-batch", capacities=(100, 70))
+    warehouse_ms.capacity = 55
+    ledger._stuck_batch_seconds = 0
+    await ledger.reconcile()
+    await ledger.reconcile()
+    assert warehouse_ms.writes == 0
+    assert all(row["batch_uuid"] == "lost-batch" and row["applied"] is False for row in table.rows.values())
+    assert ledger.obtain_metrics()["unrecoverable"] == 1
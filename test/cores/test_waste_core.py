@@ -1,35 +1,62 @@
 # !/usr/bin/python3
 
 # ** info: python imports
-from unittest.mock import MagicMock
 from unittest.mock import AsyncMock
+from unittest.mock import MagicMock
 from os.path import join
+from time import monotonic
+from pytest import LogCaptureFixture
+from pytest import MonkeyPatch
 from pytest import mark
 from os import path
+import logging
 import sys
 
+# ** info: typing imports
+from typing import AsyncGenerator
+
+# ** info: httpx imports
+import httpx
+
 # **info: appending src path to the system paths for absolute imports from src path
 sys.path.append(join(path.dirname(path.realpath(__file__)), "..", "..", "."))
 
 # ** info: dtos imports
+from src.modules.waste.ports.rest_routers_dtos.waste_dtos import WasteClasificationBatchResponseDto  # type: ignore
 from src.modules.waste.ports.rest_routers_dtos.waste_dtos import WasteClasificationResponseDto  # type: ignore
 from src.modules.waste.ports.rest_routers_dtos.waste_dtos import WasteFullDataResponseListDto  # type: ignore
 from src.modules.waste.ports.rest_routers_dtos.waste_dtos import WasteFullDataResponseDto  # type: ignore
 
+# ** info: entities imports
+from src.modules.waste.adapters.database_providers_entities.waste_entity import WasteRecord  # type: ignore
+
 # ** info: core imports
 from src.modules.waste.cores.business.waste_core import WasteCore  # type: ignore
 
+# ** info: adapters imports
+from src.modules.waste.adapters.rest_services.brms_service import BrmsService  # type: ignore
+
+# ** info: sidecards.http_managers imports
+from src.sidecard.system.http_managers.httpx_client_manager import HttpxClientManager  # type: ignore
+
 # ** info: fixtures imports
+from test_waste_core_fixtures import waste_clasification_batch_response_fixture_1  # type: ignore
+from test_waste_core_fixtures import waste_clasification_batch_request_fixture_1  # type: ignore
 from test_waste_core_fixtures import update_waste_casification_request_fixture_1  # type: ignore
 from test_waste_core_fixtures import waste_filter_by_status_request_fixture_1  # type: ignore
+from test_waste_core_fixtures import waste_filter_by_status_request_fixture_2  # type: ignore
 from test_waste_core_fixtures import waste_full_data_list_response_fixture_1  # type: ignore
+from test_waste_core_fixtures import waste_full_data_list_response_fixture_2  # type: ignore
 from test_waste_core_fixtures import waste_clasification_response_fixture_1  # type: ignore
 from test_waste_core_fixtures import waste_update_store_request_fixture_1  # type: ignore
 from test_waste_core_fixtures import parameter_search_request_fixture_1  # type: ignore
 from test_waste_core_fixtures import waste_full_data_response_fixture_1  # type: ignore
 from test_waste_core_fixtures import waste_full_data_response_fixture_2  # type: ignore
-from test_waste_core_fixtures import wastes_list  # type: ignore
+from test_waste_core_fixtures import waste_full_data_response_fixture_list_1  # type: ignore
+from test_waste_core_fixtures import wastes_async_iterator  # type: ignore
+from test_waste_core_fixtures import waste_records_list  # type: ignore
 from test_waste_core_fixtures import waste_1  # type: ignore
+from test_waste_core_fixtures import BrmsStandIn  # type: ignore
 from test_waste_core_fixtures import waste_2  # type: ignore
 
 # ---------------------------------------------------------------------------------------------------------------------
@@ -40,13 +67,24 @@ from test_waste_core_fixtures import waste_2  # type: ignore
 
 waste_core: WasteCore = WasteCore()
 type(waste_core._parameter_core).cpm_pc_get_set_of_parameter_ids_by_domain = AsyncMock(return_value=set([1, 9]))  # type: ignore
-waste_core._waste_provider.update_waste_internal_classification_info = MagicMock(return_value=waste_1)  # type: ignore
-waste_core._warehouse_ms_service.obtain_warehouse_current_capacity = AsyncMock(return_value=100.00)  # type: ignore
-waste_core._warehouse_ms_service.update_warehouse_current_capacity = AsyncMock(return_value=20.00)  # type: ignore
-waste_core._waste_provider.list_wastes_by_process_status = MagicMock(return_value=wastes_list)  # type: ignore
-waste_core._waste_provider.update_waste_store = MagicMock(return_value=waste_2)  # type: ignore
+waste_core._waste_provider.update_waste_internal_classification_info = AsyncMock(return_value=waste_1)  # type: ignore
+waste_core._warehouse_capacity_ledger_provider.load_capacity = AsyncMock(return_value=None)  # type: ignore
+waste_core._warehouse_capacity_ledger_provider.reserve = AsyncMock(return_value=20.00)  # type: ignore
+waste_core._mysql_manager.unit_of_work = MagicMock()  # type: ignore
+waste_core._waste_provider.list_wastes_by_process_status = AsyncMock(return_value=waste_records_list)  # type: ignore
+waste_core._waste_provider.stream_wastes_by_process_status = MagicMock(side_effect=lambda **_: wastes_async_iterator())  # type: ignore
+waste_core._waste_provider.update_waste_store = AsyncMock(return_value=waste_2)  # type: ignore
 waste_core._brms_service.obtain_waste_clasification = AsyncMock(return_value=1)  # type: ignore
-waste_core._waste_provider.search_waste_by_id = MagicMock(return_value=waste_1)  # type: ignore
+waste_core._waste_provider.search_waste_by_id = AsyncMock(return_value=waste_1)  # type: ignore
+
+# ** info: the brms calls of this core are not mocked, they are answered by a local stand in of the brms put in place of its http client
+brms_waste_core: WasteCore = WasteCore()
+
+
+def mount_brms_stand_in(monkeypatch: MonkeyPatch, batch_route: bool) -> BrmsStandIn:
+    brms_stand_in: BrmsStandIn = BrmsStandIn(batch_route=batch_route)
+    monkeypatch.setitem(HttpxClientManager()._clients, "brms", httpx.AsyncClient(transport=brms_stand_in.transport()))
+    return brms_stand_in
 
 
 # ---------------------------------------------------------------------------------------------------------------------
@@ -69,6 +107,10 @@ async def test_driver_obtain_waste_classify_hpp1() -> None:
 @mark.asyncio
 async def test_driver_update_waste_classify_classify_hpp1() -> None:
     update_waste_classify_response: WasteFullDataResponseDto = await waste_core.driver_update_waste_classify(waste_classify_request=update_waste_casification_request_fixture_1)
+    waste_core._warehouse_capacity_ledger_provider.load_capacity.assert_called_with(warehouse_id=update_waste_casification_request_fixture_1.storeId)
+    waste_core._warehouse_capacity_ledger_provider.reserve.assert_called_with(
+        warehouse_id=update_waste_casification_request_fixture_1.storeId, source_uuid=waste_1.uuid, weight_in_kg=float(waste_1.weight_in_kg)
+    )
     waste_core._brms_service.obtain_waste_clasification.assert_called_with(
         state_waste=parameter_search_request_fixture_1.stateWaste,
         isotopes_number=parameter_search_request_fixture_1.isotopesNumber,
@@ -80,12 +122,96 @@ async def test_driver_update_waste_classify_classify_hpp1() -> None:
 @mark.asyncio
 async def test_driver_search_waste_by_status_hpp1() -> None:
     filtered_wastes_response: WasteFullDataResponseListDto = await waste_core.driver_search_waste_by_status(filter_waste_by_status_request=waste_filter_by_status_request_fixture_1)
-    waste_core._waste_provider.list_wastes_by_process_status.assert_called_with(process_status=9)
+    waste_core._waste_provider.list_wastes_by_process_status.assert_called_with(process_status=9, limit=51, after=None)
     assert filtered_wastes_response == waste_full_data_list_response_fixture_1
 
 
 @mark.asyncio
 async def test_driver_update_waste_store_hpp1() -> None:
     waste_update_store_response: WasteFullDataResponseDto = await waste_core.driver_update_waste_store(waste_update_store_request=waste_update_store_request_fixture_1)
-    waste_core._waste_provider.list_wastes_by_process_status.assert_called_with(process_status=9)
+    waste_core._waste_provider.list_wastes_by_process_status.assert_called_with(process_status=9, limit=51, after=None)
     assert waste_update_store_response == waste_full_data_response_fixture_2
+
+
+@mark.asyncio
+async def test_driver_search_waste_by_status_hpp2() -> None:
+    filtered_wastes_response: WasteFullDataResponseListDto = await waste_core.driver_search_waste_by_status(filter_waste_by_status_request=waste_filter_by_status_request_fixture_2)
+    waste_core._waste_provider.list_wastes_by_process_status.assert_called_with(process_status=9, limit=2, after=None)
+    assert filtered_wastes_response == waste_full_data_list_response_fixture_2
+
+
+@mark.asyncio
+async def test_driver_stream_waste_by_status_hpp1(caplog: LogCaptureFixture) -> None:
+    caplog.set_level(logging.INFO)
+    streamed_wastes_lines: AsyncGenerator[str, None] = await waste_core.driver_stream_waste_by_status(filter_waste_by_status_request=waste_filter_by_status_request_fixture_1)
+    # ** info: the driver is not logged as ended until every line was sent
+    assert "driver_stream_waste_by_status ended" not in caplog.messages
+    streamed_wastes_response: list[str] = [line async for line in streamed_wastes_lines]
+    assert "driver_stream_waste_by_status ended" in caplog.messages
+    waste_core._waste_provider.stream_wastes_by_process_status.assert_called_with(process_status=9, after=None)
+    assert streamed_wastes_response == [waste_full_data_response.model_dump_json() + "\n" for waste_full_data_response in waste_full_data_response_fixture_list_1]
+
+
+@mark.asyncio
+async def test_driver_stream_waste_by_status_hpp2() -> None:
+    # ** info: closing the response lines early, like a disconnected client does, closes the rows generator too
+    wastes_info: AsyncGenerator[WasteRecord, None] = wastes_async_iterator()
+    waste_core._waste_provider.stream_wastes_by_process_status = MagicMock(return_value=wastes_info)  # type: ignore
+    try:
+        streamed_wastes_response: AsyncGenerator[str, None] = await waste_core.driver_stream_waste_by_status(
+            filter_waste_by_status_request=waste_filter_by_status_request_fixture_1
+        )
+        await anext(streamed_wastes_response)
+        await streamed_wastes_response.aclose()
+    finally:
+        waste_core._waste_provider.stream_wastes_by_process_status = MagicMock(side_effect=lambda **_: wastes_async_iterator())  # type: ignore
+    assert wastes_info.ag_frame is None
+
+
+@mark.asyncio
+async def test_driver_obtain_wastes_classify_hpp1(monkeypatch: MonkeyPatch) -> None:
+    brms_stand_in: BrmsStandIn = mount_brms_stand_in(monkeypatch=monkeypatch, batch_route=True)
+    brms_waste_core._brms_service.clear_cache()
+    BrmsService._batch_route_missing_since = None
+    obtain_wastes_classify_response: WasteClasificationBatchResponseDto = await brms_waste_core.driver_obtain_wastes_classify(
+        waste_clasification_batch_request=waste_clasification_batch_request_fixture_1
+    )
+    assert brms_stand_in.paths == ["/brms/waste/clasification/batch"]
+    assert obtain_wastes_classify_response == waste_clasification_batch_response_fixture_1
+
+
+@mark.asyncio
+async def test_driver_obtain_wastes_classify_hpp2(monkeypatch: MonkeyPatch) -> None:
+    brms_stand_in: BrmsStandIn = mount_brms_stand_in(monkeypatch=monkeypatch, batch_route=False)
+    brms_waste_core._brms_service.clear_cache()
+    BrmsService._batch_route_missing_since = None
+    obtain_wastes_classify_response: WasteClasificationBatchResponseDto = await brms_waste_core.driver_obtain_wastes_classify(
+        waste_clasification_batch_request=waste_clasification_batch_request_fixture_1
+    )
+    assert brms_stand_in.paths == ["/brms/waste/clasification/batch"] + ["/brms/waste/clasification"] * 3
+    assert obtain_wastes_classify_response == waste_clasification_batch_response_fixture_1
+
+
+@mark.asyncio
+async def test_driver_obtain_wastes_classify_hpp3(monkeypatch: MonkeyPatch) -> None:
+    brms_stand_in: BrmsStandIn = mount_brms_stand_in(monkeypatch=monkeypatch, batch_route=True)
+    brms_waste_core._brms_service.clear_cache()
+    BrmsService._batch_route_missing_since = float("-inf")
+    obtain_wastes_classify_response: WasteClasificationBatchResponseDto = await brms_waste_core.driver_obtain_wastes_classify(
+        waste_clasification_batch_request=waste_clasification_batch_request_fixture_1
+    )
+    assert brms_stand_in.paths == ["/brms/waste/clasification/batch"]
+    assert BrmsService._batch_route_missing_since is None
+    assert obtain_wastes_classify_response == waste_clasification_batch_response_fixture_1
+
+
+@mark.asyncio
+async def test_driver_obtain_wastes_classify_hpp4(monkeypatch: MonkeyPatch) -> None:
+    brms_stand_in: BrmsStandIn = mount_brms_stand_in(monkeypatch=monkeypatch, batch_route=True)
+    brms_waste_core._brms_service.clear_cache()
+    BrmsService._batch_route_missing_since = monotonic()
+    obtain_wastes_classify_response: WasteClasificationBatchResponseDto = await brms_waste_core.driver_obtain_wastes_classify(
+        waste_clasification_batch_request=waste_clasification_batch_request_fixture_1
+    )
+    assert brms_stand_in.paths == ["/brms/waste/clasification"] * 3
+    assert obtain_wastes_classify_response == waste_clasification_batch_response_fixture_1
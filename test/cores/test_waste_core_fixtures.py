@@ -1,17 +1,26 @@
 # !/usr/bin/python3
 
 # ** info: python imports
+from dataclasses import fields
 from os.path import join
 from os import path
+import json
 import sys
 
 # ** info: typing imports
+from typing import AsyncIterator
 from typing import List
 
+# ** info: httpx imports
+import httpx
+
 # **info: appending src path to the system paths for absolute imports from src path
 sys.path.append(join(path.dirname(path.realpath(__file__)), "..", "..", "."))
 
 # ** info: dtos imports
+from src.modules.waste.ports.rest_routers_dtos.waste_dtos import WasteClasificationBatchItemResponseDto  # type: ignore
+from src.modules.waste.ports.rest_routers_dtos.waste_dtos import WasteClasificationBatchResponseDto  # type: ignore
+from src.modules.waste.ports.rest_routers_dtos.waste_dtos import WasteClasificationBatchRequestDto  # type: ignore
 from src.modules.waste.ports.rest_routers_dtos.waste_dtos import WasteClasificationResponseDto  # type: ignore
 from src.modules.waste.ports.rest_routers_dtos.waste_dtos import WasteFilterByStatusRequestDto  # type: ignore
 from src.modules.waste.ports.rest_routers_dtos.waste_dtos import WasteClasificationRequestDto  # type: ignore
@@ -21,16 +30,19 @@ from src.modules.waste.ports.rest_routers_dtos.waste_dtos import WasteFullDataRe
 from src.modules.waste.ports.rest_routers_dtos.waste_dtos import WasteClassifyRequestDto  # type: ignore
 
 # ** info: entities imports
+from src.modules.waste.adapters.database_providers_entities.waste_entity import WasteRecord  # type: ignore
 from src.modules.waste.adapters.database_providers_entities.waste_entity import Waste  # type: ignore
 
 # ** info: sidecards.artifacts imports
 from src.sidecard.system.artifacts.datetime_provider import DatetimeProvider  # type: ignore
+from src.sidecard.system.artifacts.cursor_provider import CursorProvider  # type: ignore
 
 # ---------------------------------------------------------------------------------------------------------------------
 # ** info: create needed artifcts
 # ---------------------------------------------------------------------------------------------------------------------
 
 datetime_provider: DatetimeProvider = DatetimeProvider()
+cursor_provider: CursorProvider = CursorProvider()
 
 # ---------------------------------------------------------------------------------------------------------------------
 # ** info: waste entite fixtures declaration
@@ -75,6 +87,14 @@ waste_2: Waste = Waste(
 wastes_list.append(waste_1)
 wastes_list.append(waste_2)
 
+waste_records_list: List[WasteRecord] = [WasteRecord(**{field.name: getattr(waste, field.name) for field in fields(WasteRecord)}) for waste in wastes_list]
+
+
+async def wastes_async_iterator() -> AsyncIterator[WasteRecord]:
+    for waste_record in waste_records_list:
+        yield waste_record
+
+
 # ---------------------------------------------------------------------------------------------------------------------
 # ** info: waste full data response dtos declaration
 # ---------------------------------------------------------------------------------------------------------------------
@@ -120,7 +140,11 @@ waste_full_data_response_fixture_2: WasteFullDataResponseDto = WasteFullDataResp
 waste_full_data_response_fixture_list_1.append(waste_full_data_response_fixture_1)
 waste_full_data_response_fixture_list_1.append(waste_full_data_response_fixture_2)
 
-waste_full_data_list_response_fixture_1: WasteFullDataResponseListDto = WasteFullDataResponseListDto(values=waste_full_data_response_fixture_list_1)
+waste_full_data_list_response_fixture_1: WasteFullDataResponseListDto = WasteFullDataResponseListDto(values=waste_full_data_response_fixture_list_1, pageSize=50, nextCursor=None)
+
+waste_full_data_list_response_fixture_2: WasteFullDataResponseListDto = WasteFullDataResponseListDto(
+    values=[waste_full_data_response_fixture_1], pageSize=1, nextCursor=cursor_provider.encode_keyset_cursor(create=waste_1.create, uuid=waste_1.uuid)
+)
 
 # ---------------------------------------------------------------------------------------------------------------------
 # ** info: parameter search request dtos fixtures declaration
@@ -138,6 +162,55 @@ parameter_search_request_fixture_1: WasteClasificationRequestDto = WasteClasific
 
 waste_clasification_response_fixture_1: WasteClasificationResponseDto = WasteClasificationResponseDto(storeType=1)
 
+# ---------------------------------------------------------------------------------------------------------------------
+# ** info: waste clasification batch dtos fixtures declaration
+# ---------------------------------------------------------------------------------------------------------------------
+
+waste_clasification_batch_request_fixture_1: WasteClasificationBatchRequestDto = WasteClasificationBatchRequestDto(
+    wastes=[
+        WasteClasificationRequestDto(stateWaste="solid", isotopesNumber=31.0, weightInKg=100.0),  # type: ignore
+        WasteClasificationRequestDto(stateWaste="liquid", isotopesNumber=12.0, weightInKg=20.0),  # type: ignore
+        WasteClasificationRequestDto(stateWaste="solid", isotopesNumber=5.0, weightInKg=2000.0),  # type: ignore
+    ]
+)
+
+waste_clasification_batch_response_fixture_1: WasteClasificationBatchResponseDto = WasteClasificationBatchResponseDto(
+    values=[
+        WasteClasificationBatchItemResponseDto(stateWaste="solid", isotopesNumber=31.0, weightInKg=100.0, storeType=4),  # type: ignore
+        WasteClasificationBatchItemResponseDto(stateWaste="liquid", isotopesNumber=12.0, weightInKg=20.0, storeType=2),  # type: ignore
+        WasteClasificationBatchItemResponseDto(stateWaste="solid", isotopesNumber=5.0, weightInKg=2000.0, storeType=None),  # type: ignore
+    ]
+)
+
+# ---------------------------------------------------------------------------------------------------------------------
+# ** info: brms stand in declaration
+# ---------------------------------------------------------------------------------------------------------------------
+
+
+class BrmsStandIn:
+    # ** info: local stand in of the brms classification routes, it answers through an httpx mock transport and records the paths it gets
+    def __init__(self, batch_route: bool) -> None:
+        self.batch_route: bool = batch_route
+        self.paths: List[str] = list()
+
+    def transport(self) -> httpx.MockTransport:
+        return httpx.MockTransport(self.handle)
+
+    def handle(self, request: httpx.Request) -> httpx.Response:
+        self.paths.append(request.url.path)
+        if request.url.path == "/brms/waste/clasification/batch":
+            if self.batch_route is False:
+                return httpx.Response(status_code=404)
+            return httpx.Response(status_code=200, json=[self.classify(waste=waste) for waste in json.loads(request.content)])
+        return httpx.Response(status_code=200, text=str(self.classify(waste=json.loads(request.content))))
+
+    @staticmethod
+    def classify(waste: dict) -> int:
+        if waste["weightInKg"] > 1000:
+            return 0
+        return 4 if waste["stateWaste"] == "solid" else 2
+
+
 # ---------------------------------------------------------------------------------------------------------------------
 # ** info: wase classify request dto fixtures declaration
 # ---------------------------------------------------------------------------------------------------------------------
@@ -152,6 +225,8 @@ update_waste_casification_request_fixture_1: WasteClassifyRequestDto = WasteClas
 
 waste_filter_by_status_request_fixture_1: WasteFilterByStatusRequestDto = WasteFilterByStatusRequestDto(processStatus=9)
 
+waste_filter_by_status_request_fixture_2: WasteFilterByStatusRequestDto = WasteFilterByStatusRequestDto(processStatus=9, pageSize=1)
+
 # ---------------------------------------------------------------------------------------------------------------------
 # ** info: building mocks
 # ---------------------------------------------------------------------------------------------------------------------
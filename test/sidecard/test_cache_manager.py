@@ -0,0 +1,169 @@
+# !/usr/bin/python3
+
+# ** info: python imports
+from types import SimpleNamespace
+from os.path import join
+from pytest import mark
+from os import path
+import asyncio
+import sys
+
+# ** info: typing imports
+from typing import Any
+
+# **info: appending src path to the system paths for absolute imports from src path
+sys.path.append(join(path.dirname(path.realpath(__file__)), "..", "..", "."))
+
+# ** info: asyncache imports
+from asyncache import cached as async_cached
+
+# ** info: sidecards.cache_managers imports
+from src.sidecard.system.cache_managers.cache_manager import single_flight  # type: ignore
+from src.sidecard.system.cache_managers.cache_manager import MeteredCache  # type: ignore
+
+# ** info: sidecards.helpers imports
+from src.sidecard.system.helpers.cache_key_helper import CacheKey  # type: ignore
+
+# ---------------------------------------------------------------------------------------------------------------------
+# ** info: building needed artifacts
+# ** info: a slow upstream whose answers can be changed and released by the tests
+# ---------------------------------------------------------------------------------------------------------------------
+
+
+class SlowUpstream:
+    def __init__(self) -> None:
+        self.value: Any = "first"
+        self.calls: int = 0
+        self.started: asyncio.Event = asyncio.Event()
+        self.release: asyncio.Event = asyncio.Event()
+        self.error: Exception = None
+
+    async def read(self, key: str) -> Any:
+        self.calls += 1
+        value: Any = self.value
+        self.started.set()
+        await self.release.wait()
+        if self.error is not None:
+            raise self.error
+        return value
+
+
+def build_cache() -> MeteredCache:
+    return MeteredCache(name="test", ttl=60, max_bytes=1048576)
+
+
+def build_cached_read(cache: MeteredCache, upstream: SlowUpstream):
+    def key(key: str) -> str:
+        return key
+
+    @async_cached(cache, key=key)
+    @single_flight(cache, key=key)
+    async def read(key: str) -> Any:
+        return await upstream.read(key=key)
+
+    return read
+
+
+# ---------------------------------------------------------------------------------------------------------------------
+# ** info: executing tests
+# ---------------------------------------------------------------------------------------------------------------------
+
+
+@mark.asyncio
+async def test_load_once_coalesces_concurrent_misses() -> None:
+    cache: MeteredCache = build_cache()
+    upstream: SlowUpstream = SlowUpstream()
+    read = build_cached_read(cache=cache, upstream=upstream)
+    reads: asyncio.Future = asyncio.gather(*(read(key="a") for _ in range(5)))
+    await asyncio.sleep(0)
+    upstream.release.set()
+    assert await reads == ["first"] * 5
+    assert upstream.calls == 1
+    assert cache.obtain_metrics()["coalesced"] == 4
+    assert await read(key="a") == "first"
+    assert upstream.calls == 1
+
+
+@mark.asyncio
+async def test_load_once_failure_reaches_every_caller_and_is_not_cached() -> None:
+    cache: MeteredCache = build_cache()
+    upstream: SlowUpstream = SlowUpstream()
+    upstream.error = ConnectionError("upstream down")
+    read = build_cached_read(cache=cache, upstream=upstream)
+    reads: asyncio.Future = asyncio.gather(*(read(key="a") for _ in range(3)), return_exceptions=True)
+    await asyncio.sleep(0)
+    upstream.release.set()
+    assert all(isinstance(result, ConnectionError) for result in await reads)
+    assert "a" not in cache
+    assert cache.obtain_metrics()["in_flight"] == 0
+
+
+@mark.asyncio
+async def test_load_once_cancelled_caller_does_not_cancel_the_others() -> None:
+    cache: MeteredCache = build_cache()
+    upstream: SlowUpstream = SlowUpstream()
+    read = build_cached_read(cache=cache, upstream=upstream)
+    cancelled: asyncio.Task = asyncio.create_task(read(key="a"))
+    waiting: asyncio.Task = asyncio.create_task(read(key="a"))
+    await asyncio.sleep(0)
+    cancelled.cancel()
+    upstream.release.set()
+    assert await waiting == "first"
+    assert cancelled.cancelled() is True
+    assert upstream.calls == 1
+
+
+@mark.asyncio
+async def test_load_once_started_before_an_invalidation_is_not_stored() -> None:
+    cache: MeteredCache = build_cache()
+    upstream: SlowUpstream = SlowUpstream()
+    read = build_cached_read(cache=cache, upstream=upstream)
+    stale_read: asyncio.Task = asyncio.create_task(read(key="a"))
+    await upstream.started.wait()
+    upstream.value = "second"
+    cache.invalidate_in_flight()
+    upstream.release.set()
+    assert await stale_read == "first"
+    assert "a" not in cache
+    assert await read(key="a") == "second"
+    assert cache.get("a") == "second"
+
+
+def test_cache_key_evict_drops_only_the_entry_of_the_same_arguments() -> None:
+    cache: MeteredCache = build_cache()
+    by_id_key: CacheKey = CacheKey("search_waste_by_id", "uuid")
+    cache[by_id_key(None, uuid="a")] = "waste a"
+    cache[by_id_key(None, uuid="b")] = "waste b"
+    assert by_id_key.evict(cache=cache, uuid="a") == 1
+    assert by_id_key.evict(cache=cache, uuid="a") == 0
+    assert by_id_key(None, uuid="a") not in cache
+    assert cache.get(by_id_key(None, uuid="b")) == "waste b"
+
+
+def test_cache_key_evict_with_some_arguments_drops_every_entry_matching_them() -> None:
+    cache: MeteredCache = build_cache()
+    by_status_key: CacheKey = CacheKey("list_wastes_by_process_status", "process_status", "limit")
+    by_id_key: CacheKey = CacheKey("search_waste_by_id", "uuid")
+    cache[by_status_key(None, process_status=1, limit=10)] = "first page of status 1"
+    cache[by_status_key(None, process_status=1, limit=20)] = "longer page of status 1"
+    cache[by_status_key(None, process_status=2, limit=10)] = "first page of status 2"
+    cache[by_id_key(None, uuid=1)] = "waste 1"
+    assert by_status_key.evict(cache=cache, process_status=1) == 2
+    assert set(cache.keys()) == {by_status_key(None, process_status=2, limit=10), by_id_key(None, uuid=1)}
+
+
+def test_cache_key_evict_where_drops_the_pages_holding_the_uuids_or_of_the_statuses() -> None:
+    cache: MeteredCache = build_cache()
+    by_status_key: CacheKey = CacheKey("list_wastes_by_process_status", "process_status", "after")
+    by_id_key: CacheKey = CacheKey("search_waste_by_id", "uuid")
+    cache[by_status_key(None, process_status=1, after=None)] = (SimpleNamespace(uuid="a"), SimpleNamespace(uuid="b"))
+    cache[by_status_key(None, process_status=1, after="b")] = (SimpleNamespace(uuid="c"),)
+    cache[by_status_key(None, process_status=2, after=None)] = (SimpleNamespace(uuid="d"),)
+    cache[by_status_key(None, process_status=3, after=None)] = (SimpleNamespace(uuid="e"),)
+    cache[by_id_key(None, uuid="b")] = SimpleNamespace(uuid="b")
+    uuids: set[str] = {"b", "x"}
+    evicted: int = by_status_key.evict_where(
+        cache=cache, predicate=lambda arguments, records: arguments["process_status"] in {2} or any(record.uuid in uuids for record in records)
+    )
+    assert evicted == 2
+    assert set(cache.keys()) == {by_status_key(None, process_status=1, after="b"), by_status_key(None, process_status=3, after=None), by_id_key(None, uuid="b")}
@@ -0,0 +1,146 @@
+# !/usr/bin/python3
+
+# ** info: python imports
+from os.path import join
+from pytest import raises
+from pytest import mark
+from os import path
+import asyncio
+import sys
+
+# **info: appending src path to the system paths for absolute imports from src path
+sys.path.append(join(path.dirname(path.realpath(__file__)), "..", "..", "."))
+
+# ** info: fastapi imports
+from fastapi import HTTPException
+from fastapi import status
+
+# ** info: sidecards.helpers imports
+from src.sidecard.system.helpers.circuit_breaker_helper import CircuitOpenError  # type: ignore
+from src.sidecard.system.helpers.circuit_breaker_helper import CircuitBreaker  # type: ignore
+
+# ---------------------------------------------------------------------------------------------------------------------
+# ** info: building needed artifacts
+# ---------------------------------------------------------------------------------------------------------------------
+
+
+def build_breaker() -> CircuitBreaker:
+    return CircuitBreaker(name="test", failure_threshold=2, reset_timeout=30, half_open_max_calls=1)
+
+
+def build_upstream(breaker: CircuitBreaker, status_code: int = status.HTTP_200_OK, delay: float = 0.0):
+    @breaker.fail_fast
+    @breaker.guard
+    async def upstream() -> str:
+        await asyncio.sleep(delay)
+        if status_code != status.HTTP_200_OK:
+            raise HTTPException(status_code=status_code)
+        return "ok"
+
+    return upstream
+
+
+def pass_reset_timeout(breaker: CircuitBreaker) -> None:
+    breaker._opened_at -= breaker._reset_timeout
+
+
+# ---------------------------------------------------------------------------------------------------------------------
+# ** info: executing tests
+# ---------------------------------------------------------------------------------------------------------------------
+
+
+@mark.asyncio
+async def test_circuit_breaker_opens_after_consecutive_failures() -> None:
+    breaker: CircuitBreaker = build_breaker()
+    failing = build_upstream(breaker=breaker, status_code=status.HTTP_503_SERVICE_UNAVAILABLE)
+    for _ in range(2):
+        with raises(HTTPException):
+            await failing()
+    assert breaker.state == "open"
+    with raises(HTTPException) as rejected:
+        await failing()
+    assert rejected.value.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+    assert int(rejected.value.headers["Retry-After"]) >= 1
+    assert breaker.obtain_metrics()["rejected"] == 1
+
+
+@mark.asyncio
+async def test_circuit_breaker_guard_raises_circuit_open_error_while_open() -> None:
+    breaker: CircuitBreaker = build_breaker()
+    breaker._open(reason="test")
+
+    @breaker.guard
+    async def upstream() -> str:
+        return "ok"
+
+    with raises(CircuitOpenError):
+        await upstream()
+
+
+@mark.asyncio
+async def test_circuit_breaker_client_errors_do_not_open() -> None:
+    breaker: CircuitBreaker = build_breaker()
+    not_found = build_upstream(breaker=breaker, status_code=status.HTTP_404_NOT_FOUND)
+    for _ in range(4):
+        with raises(HTTPException):
+            await not_found()
+    assert breaker.state == "closed"
+    assert breaker.obtain_metrics()["failures"] == 0
+
+
+@mark.asyncio
+async def test_circuit_breaker_probe_success_closes() -> None:
+    breaker: CircuitBreaker = build_breaker()
+    breaker._open(reason="test")
+    pass_reset_timeout(breaker=breaker)
+    assert breaker.state == "half_open"
+    assert await build_upstream(breaker=breaker)() == "ok"
+    assert breaker.state == "closed"
+
+
+@mark.asyncio
+async def test_circuit_breaker_probe_failure_opens_again() -> None:
+    breaker: CircuitBreaker = build_breaker()
+    breaker._open(reason="test")
+    pass_reset_timeout(breaker=breaker)
+    with raises(HTTPException):
+        await build_upstream(breaker=breaker, status_code=status.HTTP_500_INTERNAL_SERVER_ERROR)()
+    assert breaker.state == "open"
+    assert breaker.obtain_metrics()["opened"] == 2
+
+
+@mark.asyncio
+async def test_circuit_breaker_half_open_rejects_beyond_max_probes() -> None:
+    breaker: CircuitBreaker = build_breaker()
+    breaker._open(reason="test")
+    pass_reset_timeout(breaker=breaker)
+    probe: asyncio.Task = asyncio.create_task(build_upstream(breaker=breaker, delay=0.05)())
+    await asyncio.sleep(0)
+    with raises(HTTPException) as rejected:
+        await build_upstream(breaker=breaker)()
+    assert rejected.value.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+    assert await probe == "ok"
+    assert breaker.state == "closed"
+
+
+@mark.asyncio
+async def test_circuit_breaker_cancellation_is_not_a_failure() -> None:
+    breaker: CircuitBreaker = build_breaker()
+    slow = build_upstream(breaker=breaker, delay=1)
+    for _ in range(3):
+        with raises(asyncio.TimeoutError):
+            await asyncio.wait_for(slow(), timeout=0.01)
+    assert breaker.state == "closed"
+    assert breaker.obtain_metrics()["failures"] == 0
+
+
+@mark.asyncio
+async def test_circuit_breaker_cancelled_probe_gives_its_slot_back() -> None:
+    breaker: CircuitBreaker = build_breaker()
+    breaker._open(reason="test")
+    pass_reset_timeout(breaker=breaker)
+    with raises(asyncio.TimeoutError):
+        await asyncio.wait_for(build_upstream(breaker=breaker, delay=1)(), timeout=0.01)
+    assert breaker.state == "half_open"
+    assert await build_upstream(breaker=breaker)() == "ok"
+    assert breaker.state == "closed"
@@ -0,0 +1,58 @@
+# !/usr/bin/python3
+
+# ** info: python imports
+from os.path import join
+from pytest import mark
+from os import path
+import asyncio
+import sys
+
+# ** info: typing imports
+from typing import AsyncIterator
+
+# **info: appending src path to the system paths for absolute imports from src path
+sys.path.append(join(path.dirname(path.realpath(__file__)), "..", "..", "."))
+
+# ** info: sidecards.helpers imports
+from src.sidecard.system.helpers.closing_streaming_response_helper import ClosingStreamingResponse  # type: ignore
+
+# ---------------------------------------------------------------------------------------------------------------------
+# ** info: building needed artifacts
+# ---------------------------------------------------------------------------------------------------------------------
+
+
+class EndlessLines:
+    def __init__(self) -> None:
+        self.sent: int = 0
+        self.closed: bool = False
+
+    async def lines(self) -> AsyncIterator[str]:
+        try:
+            while True:
+                yield "line\n"
+        finally:
+            self.closed = True
+
+    async def send(self, message: dict) -> None:
+        # ** info: a slow client, the disconnect arrives while the generator is suspended on a yield
+        await asyncio.sleep(0.001)
+        self.sent += 1
+
+
+async def disconnect_soon() -> dict:
+    await asyncio.sleep(0.02)
+    return {"type": "http.disconnect"}
+
+
+# ---------------------------------------------------------------------------------------------------------------------
+# ** info: executing tests
+# ---------------------------------------------------------------------------------------------------------------------
+
+
+@mark.asyncio
+async def test_closing_streaming_response_closes_the_body_on_disconnect() -> None:
+    endless_lines: EndlessLines = EndlessLines()
+    response: ClosingStreamingResponse = ClosingStreamingResponse(content=endless_lines.lines(), media_type="application/x-ndjson")
+    await response({"type": "http"}, disconnect_soon, endless_lines.send)
+    assert endless_lines.sent > 1
+    assert endless_lines.closed is True
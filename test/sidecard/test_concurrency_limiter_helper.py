@@ -0,0 +1,71 @@
+# !/usr/bin/python3
+
+# ** info: python imports
+from os.path import join
+from pytest import raises
+from pytest import mark
+from os import path
+import asyncio
+import sys
+
+# **info: appending src path to the system paths for absolute imports from src path
+sys.path.append(join(path.dirname(path.realpath(__file__)), "..", "..", "."))
+
+# ** info: fastapi imports
+from fastapi import HTTPException
+from fastapi import status
+
+# ** info: sidecards.helpers imports
+from src.sidecard.system.helpers.concurrency_limiter_helper import ConcurrencyLimiter  # type: ignore
+
+# ---------------------------------------------------------------------------------------------------------------------
+# ** info: building needed artifacts
+# ** info: every admitted worker holds its slot until the test releases it
+# ---------------------------------------------------------------------------------------------------------------------
+
+
+async def hold_slot(limiter: ConcurrencyLimiter, release: asyncio.Event) -> None:
+    async with limiter.admit():
+        await release.wait()
+
+
+# ---------------------------------------------------------------------------------------------------------------------
+# ** info: executing tests
+# ---------------------------------------------------------------------------------------------------------------------
+
+
+@mark.asyncio
+async def test_admit_queues_the_callers_past_the_worker_limit() -> None:
+    limiter: ConcurrencyLimiter = ConcurrencyLimiter(name="test", max_workers=2, max_queue_depth=2)
+    release: asyncio.Event = asyncio.Event()
+    holders: list[asyncio.Task] = [asyncio.create_task(hold_slot(limiter=limiter, release=release)) for _ in range(3)]
+    await asyncio.sleep(0)
+    assert (limiter.obtain_metrics()["running"], limiter.obtain_metrics()["queued"]) == (2, 1)
+    release.set()
+    await asyncio.gather(*holders)
+    assert (limiter.obtain_metrics()["admitted"], limiter.obtain_metrics()["completed"], limiter.obtain_metrics()["running"]) == (3, 3, 0)
+
+
+@mark.asyncio
+async def test_admit_rejects_the_callers_past_the_queue_depth() -> None:
+    limiter: ConcurrencyLimiter = ConcurrencyLimiter(name="test", max_workers=1, max_queue_depth=1)
+    release: asyncio.Event = asyncio.Event()
+    holders: list[asyncio.Task] = [asyncio.create_task(hold_slot(limiter=limiter, release=release)) for _ in range(2)]
+    await asyncio.sleep(0)
+    with raises(HTTPException) as rejection:
+        await hold_slot(limiter=limiter, release=release)
+    assert rejection.value.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+    release.set()
+    await asyncio.gather(*holders)
+    assert (limiter.obtain_metrics()["admitted"], limiter.obtain_metrics()["rejected"]) == (2, 1)
+
+
+@mark.asyncio
+async def test_admit_gives_the_slot_back_when_the_work_fails() -> None:
+    limiter: ConcurrencyLimiter = ConcurrencyLimiter(name="test", max_workers=1, max_queue_depth=0)
+    with raises(ValueError):
+        async with limiter.admit():
+            raise ValueError("failed unit of work")
+    async with limiter.admit():
+        pass
+    assert (limiter.obtain_metrics()["failed"], limiter.obtain_metrics()["completed"], limiter.obtain_metrics()["running"]) == (1, 1, 0)
@@ -0,0 +1,57 @@
+# !/usr/bin/python3
+
+# ** info: python imports
+from datetime import datetime
+from os.path import join
+from pytest import raises
+from pytest import mark
+from os import path
+import sys
+
+# **info: appending src path to the system paths for absolute imports from src path
+sys.path.append(join(path.dirname(path.realpath(__file__)), "..", "..", "."))
+
+# ** info: fastapi imports
+from fastapi import HTTPException
+from fastapi import status
+
+# ** info: sidecards.artifacts imports
+from src.sidecard.system.artifacts.cursor_provider import CursorProvider  # type: ignore
+
+# ---------------------------------------------------------------------------------------------------------------------
+# ** info: building needed artifacts
+# ---------------------------------------------------------------------------------------------------------------------
+
+cursor_provider: CursorProvider = CursorProvider()
+create: datetime = datetime(2024, 3, 9, 14, 30, 15, 123456)
+uuid: str = "0b6f4c0e-0a59-4d3e-8a43-6d2c1f6f3b1a"
+
+# ---------------------------------------------------------------------------------------------------------------------
+# ** info: executing tests
+# ---------------------------------------------------------------------------------------------------------------------
+
+
+def test_keyset_cursor_round_trip() -> None:
+    cursor: str = cursor_provider.encode_keyset_cursor(create=create, uuid=uuid)
+    assert "=" not in cursor
+    assert cursor_provider.decode_keyset_cursor(cursor=cursor) == (create, uuid)
+
+
+def test_keyset_cursor_missing_is_the_first_page() -> None:
+    assert cursor_provider.decode_keyset_cursor(cursor=None) is None
+
+
+@mark.parametrize(
+    "cursor",
+    [
+        "not a cursor",
+        cursor_provider.encode_keyset_cursor(create=create, uuid=uuid)[:-4],
+        cursor_provider.encode_keyset_cursor(create=create, uuid=uuid).replace("W", "x"),
+        "WyJ5ZXN0ZXJkYXkiLCJ1dWlkIl0",
+        "eyJjcmVhdGUiOiIyMDI0In0",
+    ],
+)
+def test_keyset_cursor_tampered_is_rejected(cursor: str) -> None:
+    with raises(HTTPException) as rejection:
+        cursor_provider.decode_keyset_cursor(cursor=cursor)
+    assert rejection.value.status_code == status.HTTP_400_BAD_REQUEST
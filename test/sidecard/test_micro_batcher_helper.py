@@ -0,0 +1,78 @@
+# !/usr/bin/python3
+
+# ** info: python imports
+from os.path import join
+from pytest import raises
+from pytest import mark
+from os import path
+import asyncio
+import sys
+
+# **info: appending src path to the system paths for absolute imports from src path
+sys.path.append(join(path.dirname(path.realpath(__file__)), "..", "..", "."))
+
+# ** info: typing imports
+from typing import Hashable
+from typing import Any
+
+# ** info: sidecards.helpers imports
+from src.sidecard.system.helpers.micro_batcher_helper import MicroBatcher  # type: ignore
+
+# ---------------------------------------------------------------------------------------------------------------------
+# ** info: building needed artifacts
+# ---------------------------------------------------------------------------------------------------------------------
+
+
+class BatchHandlerStandIn:
+    # ** info: doubles the items it gets, fails the negative ones and records every batch
+    def __init__(self) -> None:
+        self.batches: list[list[Hashable]] = list()
+
+    async def handle(self, items: list[Hashable]) -> list[Any]:
+        self.batches.append(items)
+        return [ValueError(f"item {item} failed") if item < 0 else item * 2 for item in items]
+
+
+# ---------------------------------------------------------------------------------------------------------------------
+# ** info: executing tests
+# ---------------------------------------------------------------------------------------------------------------------
+
+
+@mark.asyncio
+async def test_micro_batcher_coalesces_a_window_into_one_batch() -> None:
+    batcher: MicroBatcher = MicroBatcher(name="test", window=0.01, max_size=50)
+    handler: BatchHandlerStandIn = BatchHandlerStandIn()
+    results: list[Any] = await asyncio.gather(*(batcher.submit(item=item, handler=handler.handle) for item in (1, 2, 2, 3)))
+    assert results == [2, 4, 4, 6]
+    assert handler.batches == [[1, 2, 3]]
+    assert batcher.obtain_metrics()["coalesced"] == 1
+
+
+@mark.asyncio
+async def test_micro_batcher_flushes_at_max_size() -> None:
+    batcher: MicroBatcher = MicroBatcher(name="test", window=10, max_size=2)
+    handler: BatchHandlerStandIn = BatchHandlerStandIn()
+    results: list[Any] = await asyncio.wait_for(asyncio.gather(*(batcher.submit(item=item, handler=handler.handle) for item in (1, 2))), timeout=1)
+    assert results == [2, 4]
+    assert handler.batches == [[1, 2]]
+
+
+@mark.asyncio
+async def test_micro_batcher_item_errors_only_fail_their_callers() -> None:
+    batcher: MicroBatcher = MicroBatcher(name="test", window=0.01, max_size=50)
+    handler: BatchHandlerStandIn = BatchHandlerStandIn()
+    results: list[Any] = await asyncio.gather(*(batcher.submit(item=item, handler=handler.handle) for item in (1, -1, 3)), return_exceptions=True)
+    assert results[0] == 2 and results[2] == 6
+    assert isinstance(results[1], ValueError)
+    assert len(handler.batches) == 1
+
+
+@mark.asyncio
+async def test_micro_batcher_handler_errors_fail_the_whole_batch() -> None:
+    batcher: MicroBatcher = MicroBatcher(name="test", window=0.01, max_size=50)
+
+    async def failing_handler(items: list[Hashable]) -> list[Any]:
+        raise RuntimeError("upstream down")
+
+    with raises(RuntimeError):
+        await asyncio.gather(*(batcher.submit(item=item, handler=failing_handler) for item in (1, 2)))
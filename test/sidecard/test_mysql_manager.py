@@ -0,0 +1,124 @@
+# !/usr/bin/python3
+
+# ** info: python imports
+from unittest.mock import AsyncMock
+from unittest.mock import MagicMock
+from os.path import join
+from pytest import MonkeyPatch
+from pytest import raises
+from pytest import mark
+from os import path
+import sys
+
+# **info: appending src path to the system paths for absolute imports from src path
+sys.path.append(join(path.dirname(path.realpath(__file__)), "..", "..", "."))
+
+# ** info: sidecards.database_managers imports
+from src.sidecard.system.database_managers.mysql_manager import retry_outside_unit_of_work  # type: ignore
+from src.sidecard.system.database_managers.mysql_manager import unit_of_work_connection  # type: ignore
+from src.sidecard.system.database_managers.mysql_manager import MySQLManager  # type: ignore
+
+# ---------------------------------------------------------------------------------------------------------------------
+# ** info: building needed artifacts
+# ** info: the engine is replaced by a fake one, the transaction only needs to be opened and closed
+# ---------------------------------------------------------------------------------------------------------------------
+
+
+class FakeTransaction:
+    async def __aenter__(self) -> "FakeTransaction":
+        return self
+
+    async def __aexit__(self, *args) -> bool:
+        return False
+
+
+class FakeConnection(FakeTransaction):
+    def begin(self) -> FakeTransaction:
+        return FakeTransaction()
+
+
+class FakeEngine:
+    def connect(self) -> FakeConnection:
+        return FakeConnection()
+
+
+def build_mysql_manager(monkeypatch: MonkeyPatch) -> MySQLManager:
+    mysql_manager: MySQLManager = MySQLManager()
+    monkeypatch.setattr(mysql_manager, "_engine", FakeEngine())
+    return mysql_manager
+
+
+async def run_unit_of_work(mysql_manager: MySQLManager, callback: AsyncMock, error: Exception = None, undo: MagicMock = None) -> None:
+    # ** info: called through the class, other tests replace the unit of work of the shared instance
+    async with MySQLManager.unit_of_work(mysql_manager):
+        await mysql_manager.run_after_commit(callback=callback)
+        mysql_manager.run_after_rollback(callback=undo if undo is not None else MagicMock())
+        callback.assert_not_awaited()
+        if error is not None:
+            raise error
+
+
+# ---------------------------------------------------------------------------------------------------------------------
+# ** info: executing tests
+# ---------------------------------------------------------------------------------------------------------------------
+
+
+@mark.asyncio
+async def test_run_after_commit_runs_at_once_outside_a_unit_of_work() -> None:
+    callback: AsyncMock = AsyncMock()
+    await MySQLManager().run_after_commit(callback=callback)
+    callback.assert_awaited_once()
+
+
+@mark.asyncio
+async def test_unit_of_work_runs_the_queued_callbacks_after_the_commit(monkeypatch: MonkeyPatch) -> None:
+    callback: AsyncMock = AsyncMock()
+    await run_unit_of_work(mysql_manager=build_mysql_manager(monkeypatch=monkeypatch), callback=callback)
+    callback.assert_awaited_once()
+
+
+@mark.asyncio
+async def test_unit_of_work_drops_the_queued_callbacks_on_rollback(monkeypatch: MonkeyPatch) -> None:
+    callback: AsyncMock = AsyncMock()
+    with raises(ValueError):
+        await run_unit_of_work(mysql_manager=build_mysql_manager(monkeypatch=monkeypatch), callback=callback, error=ValueError("rollback"))
+    callback.assert_not_awaited()
+
+
+@mark.asyncio
+async def test_unit_of_work_runs_the_undo_callbacks_only_on_rollback(monkeypatch: MonkeyPatch) -> None:
+    committed_undo: MagicMock = MagicMock()
+    rolled_back_undo: MagicMock = MagicMock()
+    await run_unit_of_work(mysql_manager=build_mysql_manager(monkeypatch=monkeypatch), callback=AsyncMock(), undo=committed_undo)
+    with raises(ValueError):
+        await run_unit_of_work(mysql_manager=build_mysql_manager(monkeypatch=monkeypatch), callback=AsyncMock(), error=ValueError("rollback"), undo=rolled_back_undo)
+    committed_undo.assert_not_called()
+    rolled_back_undo.assert_called_once()
+
+
+@mark.asyncio
+async def test_unit_of_work_failed_callback_does_not_fail_the_commit(monkeypatch: MonkeyPatch) -> None:
+    callback: AsyncMock = AsyncMock(side_effect=ConnectionError("redis down"))
+    await run_unit_of_work(mysql_manager=build_mysql_manager(monkeypatch=monkeypatch), callback=callback)
+    callback.assert_awaited_once()
+
+
+@mark.asyncio
+async def test_retry_outside_unit_of_work_retries_standalone_calls() -> None:
+    write: AsyncMock = AsyncMock(side_effect=[ConnectionError("deadlock"), "ok"])
+    retried_write = retry_outside_unit_of_work(on=ConnectionError, attempts=2, wait_initial=0, wait_jitter=0)(write)
+    assert await retried_write() == "ok"
+    assert write.await_count == 2
+
+
+@mark.asyncio
+async def test_retry_outside_unit_of_work_runs_once_inside_a_unit_of_work() -> None:
+    write: AsyncMock = AsyncMock(side_effect=[ConnectionError("deadlock"), "ok"])
+    retried_write = retry_outside_unit_of_work(on=ConnectionError, attempts=2, wait_initial=0, wait_jitter=0)(write)
+    token = unit_of_work_connection.set(FakeConnection())
+    try:
+        with raises(ConnectionError):
+            await retried_write()
+    finally:
+        unit_of_work_connection.reset(token)
+    assert write.await_count == 1
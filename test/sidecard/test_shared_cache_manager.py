@@ -0,0 +1,173 @@
+# !/usr/bin/python3
+
+# ** info: python imports
+from os.path import join
+from pytest import MonkeyPatch
+from pytest import mark
+from os import path
+import asyncio
+import sys
+
+# ** info: typing imports
+from typing import Any
+
+# **info: appending src path to the system paths for absolute imports from src path
+sys.path.append(join(path.dirname(path.realpath(__file__)), "..", "..", "."))
+
+# ** info: sidecards.cache_managers imports
+from src.sidecard.system.cache_managers.shared_cache_manager import SharedCacheManager  # type: ignore
+from src.sidecard.system.cache_managers.cache_manager import MeteredCache  # type: ignore
+
+# ** info: sidecards.helpers imports
+from src.sidecard.system.helpers.cache_key_helper import CacheKey  # type: ignore
+
+# ---------------------------------------------------------------------------------------------------------------------
+# ** info: building needed artifacts
+# ** info: every worker is a separate shared cache manager, the singleton is skipped and all of them use the same in memory store
+# ---------------------------------------------------------------------------------------------------------------------
+
+cache: MeteredCache = MeteredCache(name="test_shared_cache_manager.read", ttl=60, max_bytes=1048576)
+read_key: CacheKey = CacheKey("read", "group", "item")
+
+
+class BrokenRedis:
+    async def get(self, *args: Any, **kwargs: Any) -> None:
+        raise ConnectionError("redis down")
+
+
+class FlakyRedis:
+    # ** info: wraps the in memory store and fails the version writes of one group
+    def __init__(self, client: Any, failing_group: str) -> None:
+        self._client: Any = client
+        self._failing_group: str = failing_group
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._client, name)
+
+    async def set(self, name: str, *args: Any, **kwargs: Any) -> Any:
+        if self._failing_group in name:
+            raise ConnectionError("redis down")
+        return await self._client.set(name, *args, **kwargs)
+
+
+class Database:
+    def __init__(self) -> None:
+        self.value: str = "first"
+        self.reads: int = 0
+        self.started: asyncio.Event = asyncio.Event()
+        self.release: asyncio.Event = asyncio.Event()
+        self.release.set()
+
+    async def read(self, group: str, item: str) -> str:
+        self.reads += 1
+        value: str = self.value
+        self.started.set()
+        await self.release.wait()
+        return value
+
+
+def build_workers(monkeypatch: MonkeyPatch, count: int) -> list[SharedCacheManager]:
+    monkeypatch.setenv("CACHE_SHARED_URL", "memory://")
+    workers: list[SharedCacheManager] = [type.__call__(SharedCacheManager) for _ in range(count)]
+    for worker in workers[1:]:
+        worker._client = workers[0]._client
+    return workers
+
+
+def build_read(worker: SharedCacheManager, database: Database):
+    @worker.cached(cache, key=read_key, group="group")
+    async def read(provider: Any, group: str, item: str) -> str:
+        return await database.read(group=group, item=item)
+
+    return read
+
+
+# ---------------------------------------------------------------------------------------------------------------------
+# ** info: executing tests
+# ---------------------------------------------------------------------------------------------------------------------
+
+
+@mark.asyncio
+async def test_shared_cache_is_read_by_every_worker(monkeypatch: MonkeyPatch) -> None:
+    worker_a, worker_b = build_workers(monkeypatch=monkeypatch, count=2)
+    database: Database = Database()
+    assert await build_read(worker=worker_a, database=database)(None, group="g", item="i") == "first"
+    assert await build_read(worker=worker_b, database=database)(None, group="g", item="i") == "first"
+    assert database.reads == 1
+    assert worker_b.obtain_metrics()["hits"] == 1
+    await worker_a.dispose()
+
+
+@mark.asyncio
+async def test_shared_cache_invalidation_drops_the_group_and_reaches_the_other_workers(monkeypatch: MonkeyPatch) -> None:
+    worker_a, worker_b = build_workers(monkeypatch=monkeypatch, count=2)
+    received: list[dict[str, Any]] = list()
+    worker_a.subscribe(topic="test", handler=received.append)
+    worker_a.start()
+    await asyncio.sleep(0)
+    database: Database = Database()
+    read_b = build_read(worker=worker_b, database=database)
+    assert await read_b(None, group="g", item="i") == "first"
+    database.value = "second"
+    await worker_b.invalidate(topic="test", payload={"group": "g"}, groups=[(cache, "g")])
+    await asyncio.sleep(0)
+    assert received == [{"group": "g"}]
+    assert await read_b(None, group="g", item="i") == "second"
+    assert database.reads == 2
+    await worker_a.dispose()
+
+
+@mark.asyncio
+async def test_shared_cache_load_started_before_an_invalidation_is_not_read_after_it(monkeypatch: MonkeyPatch) -> None:
+    worker_a, worker_b = build_workers(monkeypatch=monkeypatch, count=2)
+    database: Database = Database()
+    database.release.clear()
+    stale_read: asyncio.Task = asyncio.create_task(build_read(worker=worker_a, database=database)(None, group="g", item="i"))
+    await database.started.wait()
+    database.value = "second"
+    await worker_b.invalidate(topic="test", payload={"group": "g"}, groups=[(cache, "g")])
+    database.release.set()
+    assert await stale_read == "first"
+    assert await build_read(worker=worker_b, database=database)(None, group="g", item="i") == "second"
+    assert database.reads == 2
+    await worker_a.dispose()
+
+
+@mark.asyncio
+async def test_shared_cache_failed_group_invalidation_does_not_skip_the_other_groups(monkeypatch: MonkeyPatch) -> None:
+    worker_a, worker_b = build_workers(monkeypatch=monkeypatch, count=2)
+    received: list[dict[str, Any]] = list()
+    worker_a.subscribe(topic="test", handler=received.append)
+    worker_a.start()
+    await asyncio.sleep(0)
+    database: Database = Database()
+    read_b = build_read(worker=worker_b, database=database)
+    assert [await read_b(None, group=group, item="i") for group in ("g1", "g2")] == ["first", "first"]
+    database.value = "second"
+    worker_b._client = FlakyRedis(client=worker_b._client, failing_group=":g1:")
+    await worker_b.invalidate(topic="test", payload={"group": "g1"}, groups=[(cache, "g1"), (cache, "g2")])
+    await asyncio.sleep(0)
+    assert received == [{"group": "g1"}]
+    assert await read_b(None, group="g2", item="i") == "second"
+    assert (worker_b.obtain_metrics()["version_errors"], worker_b.obtain_metrics()["publish_errors"], worker_b.obtain_metrics()["published"]) == (1, 0, 1)
+    await worker_a.dispose()
+
+
+@mark.asyncio
+async def test_shared_cache_failure_falls_back_to_the_database(monkeypatch: MonkeyPatch) -> None:
+    (worker,) = build_workers(monkeypatch=monkeypatch, count=1)
+    worker._client = BrokenRedis()
+    database: Database = Database()
+    assert await build_read(worker=worker, database=database)(None, group="g", item="i") == "first"
+    assert worker.obtain_metrics()["errors"] == 1
+
+
+@mark.asyncio
+async def test_shared_cache_disabled_without_url(monkeypatch: MonkeyPatch) -> None:
+    monkeypatch.setenv("CACHE_SHARED_URL", "")
+    worker: SharedCacheManager = type.__call__(SharedCacheManager)
+    database: Database = Database()
+    read = build_read(worker=worker, database=database)
+    assert [await read(None, group="g", item="i") for _ in range(2)] == ["first", "first"]
+    assert database.reads == 2
+    assert worker.obtain_metrics()["enabled"] is False